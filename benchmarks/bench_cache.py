@@ -0,0 +1,47 @@
+"""
+Time a cold run (empty parse cache), a warm run (every file cached) and a
+run with a few changed files against the uncached extractor.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_cache [class_count] [member_count] [changed_count]
+"""
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+from sources import xmlExtractorWithType
+
+
+def time_parse(folder, cache_folder):
+    start = time.perf_counter()
+    results = xmlExtractorWithType.parse_all_xml_in_folder(folder, cache_folder=cache_folder)
+    return time.perf_counter() - start, results
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    changed_count = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cache_folder:
+        corpus.generate_corpus(folder, class_count, member_count)
+        print(f"{class_count} classes x {member_count} members")
+
+        uncached_time, uncached_results = time_parse(folder, None)
+        cold_time, cold_results = time_parse(folder, cache_folder)
+        warm_time, warm_results = time_parse(folder, cache_folder)
+
+        # Rewrite a few files with one member more, only those miss the cache
+        for index in range(min(changed_count, class_count)):
+            corpus.write_file_compound(folder, corpus.class_name_for(index), member_count + 1)
+        changed_time, _ = time_parse(folder, cache_folder)
+
+        print(f"{'no cache':<20} {uncached_time:>8.2f} s")
+        print(f"{'cold cache':<20} {cold_time:>8.2f} s")
+        print(f"{'warm cache':<20} {warm_time:>8.2f} s")
+        print(f"{f'{changed_count} files changed':<20} {changed_time:>8.2f} s")
+        print(f"same results: {uncached_results == cold_results == warm_results}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Per-line cost of the member line classifier against the previous regex chain.
+
+The classification of a few known lines is checked first, the run exits
+with an error if one of them changed.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_classifier [line_count]
+"""
+import random
+import re
+import sys
+import time
+
+from sources import languages
+from sources import memberClassifier
+
+ATTRIBUTES = ['', '', '[SerializeField] ', '[Range(0, 10)] ', '[Header("Stats")] ']
+MODIFIERS = ['public', 'protected', 'private', 'public static', 'protected virtual', 'public override',
+             'private static', 'public abstract']
+TYPES = ['void', 'int', 'float', 'string', 'bool', 'List<int>', 'Dictionary<string, int>', 'Player']
+PARAMETERS = ['', 'int a', 'int a, float b', 'string name, [NotNull] Player owner', 'List<int> values',
+              'int a = 1, bool flag = false']
+
+# (codeline text, language, expected classify_member_line result)
+KNOWN_LINES = [
+    ("public static int Foo ( int a , float b ) {", languages.CSHARP,
+     ('+', ['public', 'static'], 'int', 'Foo', 'int a , float b')),
+    ("[SerializeField] private List< int > values ;", languages.CSHARP, ('-', ['private'], 'List', None, None)),
+    ("public Player ( ) {", languages.CSHARP, ('+', ['public'], 'Player', 'Player', '')),
+    # Destructors keep their '~' and have no return type
+    ("~ Player ( ) {", languages.CSHARP, ('-', [], 'void', '~Player', '')),
+    ("virtual ~ Player ( ) ;", languages.CPP, ('-', ['virtual'], 'void', '~Player', '')),
+    ("const std :: vector< Item *> & items ( ) const ;", languages.CPP,
+     ('-', [], 'const std::vector<Item*>&', 'items', '')),
+]
+
+
+def check_known_lines():
+    """
+    Return the (text, expected, result) of the known lines classified differently.
+    """
+    failures = []
+    for text, language, expected in KNOWN_LINES:
+        result = memberClassifier.classify_member_line(text, language)
+        if result != expected:
+            failures.append((text, expected, result))
+    return failures
+
+
+def synthetic_lines(count, seed=0):
+    """
+    Return codeline texts as parse_member_codeline builds them (one space between text nodes).
+    """
+    rng = random.Random(seed)
+    lines = []
+    for index in range(count):
+        prefix = rng.choice(ATTRIBUTES) + rng.choice(MODIFIERS) + ' ' + rng.choice(TYPES) + ' '
+        if index % 2:
+            lines.append((f"{prefix}Method{index} ({rng.choice(PARAMETERS)}){{", f"Method{index}"))
+        else:
+            lines.append((f"{prefix}field{index} ;", f"field{index}"))
+    return lines
+
+
+def extract_type_info(text):
+    """
+    Return the first word after the modifiers as the return type.
+    """
+    text = languages.CSHARP.modifier_pattern.sub('', text).strip()
+    match = re.match(r'^\b(?:\w+|void)\b', text)
+    if match:
+        return match.group(0)
+    return 'void'
+
+
+def remove_access_specifiers_and_return_type(text):
+    """
+    Remove the modifiers and the first word, the return type, of a function signature.
+    """
+    text = languages.CSHARP.modifier_pattern.sub('', text).strip()
+    return re.sub(r'^\b(?:\w+|void)\b\s+', '', text).strip()
+
+
+def remove_attributes(text):
+    """
+    Remove the attributes like [Range(...)] and [SerializeField].
+    """
+    return re.sub(r'\[.*?\]', '', text).strip()
+
+
+def extract_function_signature(text):
+    match = re.search(r'\b(\w+[\w\s]*\w+)\s*\(([^)]*)\)', text)
+    if match:
+        function_name = match.group(1).strip()
+        parameters = match.group(2).strip()
+        parameters = re.sub(r'\[(.*?)\]', lambda m: '[' + m.group(1).replace(',', '') + ']', parameters)
+        return f"{function_name}({parameters})"
+    return text
+
+
+def legacy(text, name):
+    """The regex chain used by parse_member_codeline before the classifier."""
+    text = remove_attributes(text)
+    if 'public' in text:
+        access_specifier = '+'
+    elif 'protected' in text:
+        access_specifier = '#'
+    else:
+        access_specifier = '-'
+    type_info = extract_type_info(text)
+    if '(' in text and ')' in text:
+        function_signature = extract_function_signature(text)
+        function_signature = remove_access_specifiers_and_return_type(function_signature)
+        return f"{access_specifier} {function_signature} : {type_info}"
+    return f"{access_specifier} {name} : {type_info}"
+
+
+def classified(text, name):
+    access, _, type_info, function_name, parameters = memberClassifier.classify_member_line(text)
+    if parameters is not None:
+        return f"{access} {function_name}({parameters}) : {type_info}"
+    return f"{access} {name} : {type_info}"
+
+
+def main():
+    failures = check_known_lines()
+    for text, expected, result in failures:
+        print(f"{text!r}\n    expected: {expected}\n    got:      {result}")
+    if failures:
+        sys.exit(f"{len(failures)} / {len(KNOWN_LINES)} known lines are classified differently")
+    print(f"{len(KNOWN_LINES)} known lines classified as expected")
+
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    lines = synthetic_lines(line_count)
+    results = {}
+    for label, function in (('regex chain', legacy), ('classifier', classified)):
+        start = time.perf_counter()
+        results[label] = [function(text, name) for text, name in lines]
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {elapsed:>7.2f} s  {elapsed / line_count * 1e9:>8.0f} ns/line")
+
+    different = [(text, old, new) for (text, _), old, new in zip(lines, results['regex chain'], results['classifier'])
+                 if old != new]
+    print(f"{line_count - len(different)} / {line_count} lines give the same member")
+    for text, old, new in different[:5]:
+        print(f"  {text!r}\n    chain:      {old}\n    classifier: {new}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Size and write time of the .drawio output modes on a synthetic corpus:
+indented, compact, shared styles and compressed, both as one file per class
+and as a single file holding every class.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_compressed [class_count] [member_count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+from sources import pipeline
+from sources import txt2drawio
+from sources import xmlExtractorWithType
+
+MODES = [
+    # name, bPretty, bCompressed, bSharedStyles
+    ("indented", True, False, False),
+    ("compact", False, False, False),
+    ("shared styles", False, False, True),
+    ("compressed", True, True, False),
+    ("compressed+shared", True, True, True),
+]
+
+
+def folder_size(folder):
+    return sum(entry.stat().st_size for entry in os.scandir(folder) if entry.is_file())
+
+
+def write_per_class(classes, folder, bPretty, bCompressed, bSharedStyles):
+    for index, (class_name, member_funcs, member_vars) in enumerate(classes):
+        txt2drawio.create_class_diagram_from_model(class_name, member_funcs, member_vars,
+                                                   os.path.join(folder, f"{index}.drawio"),
+                                                   bPretty, bCompressed, bSharedStyles)
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    with tempfile.TemporaryDirectory() as folder:
+        xml_folder = os.path.join(folder, 'xmls')
+        os.makedirs(xml_folder)
+        corpus.generate_corpus(xml_folder, class_count, member_count)
+        classes = [pipeline.extract_class_model(os.path.join(xml_folder, file_name))
+                   for file_name in xmlExtractorWithType.list_xml_files(xml_folder)]
+        print(f"{class_count} classes x {member_count} members")
+        print(f"{'mode':<20} {'per class':>12} {'time':>8} {'single file':>12} {'time':>8}")
+
+        for name, bPretty, bCompressed, bSharedStyles in MODES:
+            output_folder = os.path.join(folder, name)
+            os.makedirs(output_folder)
+            start = time.perf_counter()
+            write_per_class(classes, output_folder, bPretty, bCompressed, bSharedStyles)
+            per_class_time = time.perf_counter() - start
+            per_class_size = folder_size(output_folder)
+
+            single_file_path = os.path.join(folder, f"{name}.drawio")
+            start = time.perf_counter()
+            txt2drawio.create_multi_class_diagram(classes, single_file_path, False, None,
+                                                  bPretty, bCompressed, bSharedStyles)
+            single_time = time.perf_counter() - start
+            single_size = os.path.getsize(single_file_path)
+
+            print(f"{name:<20} {per_class_size / 1024:>9.0f} KB {per_class_time:>7.2f}s "
+                  f"{single_size / 1024:>9.0f} KB {single_time:>7.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare the two pass conversion (xml -> texts/*.txt -> drawio) with the direct
+in-memory pipeline.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_direct [class_count] [member_count] [repeat]
+
+The best time of `repeat` runs is reported.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+from sources import pipeline
+from sources import txt2drawio
+from sources import xmlExtractorWithType
+
+
+def two_pass():
+    xmlExtractorWithType.ExtractWitType()
+    txt2drawio.txtToDrawio()
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        try:
+            corpus.generate_corpus('xmls', class_count, member_count)
+            print(f"{class_count} classes x {member_count} members")
+            runs = [
+                ('two pass (texts + drawio)', two_pass),
+                ('direct, writing texts', lambda: pipeline.convert_xml_folder('xmls', 'drawio', text_folder='texts')),
+                ('direct, no texts', lambda: pipeline.convert_xml_folder('xmls', 'drawio')),
+            ]
+            for label, run in runs:
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        run()
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                print(f"{label:<28} {best:>8.2f} s")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
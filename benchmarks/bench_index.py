@@ -0,0 +1,43 @@
+"""
+Time the conversion of one namespace through index.xml against the
+conversion of every class compound of the folder.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_index [class_count] [member_count] [namespace_count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+from sources import pipeline
+
+
+def time_single_file(xml_folder, output_file_path, backend, namespaces=None):
+    start = time.perf_counter()
+    pipeline.convert_xml_folder_to_single_file(xml_folder, output_file_path, backend=backend, namespaces=namespaces)
+    return time.perf_counter() - start
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    namespace_count = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    with tempfile.TemporaryDirectory() as folder:
+        xml_folder = os.path.join(folder, 'xmls')
+        corpus.generate_corpus(xml_folder, class_count, member_count, bClassCompounds=True,
+                               namespace_count=namespace_count)
+        output_file_path = os.path.join(folder, 'classes.drawio')
+        print(f"{class_count} classes x {member_count} members in {namespace_count} namespaces")
+
+        all_time = time_single_file(xml_folder, output_file_path, 'memberdef')
+        index_time = time_single_file(xml_folder, output_file_path, 'index')
+        subset_time = time_single_file(xml_folder, output_file_path, 'index', ['NamespaceA'])
+        print(f"{'memberdef, all':<24} {all_time:>8.2f} s")
+        print(f"{'index, all':<24} {index_time:>8.2f} s")
+        print(f"{'index, one namespace':<24} {subset_time:>8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
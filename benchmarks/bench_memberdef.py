@@ -0,0 +1,51 @@
+"""
+Compare the codeline extractor (regex over the file compounds) with the
+memberdef extractor (structured data of the class compounds) on the same classes.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_memberdef [class_count] [member_count] [repeat]
+"""
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+from sources import xmlExtractorWithType
+
+
+def time_backend(folder, backend, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = xmlExtractorWithType.parse_all_xml_in_folder(folder, backend=backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def members_of(results):
+    # The two backends list the files in a different order, and only the file compounds end with '.cs'
+    return {
+        result["extracted_info"]["class_name"].replace('.cs', ''):
+            xmlExtractorWithType.get_sorted_member_info(result["extracted_info"])
+        for result in results
+    }
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    with tempfile.TemporaryDirectory() as folder:
+        corpus.generate_corpus(folder, class_count, member_count, bRelations=True, bClassCompounds=True)
+        print(f"{class_count} classes x {member_count} members")
+        codeline_time, codeline_results = time_backend(folder, 'codeline', repeat)
+        memberdef_time, memberdef_results = time_backend(folder, 'memberdef', repeat)
+        print(f"{'codeline (regex)':<20} {codeline_time:>8.2f} s")
+        print(f"{'memberdef':<20} {memberdef_time:>8.2f} s")
+        same = members_of(codeline_results) == members_of(memberdef_results)
+        print(f"same members: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Check that the peak memory of a conversion stays flat as the number of .xml
+files grows: each run is a fresh Python process, whose peak resident set size
+is read with the resource module (Unix only).
+
+The 'parse all first' row is the old way of ExtractWitType, which collected the
+classes of every file with parse_all_xml_in_folder before writing any; the other
+rows stream the classes from the directory scan to the written file.
+
+The check fails (exit status 1) when the peak of a streaming row at the largest
+class count is more than TOLERANCE_MB above its peak at the smallest one. The
+list of the file names and the manifest still grow with the number of files, the
+tolerance leaves room for them; the 'parse all first' row is only reported.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_memory [member_count] [class_count ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import corpus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Most megabytes the peak of a streaming row may grow from the smallest to the largest class count
+TOLERANCE_MB = 10
+
+# (label, True if its peak must stay flat, code run in the child process with xml_folder and output_folder set)
+RUNS = [
+    ('parse all first', False, "from sources import xmlExtractorWithType as x\n"
+                               "for info in x.parse_all_xml_in_folder(xml_folder):\n"
+                               "    x.create_text_file(os.path.join(output_folder, x.format_file_name(info['file_name'])),\n"
+                               "                       x.render_class_text(info['extracted_info']))"),
+    ('texts', True, "from sources import xmlExtractorWithType as x\n"
+                    "x.ExtractWitType(xml_folder=xml_folder, results_folder=output_folder)"),
+    ('texts, 2 workers, 16 MB', True, "from sources import xmlExtractorWithType as x\n"
+                                      "x.ExtractWitType(workers=2, xml_folder=xml_folder, results_folder=output_folder,\n"
+                                      "                 memory_limit=16 * 1024 * 1024)"),
+    ('direct drawio', True, "from sources import pipeline\n"
+                            "pipeline.convert_xml_folder(xml_folder, output_folder)"),
+]
+
+PEAK_RSS = ("import resource\n"
+            "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+
+
+def peak_rss_mb(code, xml_folder, output_folder):
+    script = (f"import os\nxml_folder = {xml_folder!r}\noutput_folder = {output_folder!r}\n"
+              f"os.makedirs(output_folder, exist_ok=True)\n{code}\n{PEAK_RSS}")
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True, capture_output=True, text=True)
+    # ru_maxrss is in kilobytes on Linux, in bytes on macOS
+    peak = int(result.stdout.split()[-1])
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def main():
+    member_count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    class_counts = [int(arg) for arg in sys.argv[2:]] or [500, 1000, 2000, 4000, 8000]
+    print(f"peak RSS in MB, {member_count} members per class")
+    print(f"{'classes':>8} {'xml MB':>8}" + "".join(f" {label:>24}" for label, _, _ in RUNS))
+    peaks = [[] for _ in RUNS]
+    with tempfile.TemporaryDirectory() as folder:
+        xml_folder = os.path.join(folder, 'xmls')
+        os.makedirs(xml_folder)
+        for class_count in class_counts:
+            # The same names are generated again, so each size adds to the previous one
+            corpus.generate_corpus(xml_folder, class_count, member_count)
+            xml_bytes = sum(entry.stat().st_size for entry in os.scandir(xml_folder))
+            row = f"{class_count:>8} {xml_bytes / 1e6:>8.1f}"
+            for index, (_, _, code) in enumerate(RUNS):
+                output_folder = os.path.join(folder, f"out{index}")
+                peaks[index].append(peak_rss_mb(code, xml_folder, output_folder))
+                row += f" {peaks[index][-1]:>24.1f}"
+            print(row, flush=True)
+
+    # The class counts may be given in any order
+    smallest = class_counts.index(min(class_counts))
+    largest = class_counts.index(max(class_counts))
+    failures = []
+    for (label, bFlat, _), run_peaks in zip(RUNS, peaks):
+        growth = run_peaks[largest] - run_peaks[smallest]
+        if bFlat and growth > TOLERANCE_MB:
+            failures.append(f"'{label}' grew by {growth:.1f} MB")
+    if failures:
+        sys.exit(f"peak RSS not flat (tolerance {TOLERANCE_MB} MB): " + ", ".join(failures))
+    print(f"peak RSS flat within {TOLERANCE_MB} MB")
+
+
+if __name__ == '__main__':
+    main()
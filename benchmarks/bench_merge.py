@@ -0,0 +1,66 @@
+"""
+Compare regenerating one large .drawio file with merging the same change into
+it (see sources/drawioMerge.py), when one member of one class changed, and
+when nothing changed.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_merge [class_count] [member_count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sources import classModel
+from sources import drawioMerge
+from sources import txt2drawio
+
+
+def make_classes(class_count, member_count):
+    classes = []
+    for index in range(class_count):
+        member_funcs = [classModel.Member('+', f"Method{number}", "(int value, string name)", 'bool')
+                        for number in range(member_count // 2)]
+        member_vars = [classModel.Member('-', f"field{number}", '', 'List<int>')
+                       for number in range(member_count - member_count // 2)]
+        classes.append((f"Game::Class{index}", member_funcs, member_vars))
+    return classes
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    classes = make_classes(class_count, member_count)
+
+    with tempfile.TemporaryDirectory() as folder:
+        output_file_path = os.path.join(folder, 'classes.drawio')
+        txt2drawio.create_multi_class_diagram(classes, output_file_path, bMerge=True)
+        size = os.path.getsize(output_file_path)
+
+        # A merge which writes the file would change its modification time
+        os.utime(output_file_path, (0, 0))
+        unchanged_seconds, unchanged_counts = timed(drawioMerge.merge_diagram, output_file_path, classes)
+        bWritten = os.path.getmtime(output_file_path) != 0
+
+        # One member of one class gets another type
+        class_name, member_funcs, member_vars = classes[0]
+        changed_vars = [classModel.Member('-', 'field0', '', 'Dictionary<int, string>')] + member_vars[1:]
+        changed = [(class_name, member_funcs, changed_vars)] + classes[1:]
+        merge_seconds, merge_counts = timed(drawioMerge.merge_diagram, output_file_path, changed)
+        regenerate_seconds, _ = timed(txt2drawio.create_multi_class_diagram, changed, output_file_path)
+
+    print(f"{class_count} classes, {class_count * member_count} members, {size / 1e6:.1f} MB")
+    print(f"{'':<22} {'seconds':>8}  cells changed")
+    print(f"{'regenerate':<22} {regenerate_seconds:>8.3f}  all")
+    print(f"{'merge, 1 change':<22} {merge_seconds:>8.3f}  {merge_counts['updated']} updated")
+    print(f"{'merge, no change':<22} {unchanged_seconds:>8.3f}  {unchanged_counts['updated']} updated, "
+          f"file {'' if bWritten else 'not '}written")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare the memory and the sort time of the parsed classes when their members
+are kept as classModel.Member, and as formatted lines ("+ Foo(int x) : void").
+
+Without arguments a small and a large corpus are measured: the interned strings
+only pay off once they repeat, so on a small one the Member records take about
+as much memory as the lines, and on a large one about 15 % less. The sort
+takes about the same time.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_model [class_count] [member_count]
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import corpus
+from sources import classModel
+from sources import xmlExtractorWithType
+
+
+def measure(build):
+    """
+    Return (bytes allocated by build, its result).
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def time_sort(members, key):
+    start = time.perf_counter()
+    for class_members in members:
+        sorted(class_members, key=key)
+    return time.perf_counter() - start
+
+
+def as_lines(extracted_info):
+    """
+    Keep the members of an extracted info as formatted lines, like the extractors used to.
+    """
+    for key in ("member_functions", "member_variables"):
+        extracted_info[key] = [str(member) for member in extracted_info[key]]
+    return extracted_info
+
+
+def run(class_count, member_count):
+    with tempfile.TemporaryDirectory() as folder:
+        corpus.generate_corpus(folder, class_count, member_count, bVariety=True)
+        xml_paths = [os.path.join(folder, file_name) for file_name in xmlExtractorWithType.list_xml_files(folder)]
+        # The whole extracted info is measured, the class names and refids are the same in both
+        members_size, members_info = measure(
+            lambda: [xmlExtractorWithType.parse_doxygen_xml(xml_path) for xml_path in xml_paths])
+        lines_size, lines_info = measure(
+            lambda: [as_lines(xmlExtractorWithType.parse_doxygen_xml(xml_path)) for xml_path in xml_paths])
+
+    members = [info["member_functions"] + info["member_variables"] for info in members_info]
+    lines = [info["member_functions"] + info["member_variables"] for info in lines_info]
+    member_total = sum(len(class_members) for class_members in members)
+    print(f"{class_count} classes, {member_total} members")
+    print(f"{'':<16} {'bytes/member':>12} {'sort ms':>9}")
+    print(f"{'formatted lines':<16} {lines_size / member_total:>12.1f} "
+          f"{time_sort(lines, lambda line: (classModel.ACCESS_ORDER.get(line[0], 3), line)) * 1000:>9.1f}")
+    print(f"{'Member':<16} {members_size / member_total:>12.1f} "
+          f"{time_sort(members, classModel.Member.sort_key) * 1000:>9.1f}")
+
+
+def main():
+    if len(sys.argv) > 1:
+        sizes = [(int(sys.argv[1]), int(sys.argv[2]) if len(sys.argv) > 2 else 50)]
+    else:
+        sizes = [(20, 10), (2000, 50)]
+    for class_count, member_count in sizes:
+        run(class_count, member_count)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the serial direct conversion with the pipelined one on a file system
+with a simulated latency: every open() of a corpus file first sleeps, like a
+round trip to a network share.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_pipelined [class_count] [member_count] [latency_ms] [io_threads]
+"""
+import builtins
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+from sources import pipeline
+
+
+def slow_open(folder, latency):
+    real_open = builtins.open
+
+    def open_with_latency(file, *args, **kwargs):
+        if isinstance(file, str) and file.startswith(folder):
+            time.sleep(latency)
+        return real_open(file, *args, **kwargs)
+    return open_with_latency
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 5.0) / 1000
+    io_threads = int(sys.argv[4]) if len(sys.argv) > 4 else 8
+    with tempfile.TemporaryDirectory() as folder:
+        xml_folder = os.path.join(folder, 'xmls')
+        corpus.generate_corpus(xml_folder, class_count, member_count)
+        print(f"{class_count} classes x {member_count} members, {latency * 1000:.1f} ms per open")
+
+        real_open = builtins.open
+        builtins.open = slow_open(folder, latency)
+        try:
+            start = time.perf_counter()
+            pipeline.convert_xml_folder(xml_folder, os.path.join(folder, 'serial'))
+            serial_time = time.perf_counter() - start
+
+            # The stage statistics are printed below, after the comparison
+            stats = io.StringIO()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(stats):
+                pipeline.convert_xml_folder(xml_folder, os.path.join(folder, 'pipelined'), bPipelined=True,
+                                            io_threads=io_threads)
+            pipelined_time = time.perf_counter() - start
+        finally:
+            builtins.open = real_open
+
+        print(f"{'serial':<12} {serial_time:>8.2f} s")
+        print(f"{'pipelined':<12} {pipelined_time:>8.2f} s")
+        print(stats.getvalue(), end='')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Time the parse of a corpus where part of the file compounds have no members
+(files of usings and assembly attributes, generated code Doxygen did not link),
+with and without the mmap pre-scan of sources/mappedInput.py.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_prescan [class_count] [member_count] [empty_count] [line_count] [repeat]
+
+The best time of `repeat` runs is reported.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+from sources import xmlExtractorWithType
+
+
+EMPTY_HEADER = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:noNamespaceSchemaLocation="compound.xsd" version="1.12.0" xml:lang="en-US">
+  <compounddef id="{file_id}" kind="file" language="C#">
+    <compoundname>{file_name}</compoundname>
+    <briefdescription>
+    </briefdescription>
+    <detaileddescription>
+    </detaileddescription>
+    <programlisting>
+"""
+
+
+def write_empty_compound(folder, index, line_count):
+    """
+    Write a file compound whose program listing has line_count lines and no member.
+    """
+    name = f"Generated{index}"
+    path = os.path.join(folder, f"{name}_8cs.xml")
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(EMPTY_HEADER.format(file_id=f"{name}_8cs", file_name=f"{name}.cs"))
+        for lineno in range(1, line_count + 1):
+            file.write(f'<codeline lineno="{lineno}"><highlight class="normal">[assembly:<sp/>'
+                       f'InternalsVisibleTo(</highlight><highlight class="stringliteral">"Generated.Tests{lineno}"'
+                       f'</highlight><highlight class="normal">)]</highlight></codeline>\n')
+        file.write(corpus.FOOTER.format(file_name=f"{name}.cs"))
+    return path
+
+
+def best_time(run, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    empty_count = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    line_count = int(sys.argv[4]) if len(sys.argv) > 4 else 200
+    repeat = int(sys.argv[5]) if len(sys.argv) > 5 else 3
+    with tempfile.TemporaryDirectory() as folder:
+        corpus.generate_corpus(folder, class_count, member_count)
+        for index in range(empty_count):
+            write_empty_compound(folder, index, line_count)
+        total_bytes = sum(entry.stat().st_size for entry in os.scandir(folder))
+        print(f"{class_count} classes x {member_count} members, {empty_count} compounds without members "
+              f"of {line_count} lines, {total_bytes / 1e6:.1f} MB")
+
+        full_time, full_results = best_time(lambda: xmlExtractorWithType.parse_all_xml_in_folder(folder), repeat)
+        prescan_time, prescan_results = best_time(
+            lambda: xmlExtractorWithType.parse_all_xml_in_folder(folder, bSkipEmpty=True), repeat)
+
+        kept_results = [result for result in full_results
+                        if result["extracted_info"]["member_functions"] or result["extracted_info"]["member_variables"]]
+        print(f"{'full parse':<20} {full_time:>8.2f} s")
+        print(f"{'mmap pre-scan':<20} {prescan_time:>8.2f} s")
+        print(f"skipped {len(full_results) - len(prescan_results)} files, saved {full_time - prescan_time:.2f} s "
+              f"({(1 - prescan_time / full_time) * 100:.0f} %)")
+        print(f"same classes with members: {kept_results == prescan_results}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Compare the output formats of sources/renderers.py on one single-file diagram
+with relations: the time and size of each format on its own, and writing all
+of them from one parse against one run per format.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_renderers [class_count] [member_count] [repeat]
+
+The best time of `repeat` runs is reported.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+from sources import pipeline
+from sources import renderers
+
+
+def best_time(run, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    with tempfile.TemporaryDirectory() as folder:
+        xml_folder = os.path.join(folder, 'xmls')
+        output_file_path = os.path.join(folder, 'out', 'classes.drawio')
+        corpus.generate_corpus(xml_folder, class_count, member_count, bRelations=True)
+        print(f"{class_count} classes x {member_count} members, parse + write of one file with relations")
+
+        def convert(formats):
+            pipeline.convert_xml_folder_to_single_file(xml_folder, output_file_path, bRelations=True, formats=formats)
+
+        total = 0.0
+        for name in renderers.FORMATS:
+            seconds = best_time(lambda: convert([name]), repeat)
+            total += seconds
+            size = os.path.getsize(renderers.RENDERERS[name]().output_path(output_file_path))
+            print(f"{name:<28} {seconds:>8.2f} s {size / 1e6:>8.1f} MB")
+        print(f"{'one run per format':<28} {total:>8.2f} s")
+        print(f"{'all formats, one parse':<28} {best_time(lambda: convert(renderers.FORMATS), repeat):>8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Measure the start-up time of the command line and of importing the modules.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_startup [repeat]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = [
+    ('python (empty)', ['-c', 'pass']),
+    ('import doxygen2drawio', ['-c', 'import doxygen2drawio']),
+    ('doxygen2drawio.py --help', ['doxygen2drawio.py', '--help']),
+    ('import sources.xmlExtractorWithType', ['-c', 'import sources.xmlExtractorWithType']),
+    ('import sources.pipeline', ['-c', 'import sources.pipeline']),
+]
+
+
+def best_time(args, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for label, args in COMMANDS:
+        print(f"{label:<38} {best_time(args, repeat) * 1000:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
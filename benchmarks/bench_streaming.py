@@ -0,0 +1,49 @@
+"""
+Compare peak RSS and wall time of the tree based and the iterparse based
+extractor on one large synthetic compound file.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_streaming [member_count]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import corpus
+
+# Each mode runs in a fresh interpreter so that ru_maxrss only covers one parse
+CHILD = """
+import resource, sys, time
+from sources import xmlExtractorWithType
+parse = xmlExtractorWithType.parse_doxygen_xml_streaming if sys.argv[2] == 'streaming' else xmlExtractorWithType.parse_doxygen_xml
+start = time.perf_counter()
+info = parse(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, len(info['member_functions']) + len(info['member_variables']))
+"""
+
+
+def run_mode(xml_file, mode):
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD, xml_file, mode],
+        check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ).stdout.split()
+    return float(output[0]), int(output[1]), int(output[2])
+
+
+def main():
+    member_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as folder:
+        xml_file = corpus.write_file_compound(folder, "Huge", member_count)
+        size_mb = os.path.getsize(xml_file) / (1024 * 1024)
+        print(f"{member_count} members, {size_mb:.1f} MB")
+        print(f"{'mode':<10} {'time (s)':>10} {'peak RSS (MB)':>14} {'members':>9}")
+        for mode in ('tree', 'streaming'):
+            elapsed, max_rss, members = run_mode(xml_file, mode)
+            print(f"{mode:<10} {elapsed:>10.2f} {max_rss / 1024:>14.1f} {members:>9}")
+
+
+if __name__ == '__main__':
+    main()
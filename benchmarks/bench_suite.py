@@ -0,0 +1,138 @@
+"""
+Time each stage of the conversion on a synthetic corpus and save the results
+as JSON, so that two commits can be compared.
+
+Stages: parse (parse_doxygen_xml), sort (get_sorted_member_info), render
+(render_class_text), read_text (txt2drawio.extract_class_info) and diagram
+(txt2drawio.create_class_diagram). Each stage runs over every file of the
+corpus and the best of --repeat runs is kept.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_suite --classes 500 --members 40 --output before.json
+    python -m benchmarks.bench_suite --classes 500 --members 40 --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+from sources import txt2drawio
+from sources import xmlExtractorWithType
+
+
+def best_time(function, items, repeat):
+    """
+    Call function on every item, repeat times, and return (best seconds, results of the last run).
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [function(item) for item in items]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def run_suite(folder, class_count, member_count, repeat, bVariety=True):
+    xml_folder = os.path.join(folder, 'xmls')
+    text_folder = os.path.join(folder, 'texts')
+    drawio_folder = os.path.join(folder, 'drawio')
+    for path in (text_folder, drawio_folder):
+        os.makedirs(path)
+    corpus.generate_corpus(xml_folder, class_count, member_count, bRelations=True, bVariety=bVariety)
+
+    xml_paths = [os.path.join(xml_folder, file_name) for file_name in xmlExtractorWithType.list_xml_files(xml_folder)]
+    stages = {}
+
+    stages['parse'], all_extracted_info = best_time(xmlExtractorWithType.parse_doxygen_xml, xml_paths, repeat)
+    stages['sort'], _ = best_time(xmlExtractorWithType.get_sorted_member_info, all_extracted_info, repeat)
+    stages['render'], contents = best_time(xmlExtractorWithType.render_class_text, all_extracted_info, repeat)
+
+    # The .txt files are written outside of the timings, create_text_file also prints
+    text_paths = []
+    for xml_path, content in zip(xml_paths, contents):
+        text_path = os.path.join(text_folder, xmlExtractorWithType.format_file_name(os.path.basename(xml_path)))
+        with open(text_path, 'w') as file:
+            file.write(content)
+        text_paths.append(text_path)
+
+    stages['read_text'], _ = best_time(txt2drawio.extract_class_info, text_paths, repeat)
+    stages['diagram'], _ = best_time(lambda text_path: txt2drawio.create_class_diagram(text_path, drawio_folder),
+                                     text_paths, repeat)
+
+    member_count_total = sum(len(info["member_functions"]) + len(info["member_variables"])
+                             for info in all_extracted_info)
+    input_bytes = sum(os.path.getsize(path) for path in xml_paths)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {
+            "classes": class_count,
+            "members_per_class": member_count,
+            "members_parsed": member_count_total,
+            "variety": bVariety,
+            "input_bytes": input_bytes
+        },
+        "repeat": repeat,
+        "stages": {
+            name: {
+                "seconds": seconds,
+                "us_per_class": seconds / class_count * 1e6
+            } for name, seconds in stages.items()
+        },
+        "total_seconds": sum(stages.values())
+    }
+
+
+def print_results(results, baseline=None):
+    header = f"{'stage':<12} {'seconds':>9} {'us/class':>10}"
+    if baseline:
+        header += f" {'baseline':>9} {'change':>8}"
+    print(header)
+    rows = list(results["stages"].items()) + [("total", {"seconds": results["total_seconds"], "us_per_class": None})]
+    for name, stage in rows:
+        line = f"{name:<12} {stage['seconds']:>9.3f} "
+        line += f"{stage['us_per_class']:>10.1f}" if stage['us_per_class'] is not None else f"{'':>10}"
+        if baseline:
+            old_seconds = (baseline["total_seconds"] if name == "total"
+                           else baseline["stages"].get(name, {}).get("seconds"))
+            if old_seconds:
+                line += f" {old_seconds:>9.3f} {(stage['seconds'] - old_seconds) / old_seconds * 100:>+7.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each conversion stage on a synthetic Doxygen corpus.")
+    parser.add_argument('--classes', type=int, default=500, help="number of classes (default: %(default)s)")
+    parser.add_argument('--members', type=int, default=40, help="members per class (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage, the best is kept (default: %(default)s)")
+    parser.add_argument('--plain', action='store_true',
+                        help="no attributes, generics or multi-line signatures in the corpus")
+    parser.add_argument('--output', metavar='JSON', help="save the results to this file")
+    parser.add_argument('--compare', metavar='JSON', help="show the change against results saved with --output")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        results = run_suite(folder, args.classes, args.members, args.repeat, not args.plain)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline.get("corpus") != results["corpus"]:
+            print("Warning: the baseline was measured on another corpus", file=sys.stderr)
+
+    print(f"{args.classes} classes x {args.members} members, best of {args.repeat}")
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Compare the ElementTree writer (build the whole tree, indent it, save it) with
+the streaming drawioWriter on one large .drawio file, and check that both
+write the same bytes.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_writer [class_count] [member_count]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from sources import drawioWriter
+from sources import layout
+from sources import txt2drawio
+
+
+def make_classes(class_count, member_count):
+    classes = []
+    for index in range(class_count):
+        member_funcs = [f"+ Method{number}(int value, string name) : bool" for number in range(member_count // 2)]
+        member_vars = [f"- field{number} : List<int>" for number in range(member_count - member_count // 2)]
+        classes.append((f"Game::Class{index}", member_funcs, member_vars))
+    return classes
+
+
+def indent(elem, level=0):
+    """Recursively indent XML elements for pretty printing"""
+    i = "\n" + level * "  "
+    if len(elem):
+        if not elem.text or not elem.text.strip():
+            elem.text = i + "  "
+        if not elem.tail or not elem.tail.strip():
+            elem.tail = i
+        for elem in elem:
+            indent(elem, level + 1)
+        if not elem.tail or not elem.tail.strip():
+            elem.tail = i
+    else:
+        if level and (not elem.tail or not elem.tail.strip()):
+            elem.tail = i
+
+
+def create_mxfile():
+    return ET.Element('mxfile', drawioWriter.MXFILE_ATTRIBUTES)
+
+
+def add_diagram_page(mxfile, diagram_id='C5RBs43oDa-KdzZeNtuy', name='Page-1', root_id='0', layer_id='1'):
+    """
+    Add a page to the mxfile and return its root element, which holds the cells.
+    root_id and layer_id are the ids of the two cells every page starts with.
+    """
+    diagram = ET.SubElement(mxfile, 'diagram', {
+        'id': diagram_id,
+        'name': name
+    })
+    mxGraphModel = ET.SubElement(diagram, 'mxGraphModel', drawioWriter.GRAPH_MODEL_ATTRIBUTES)
+    root = ET.SubElement(mxGraphModel, 'root')
+    ET.SubElement(root, 'mxCell', {'id': root_id})
+    ET.SubElement(root, 'mxCell', {'id': layer_id, 'parent': root_id})
+    return root
+
+
+def add_class_cells(root, class_name, member_funcs, member_vars, cell_id=2, x='480', y='100'):
+    """
+    Add the cells of one class box to a page and return the next free cell id, see txt2drawio.class_cells.
+    """
+    for attributes, geometry in txt2drawio.class_cells(class_name, member_funcs, member_vars, cell_id, x, y):
+        cell = ET.SubElement(root, 'mxCell', attributes)
+        ET.SubElement(cell, 'mxGeometry', geometry)
+    return cell_id + txt2drawio.class_cell_count(member_funcs, member_vars)
+
+
+def write_mxfile(mxfile, output_file_path, bPretty=True):
+    if bPretty:
+        indent(mxfile)
+    ET.ElementTree(mxfile).write(output_file_path, encoding='UTF-8', xml_declaration=True)
+
+
+def write_with_tree(classes, output_file_path):
+    # The previous create_multi_class_diagram, on a single page
+    mxfile = create_mxfile()
+    root = add_diagram_page(mxfile)
+    cell_id = 2
+    sizes = [txt2drawio.class_box_size(member_funcs, member_vars) for _, member_funcs, member_vars in classes]
+    for (class_name, member_funcs, member_vars), (x, y) in zip(classes, layout.pack_boxes(sizes)):
+        cell_id = add_class_cells(root, class_name, member_funcs, member_vars, cell_id, str(x), str(y))
+    write_mxfile(mxfile, output_file_path)
+
+
+def write_with_stream(classes, output_file_path):
+    txt2drawio.create_multi_class_diagram(classes, output_file_path)
+
+
+def peak_memory(write, classes, output_file_path):
+    tracemalloc.start()
+    write(classes, output_file_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    classes = make_classes(class_count, member_count)
+    cell_count = 2 + sum(txt2drawio.class_cell_count(member_funcs, member_vars)
+                         for _, member_funcs, member_vars in classes)
+    print(f"{class_count} classes x {member_count} members, {cell_count} cells")
+
+    with tempfile.TemporaryDirectory() as folder:
+        tree_path = os.path.join(folder, 'tree.drawio')
+        stream_path = os.path.join(folder, 'stream.drawio')
+        # Time without tracemalloc first, it slows both writers down
+        for name, write, path in (("ElementTree", write_with_tree, tree_path),
+                                  ("streaming", write_with_stream, stream_path)):
+            start = time.perf_counter()
+            write(classes, path)
+            elapsed = time.perf_counter() - start
+            peak = peak_memory(write, classes, path)
+            print(f"{name:<12} {elapsed:>8.2f} s {peak / 1024 / 1024:>10.1f} MB peak")
+
+        with open(tree_path, 'rb') as tree_file, open(stream_path, 'rb') as stream_file:
+            print(f"same bytes: {tree_file.read() == stream_file.read()}")
+
+
+if __name__ == '__main__':
+    main()
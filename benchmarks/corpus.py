@@ -0,0 +1,309 @@
+"""
+Synthetic Doxygen compound XML generator used by the benchmarks.
+
+The generated files follow the layout of xmls/test_8cs.xml: one file
+compound per class, with a <programlisting> whose member lines carry
+refkind="member".
+"""
+import os
+
+HEADER = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:noNamespaceSchemaLocation="compound.xsd" version="1.12.0" xml:lang="en-US">
+  <compounddef id="{file_id}" kind="file" language="C#">
+    <compoundname>{file_name}</compoundname>
+    <innerclass refid="class{class_name}" prot="public">{inner_class_name}</innerclass>
+    <briefdescription>
+    </briefdescription>
+    <detaileddescription>
+    </detaileddescription>
+    <programlisting>
+"""
+
+FOOTER = """    </programlisting>
+    <location file="{file_name}"/>
+  </compounddef>
+</doxygen>
+"""
+
+ACCESS = ['public', 'protected', 'private']
+TYPES = ['int', 'float', 'string', 'bool', 'void']
+SP4 = '<sp/><sp/><sp/><sp/>'
+
+
+def _member_lines(class_name, index, lineno, bVariety=False):
+    """
+    Return the codelines of the index-th member of a class and the next line number.
+    Even members are fields, odd members are methods with a small body.
+    With bVariety, every second field has an attribute and a generic type, and
+    every second method has generic types and a signature split over two lines.
+    """
+    access = ACCESS[index % len(ACCESS)]
+    type_name = TYPES[index % len(TYPES)]
+    refid = f"class{class_name}_1a{index:032x}"
+    lines = []
+    if bVariety and index % 4 == 2:
+        member = f"field{index}"
+        lines.append(
+            f'<codeline lineno="{lineno}" refid="{refid}" refkind="member"><highlight class="normal">{SP4}'
+            f'[SerializeField,<sp/>Range(0,<sp/>10)]<sp/></highlight>'
+            f'<highlight class="keyword">{access}</highlight><highlight class="normal"><sp/>List&lt;</highlight>'
+            f'<highlight class="keywordtype">{type_name}</highlight><highlight class="normal">&gt;<sp/>'
+            f'<ref refid="{refid}" kindref="member">{member}</ref>;</highlight></codeline>')
+        lineno += 1
+    elif bVariety and index % 4 == 3:
+        member = f"Method{index}"
+        lines.append(
+            f'<codeline lineno="{lineno}" refid="{refid}" refkind="member"><highlight class="normal">{SP4}</highlight>'
+            f'<highlight class="keyword">{access}</highlight><highlight class="normal"><sp/></highlight>'
+            f'<highlight class="keyword">static</highlight><highlight class="normal"><sp/>Dictionary&lt;</highlight>'
+            f'<highlight class="keywordtype">string</highlight><highlight class="normal">,<sp/></highlight>'
+            f'<highlight class="keywordtype">{type_name}</highlight><highlight class="normal">&gt;<sp/>'
+            f'<ref refid="{refid}" kindref="member">{member}</ref>(List&lt;int&gt;<sp/>a,</highlight></codeline>')
+        lines.append(
+            f'<codeline lineno="{lineno + 1}"><highlight class="normal">{SP4}{SP4}'
+            f'</highlight><highlight class="keywordtype">float</highlight><highlight class="normal"><sp/>b)<sp/>'
+            f'{{</highlight></codeline>')
+        lines.append(
+            f'<codeline lineno="{lineno + 2}"><highlight class="normal">{SP4}{SP4}'
+            f'return<sp/>null;</highlight></codeline>')
+        lines.append(
+            f'<codeline lineno="{lineno + 3}"><highlight class="normal">{SP4}}}</highlight></codeline>')
+        lineno += 4
+    elif index % 2 == 0:
+        member = f"field{index}"
+        lines.append(
+            f'<codeline lineno="{lineno}" refid="{refid}" refkind="member"><highlight class="normal">{SP4}</highlight>'
+            f'<highlight class="keyword">{access}</highlight><highlight class="normal"><sp/></highlight>'
+            f'<highlight class="keywordtype">{type_name}</highlight><highlight class="normal"><sp/>'
+            f'<ref refid="{refid}" kindref="member">{member}</ref>;</highlight></codeline>')
+        lineno += 1
+    else:
+        member = f"Method{index}"
+        lines.append(
+            f'<codeline lineno="{lineno}" refid="{refid}" refkind="member"><highlight class="normal">{SP4}</highlight>'
+            f'<highlight class="keyword">{access}</highlight><highlight class="normal"><sp/></highlight>'
+            f'<highlight class="keywordtype">{type_name}</highlight><highlight class="normal"><sp/>'
+            f'<ref refid="{refid}" kindref="member">{member}</ref>(int<sp/>a,<sp/>float<sp/>b){{</highlight></codeline>')
+        lines.append(
+            f'<codeline lineno="{lineno + 1}"><highlight class="normal">{SP4}{SP4}'
+            f'return;</highlight></codeline>')
+        lines.append(
+            f'<codeline lineno="{lineno + 2}"><highlight class="normal">{SP4}}}</highlight></codeline>')
+        lineno += 3
+    return lines, lineno
+
+
+def write_file_compound(folder, class_name, member_count, base_class=None, field_class=None, bVariety=False,
+                        namespace=None):
+    """
+    Write one synthetic '<class_name>_8cs.xml' file compound into folder.
+
+    Args:
+    - folder (str): The output folder.
+    - class_name (str): The name of the generated class.
+    - member_count (int): The number of members in the class.
+    - base_class (str): If set, the class derives from this class.
+    - field_class (str): If set, the class gets a field of this class type.
+    - bVariety (bool): Add attributes, generic types and multi-line signatures, see _member_lines.
+    - namespace (str): If set, the namespace of the class, shown in the <innerclass> name.
+
+    Returns:
+    - str: The path of the written file.
+    """
+    file_name = f"{class_name}.cs"
+    path = os.path.join(folder, f"{class_name}_8cs.xml")
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(HEADER.format(file_id=f"{class_name}_8cs", file_name=file_name, class_name=class_name,
+                                 inner_class_name=qualified_name(class_name, namespace)))
+        file.write(
+            f'<codeline lineno="1" refid="class{class_name}" refkind="compound"><highlight class="keyword">public</highlight>'
+            f'<highlight class="normal"><sp/></highlight><highlight class="keyword">class<sp/></highlight>'
+            f'<highlight class="normal"><ref refid="class{class_name}" kindref="compound">{class_name}</ref>')
+        if base_class:
+            file.write(f'<sp/>:<sp/><ref refid="class{base_class}" kindref="compound">{base_class}</ref>')
+        file.write('</highlight></codeline>\n')
+        file.write('<codeline lineno="2"><highlight class="normal">{</highlight></codeline>\n')
+        lineno = 3
+        if field_class:
+            refid = f"class{class_name}_1a{'f' * 32}"
+            file.write(
+                f'<codeline lineno="{lineno}" refid="{refid}" refkind="member"><highlight class="normal">{SP4}</highlight>'
+                f'<highlight class="keyword">public</highlight><highlight class="normal"><sp/>'
+                f'<ref refid="class{field_class}" kindref="compound">{field_class}</ref><sp/>'
+                f'<ref refid="{refid}" kindref="member">linked</ref>;</highlight></codeline>\n')
+            lineno += 1
+        for index in range(member_count):
+            lines, lineno = _member_lines(class_name, index, lineno, bVariety)
+            file.write('\n'.join(lines) + '\n')
+        file.write(f'<codeline lineno="{lineno}"><highlight class="normal">}}</highlight></codeline>\n')
+        file.write(FOOTER.format(file_name=file_name))
+    return path
+
+
+CLASS_HEADER = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:noNamespaceSchemaLocation="compound.xsd" version="1.12.0" xml:lang="en-US">
+  <compounddef id="class{class_name}" kind="class" language="C#" prot="public">
+    <compoundname>{qualified_name}</compoundname>
+"""
+
+CLASS_FOOTER = """    <briefdescription>
+    </briefdescription>
+    <detaileddescription>
+    </detaileddescription>
+    <location file="{class_name}.cs" line="1" column="1" bodyfile="{class_name}.cs" bodystart="1" bodyend="-1"/>
+    <listofallmembers>
+{members}    </listofallmembers>
+  </compounddef>
+</doxygen>
+"""
+
+
+def _memberdef(class_name, refid, kind, access, type_xml, name, argsstring, params):
+    param_xml = ''.join(
+        f"        <param>\n          <type>{param_type}</type>\n          <declname>{param_name}</declname>\n        </param>\n"
+        for param_type, param_name in params)
+    return (
+        f'      <memberdef kind="{kind}" id="{refid}" prot="{access}" static="no" virt="non-virtual">\n'
+        f'        <type>{type_xml}</type>\n'
+        f'        <definition>{name}</definition>\n'
+        f'        <argsstring>{argsstring}</argsstring>\n'
+        f'        <name>{name}</name>\n'
+        f'        <qualifiedname>{class_name}.{name}</qualifiedname>\n'
+        f'{param_xml}'
+        f'        <briefdescription>\n        </briefdescription>\n'
+        f'        <detaileddescription>\n        </detaileddescription>\n'
+        f'        <inbodydescription>\n        </inbodydescription>\n'
+        f'        <location file="{class_name}.cs" line="1" column="1" bodyfile="{class_name}.cs" bodystart="1" bodyend="1"/>\n'
+        f'      </memberdef>\n')
+
+
+def write_class_compound(folder, class_name, member_count, base_class=None, field_class=None, namespace=None):
+    """
+    Write the 'class<class_name>.xml' class compound describing the same class
+    as write_file_compound, with one <memberdef> per member.
+    With namespace, the compound name is '<namespace>::<class_name>'.
+
+    Returns:
+    - str: The path of the written file.
+    """
+    path = os.path.join(folder, f"class{class_name}.xml")
+    attributes = []
+    functions = []
+    all_members = []
+    if field_class:
+        refid = f"class{class_name}_1a{'f' * 32}"
+        attributes.append(_memberdef(
+            class_name, refid, 'variable', 'public',
+            f'<ref refid="class{field_class}" kindref="compound">{field_class}</ref>', 'linked', '', []))
+        all_members.append((refid, 'linked'))
+    for index in range(member_count):
+        access = ACCESS[index % len(ACCESS)]
+        type_name = TYPES[index % len(TYPES)]
+        refid = f"class{class_name}_1a{index:032x}"
+        if index % 2 == 0:
+            attributes.append(_memberdef(class_name, refid, 'variable', access, type_name, f"field{index}", '', []))
+            all_members.append((refid, f"field{index}"))
+        else:
+            functions.append(_memberdef(class_name, refid, 'function', access, type_name, f"Method{index}",
+                                        '(int a, float b)', [('int', 'a'), ('float', 'b')]))
+            all_members.append((refid, f"Method{index}"))
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(CLASS_HEADER.format(class_name=class_name, qualified_name=qualified_name(class_name, namespace)))
+        if base_class:
+            file.write(f'    <basecompoundref refid="class{base_class}" prot="public" virt="non-virtual">'
+                       f'{base_class}</basecompoundref>\n')
+        for section_kind, members in (('attrib', attributes), ('func', functions)):
+            if members:
+                file.write(f'    <sectiondef kind="{section_kind}">\n')
+                file.write(''.join(members))
+                file.write('    </sectiondef>\n')
+        file.write(CLASS_FOOTER.format(class_name=class_name, members=''.join(
+            f'      <member refid="{refid}" prot="public" virt="non-virtual"><scope>{class_name}</scope>'
+            f'<name>{name}</name></member>\n' for refid, name in all_members)))
+    return path
+
+
+INDEX_HEADER = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:noNamespaceSchemaLocation="index.xsd" version="1.12.0" xml:lang="en-US">
+"""
+
+
+def qualified_name(class_name, namespace=None):
+    return f"{namespace}::{class_name}" if namespace else class_name
+
+
+def write_index(folder, classes, member_count):
+    """
+    Write the index.xml listing the class compounds, their namespaces and their file compounds.
+
+    Args:
+    - classes (list): (class_name, namespace) of each class compound.
+    """
+    path = os.path.join(folder, 'index.xml')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(INDEX_HEADER)
+        for class_name, namespace in classes:
+            file.write(f'  <compound refid="class{class_name}" kind="class">'
+                       f'<name>{qualified_name(class_name, namespace)}</name>\n')
+            for index in range(member_count):
+                kind, name = ('variable', f"field{index}") if index % 2 == 0 else ('function', f"Method{index}")
+                file.write(f'    <member refid="class{class_name}_1a{index:032x}" kind="{kind}">'
+                           f'<name>{name}</name></member>\n')
+            file.write('  </compound>\n')
+        for namespace in sorted({namespace for _, namespace in classes if namespace}):
+            file.write(f'  <compound refid="namespace{namespace}" kind="namespace"><name>{namespace}</name>\n'
+                       f'  </compound>\n')
+        for class_name, _ in classes:
+            file.write(f'  <compound refid="_{class_name}_8cs" kind="file"><name>{class_name}.cs</name>\n'
+                       f'  </compound>\n')
+        file.write('</doxygenindex>\n')
+    return path
+
+
+def class_name_for(index):
+    """
+    Return a class name for index using letters only.
+    Digits are avoided because format_file_name drops every '8' from the file name.
+    """
+    letters = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord('A') + rest) + letters
+    return f"Class{letters}"
+
+
+def generate_corpus(folder, class_count, member_count, bRelations=False, bClassCompounds=False, namespace_count=0,
+                    bVariety=False):
+    """
+    Generate class_count file compounds with member_count members each.
+    With bRelations, every third class derives from another class and every
+    class but the first has a field typed with the previous class.
+    With bClassCompounds, the matching class compound of every class is written
+    too, with an index.xml listing them. With namespace_count, the classes
+    are spread over that many namespaces. bVariety is passed to
+    write_file_compound, the class compounds keep the plain members.
+
+    Returns:
+    - list: The paths of the generated files.
+    """
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    paths = []
+    classes = []
+    for index in range(class_count):
+        base_class = field_class = None
+        if bRelations and index > 0:
+            field_class = class_name_for(index - 1)
+            if index % 3 == 0:
+                base_class = class_name_for(index // 2)
+        namespace = f"Namespace{class_name_for(index % namespace_count)[5:]}" if namespace_count else None
+        paths.append(write_file_compound(folder, class_name_for(index), member_count, base_class, field_class,
+                                         bVariety, namespace))
+        if bClassCompounds:
+            write_class_compound(folder, class_name_for(index), member_count, base_class, field_class, namespace)
+            classes.append((class_name_for(index), namespace))
+    if bClassCompounds:
+        write_index(folder, classes, member_count)
+    return paths
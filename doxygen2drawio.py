@@ -1,13 +1,318 @@
-from sources import xmlExtractor
-from sources import xmlExtractorWithType
-from sources import txt2drawio
-
+# Default settings, each one can be changed from the command line
 bWithType = True
+# 'codeline' reads the file compounds (*cs.xml, *_8h.xml, *_8java.xml, see sources/languages.py),
+# 'memberdef' reads the class compounds (class*.xml, ...), 'index' reads the class compounds listed in index.xml
+backend = 'codeline'
+# Parse each xml with iterparse (flat memory for very large compound files)
+bStreaming = False
+# Map each xml with mmap and skip the ones without members before parsing them (no empty class boxes)
+bSkipEmpty = False
+# Number of worker processes used for extraction and diagram generation (1 = no pool)
+numWorkers = 1
+# With workers, the most megabytes of .xml files handed to the worker processes and not finished yet
+# (None = no limit). The classes are written as they come back, so this bounds the memory of large runs.
+# It needs numWorkers above 1 (the command line rejects it otherwise): a single process already reads one file at a time
+memoryLimitMB = None
+# Only regenerate the files whose source changed since the last run
+bIncremental = False
+# Pass the extracted classes straight to the diagram generator, without the texts folder round-trip
+bDirect = False
+# Also write the .txt files in direct mode
+bWriteTexts = True
+# If set, write every class into this single .drawio file instead of one file per class
+single_file = None
+# With single_file, put the classes of each namespace on their own page
+bPagePerNamespace = False
+# With single_file, draw inheritance and association edges between the classes
+bRelations = False
+# If set, keep the parse results in this folder and reuse them for unchanged .xml files
+cache_folder = None
+# Size cap of the parse cache, the least recently used entries are removed above it
+cacheSizeMB = 256
+# Indent the .drawio XML, turn it off for smaller files
+bPretty = True
+# Store the .drawio pages deflated and base64 encoded, like the "Compressed" option of draw.io
+bCompressed = False
+# Leave out the style keys the built-in draw.io named styles ("text", "swimlane") already set
+bSharedStyles = False
+# Fit each class box to its members instead of the fixed 500 x 500 box
+bAutoSize = False
+# Update the existing .drawio files instead of overwriting them: the boxes moved or resized in draw.io
+# and the cells added by hand are kept, only the members which changed are touched
+bMerge = False
+# The output formats, among 'drawio', 'plantuml', 'mermaid' and 'json' (None = drawio only). Every format is
+# written from a single parse; the formats other than drawio are written from the parsed classes, as with bDirect
+formats = None
+# Only convert the classes of these namespaces and these classes (None = all),
+# the 'index' backend does not even open the other compound files
+namespaces = None
+class_names = None
+# Only keep the members of these access levels ('public', 'protected', 'private', 'package')
+# and of these kinds ('function', 'variable'), None = all
+access_levels = None
+member_kinds = None
+# Only keep the members whose name matches one of these shell-style patterns, e.g. ['Get*'],
+# and drop the ones matching the exclude patterns (None = no pattern)
+member_patterns = None
+exclude_patterns = None
+# Overlap the reads, the parsing and the writes in threads (implies bDirect), for slow or network file systems
+bPipelined = False
+# With bPipelined, the number of reading and of writing threads, and the most files waiting between two stages
+ioThreads = 4
+queueSize = 64
+# Print every extracted class and every written file
+bVerbose = False
+# Record the time, bytes and members of every file and stage: print a summary table,
+# and/or save the records as JSON or as a Chrome trace (chrome://tracing, ui.perfetto.dev)
+bMetrics = False
+metrics_json = None
+chrome_trace = None
+# Keep running and regenerate the diagrams of the .xml files which change, until Ctrl+C
+bWatch = False
+# With bWatch, the seconds between two scans of the xml folder, and the seconds it has to stay unchanged before a rebuild
+pollInterval = 0.1
+debounceSeconds = 0.25
 
-if __name__ == '__main__':
-    if bWithType:
-        xmlExtractorWithType.ExtractWitType()
+xml_folder = 'xmls'
+text_folder = 'texts'
+drawio_folder = 'drawio'
+
+def convert(xml_dir=xml_folder, text_dir=text_folder, drawio_dir=drawio_folder, *, bWithType=bWithType,
+            bStreaming=bStreaming, workers=numWorkers, bIncremental=bIncremental, bDirect=bDirect,
+            bWriteTexts=bWriteTexts, single_file=single_file, bPagePerNamespace=bPagePerNamespace,
+            bRelations=bRelations, backend=backend, cache_dir=cache_folder, cache_size_mb=cacheSizeMB,
+            bPretty=bPretty, bCompressed=bCompressed, bSharedStyles=bSharedStyles,
+            bAutoSize=bAutoSize, namespaces=namespaces, class_names=class_names, bPipelined=bPipelined,
+            io_threads=ioThreads, queue_size=queueSize, bVerbose=bVerbose, bMetrics=bMetrics,
+            metrics_json=metrics_json, chrome_trace=chrome_trace, bWatch=bWatch, poll_interval=pollInterval,
+            debounce=debounceSeconds, access_levels=access_levels, member_kinds=member_kinds,
+            member_patterns=member_patterns, exclude_patterns=exclude_patterns, bMerge=bMerge, formats=formats,
+            bSkipEmpty=bSkipEmpty, memory_limit_mb=memoryLimitMB):
+    """
+    Convert the Doxygen .xml files of xml_dir into .drawio class diagrams.
+
+    The converter modules are imported here, so importing this module does not
+    load them nor touch the file system. The options after the folders are keywords,
+    with the names of the dest of their command line flags, so main() passes vars(args).
+
+    Args:
+    - xml_dir (str): The folder of the Doxygen .xml files.
+    - text_dir (str): The folder of the intermediate .txt files.
+    - drawio_dir (str): The folder of the .drawio files.
+    - bWithType (bool): Show the return and variable types.
+    - bStreaming (bool): Parse the .xml files with iterparse.
+    - workers (int): The number of worker processes.
+    - bIncremental (bool): Only regenerate the files whose source changed.
+    - bDirect (bool): Create the diagrams straight from the extracted classes.
+    - bWriteTexts (bool): Also write the .txt files in direct mode.
+    - single_file (str): If set, write every class into this single .drawio file.
+    - bPagePerNamespace (bool): With single_file, use one page per namespace.
+    - bRelations (bool): With single_file, draw inheritance and association edges.
+    - backend (str): 'codeline' for the file compounds, 'memberdef' for the class compounds,
+      'index' for the class compounds listed in index.xml.
+    - cache_dir (str): If set, the folder of the parse cache.
+    - cache_size_mb (int): The size cap of the parse cache in megabytes.
+    - bPretty (bool): Indent the .drawio XML.
+    - bCompressed (bool): Store the .drawio pages deflated.
+    - bSharedStyles (bool): Leave out the style keys of the draw.io named styles.
+    - bAutoSize (bool): Fit each class box to its members.
+    - namespaces (list): Only convert the classes of these namespaces.
+    - class_names (list): Only convert these classes.
+    - bPipelined (bool): Like bDirect, with the reads, the parsing and the writes overlapped in threads.
+    - io_threads (int): With bPipelined, the number of reading and of writing threads.
+    - queue_size (int): With bPipelined, the most files waiting between two stages.
+    - bVerbose (bool): Print every extracted class and every written file.
+    - bMetrics (bool): Print the time, bytes and members of each stage and the slowest files.
+    - metrics_json (str): If set, save the metrics to this JSON file.
+    - chrome_trace (str): If set, save the metrics to this Chrome trace file.
+    - bWatch (bool): Keep the classes in memory and regenerate the diagrams of the .xml files
+      which change, until Ctrl+C.
+    - poll_interval (float): With bWatch, the seconds between two scans of the xml folder.
+    - debounce (float): With bWatch, the seconds the xml folder has to stay unchanged before a rebuild.
+    - access_levels (list): Only keep the members of these access levels.
+    - member_kinds (list): Only keep these kinds of members, 'function' and/or 'variable'.
+    - member_patterns (list): Only keep the members whose name matches one of these shell-style patterns.
+    - exclude_patterns (list): Drop the members whose name matches one of these shell-style patterns.
+    - bMerge (bool): Update the existing .drawio files, keeping the layout done in draw.io.
+    - formats (list): The output formats, 'drawio', 'plantuml', 'mermaid' and/or 'json', see sources/renderers.py.
+    - bSkipEmpty (bool): Skip the .xml files without members before parsing them, see sources/mappedInput.py.
+    - memory_limit_mb (int): With workers, the most megabytes of .xml files in the worker processes at once.
+    """
+    from sources import memberFilter
+    from sources import metrics
+    metrics.set_verbose(bVerbose)
+    metrics.enable(bool(bMetrics or metrics_json or chrome_trace))
+    # The filters are applied by the extractors while they parse, see memberFilter
+    member_filter = memberFilter.make_filter(access_levels, member_kinds, member_patterns, exclude_patterns,
+                                             namespaces, class_names)
+    memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+
+    if bWatch:
+        from sources import watcher
+        watcher.watch(xml_dir, drawio_dir, text_folder=text_dir if bWriteTexts else None, single_file=single_file,
+                      bIncremental=bIncremental, poll_interval=poll_interval, debounce=debounce,
+                      bWithType=bWithType, bStreaming=bStreaming, backend=backend,
+                      cache_folder=cache_dir, namespaces=namespaces, class_names=class_names,
+                      member_filter=member_filter, bPagePerNamespace=bPagePerNamespace, bRelations=bRelations,
+                      bPretty=bPretty, bCompressed=bCompressed, bSharedStyles=bSharedStyles, bAutoSize=bAutoSize,
+                      bMerge=bMerge, formats=formats, bSkipEmpty=bSkipEmpty)
+    elif single_file:
+        from sources import pipeline
+        pipeline.convert_xml_folder_to_single_file(xml_dir, single_file, bWithType=bWithType, bStreaming=bStreaming,
+                                                   workers=workers, bPagePerNamespace=bPagePerNamespace,
+                                                   bRelations=bRelations, backend=backend, cache_folder=cache_dir,
+                                                   bPretty=bPretty, bCompressed=bCompressed,
+                                                   bSharedStyles=bSharedStyles, bAutoSize=bAutoSize,
+                                                   namespaces=namespaces, class_names=class_names,
+                                                   member_filter=member_filter, bMerge=bMerge, formats=formats,
+                                                   bSkipEmpty=bSkipEmpty, memory_limit=memory_limit)
+    elif bDirect or bPipelined or (formats and list(formats) != ['drawio']):
+        from sources import pipeline
+        pipeline.convert_xml_folder(xml_dir, drawio_dir, bWithType=bWithType, bStreaming=bStreaming, workers=workers,
+                                    bIncremental=bIncremental, text_folder=text_dir if bWriteTexts else None,
+                                    backend=backend, cache_folder=cache_dir, bPretty=bPretty, bCompressed=bCompressed,
+                                    bSharedStyles=bSharedStyles, bAutoSize=bAutoSize, namespaces=namespaces,
+                                    class_names=class_names, bPipelined=bPipelined, io_threads=io_threads,
+                                    queue_size=queue_size, member_filter=member_filter, bMerge=bMerge,
+                                    formats=formats, bSkipEmpty=bSkipEmpty, memory_limit=memory_limit)
     else:
-        xmlExtractor.Extract()
-    txt2drawio.txtToDrawio()
-    pass
+        if bWithType:
+            from sources import xmlExtractorWithType
+            xmlExtractorWithType.ExtractWitType(bStreaming=bStreaming, workers=workers, bIncremental=bIncremental,
+                                                xml_folder=xml_dir, results_folder=text_dir, backend=backend,
+                                                cache_folder=cache_dir, namespaces=namespaces,
+                                                class_names=class_names, member_filter=member_filter,
+                                                bSkipEmpty=bSkipEmpty, memory_limit=memory_limit)
+        else:
+            from sources import xmlExtractor
+            xmlExtractor.Extract(bStreaming=bStreaming, workers=workers, bIncremental=bIncremental,
+                                 xml_folder=xml_dir, results_folder=text_dir, backend=backend,
+                                 cache_folder=cache_dir, namespaces=namespaces, class_names=class_names,
+                                 member_filter=member_filter, bSkipEmpty=bSkipEmpty, memory_limit=memory_limit)
+
+        from sources import txt2drawio
+        txt2drawio.txtToDrawio(workers=workers, bIncremental=bIncremental, folder_path=text_dir,
+                               output_folder=drawio_dir, bPretty=bPretty, bCompressed=bCompressed,
+                               bSharedStyles=bSharedStyles, bAutoSize=bAutoSize, bMerge=bMerge)
+
+    if cache_dir:
+        from sources import parseCache
+        parseCache.evict_cache(cache_dir, cache_size_mb * 1024 * 1024)
+
+    if bMetrics:
+        metrics.print_summary()
+    if metrics_json:
+        metrics.write_json(metrics_json)
+    if chrome_trace:
+        metrics.write_chrome_trace(chrome_trace)
+
+def parse_arguments(argv=None):
+    import argparse
+    from sources import languages
+    from sources import memberFilter
+
+    parser = argparse.ArgumentParser(description="Convert Doxygen .xml files into draw.io class diagrams.")
+    parser.add_argument('--xml-dir', default=xml_folder, help="folder of the Doxygen .xml files (default: %(default)s)")
+    parser.add_argument('--text-dir', default=text_folder, help="folder of the .txt files (default: %(default)s)")
+    parser.add_argument('--drawio-dir', default=drawio_folder, help="folder of the .drawio files (default: %(default)s)")
+    parser.add_argument('--no-type', dest='bWithType', action='store_false', default=bWithType,
+                        help="hide the return and variable types")
+    parser.add_argument('--backend', choices=['codeline', 'memberdef', 'index'], default=backend,
+                        help="'codeline' reads the file compounds (*cs.xml, *_8h.xml, *_8java.xml), "
+                             "'memberdef' reads the class compounds (class*.xml, struct*.xml, interface*.xml), "
+                             "'index' reads the class compounds listed in index.xml (default: %(default)s)")
+    parser.add_argument('--streaming', dest='bStreaming', action='store_true', default=bStreaming,
+                        help="parse the .xml files with iterparse to keep memory flat")
+    parser.add_argument('--skip-empty', dest='bSkipEmpty', action='store_true', default=bSkipEmpty,
+                        help="map the .xml files with mmap and skip the ones without members before parsing them, "
+                             "their classes get no box")
+    parser.add_argument('--workers', type=int, default=numWorkers,
+                        help="number of worker processes (default: %(default)s)")
+    parser.add_argument('--memory-limit', dest='memory_limit_mb', type=int, default=memoryLimitMB, metavar='MB',
+                        help="the most megabytes of .xml files handed to the workers at once, the classes are "
+                             "written as they come back; needs --workers above 1 (default: no limit)")
+    parser.add_argument('--incremental', dest='bIncremental', action='store_true', default=bIncremental,
+                        help="only regenerate the files whose source changed since the last run")
+    parser.add_argument('--direct', dest='bDirect', action='store_true', default=bDirect,
+                        help="create the diagrams without reading the .txt files back")
+    parser.add_argument('--no-texts', dest='bWriteTexts', action='store_false', default=bWriteTexts,
+                        help="do not write the .txt files in direct mode")
+    parser.add_argument('--single-file', default=single_file, metavar='PATH',
+                        help="write every class into this single .drawio file")
+    parser.add_argument('--page-per-namespace', dest='bPagePerNamespace', action='store_true',
+                        default=bPagePerNamespace, help="with --single-file, use one page per namespace")
+    parser.add_argument('--relations', dest='bRelations', action='store_true', default=bRelations,
+                        help="with --single-file, draw inheritance and association edges")
+    parser.add_argument('--cache-dir', default=cache_folder, metavar='DIR',
+                        help="keep the parse results in this folder and reuse them for unchanged .xml files")
+    parser.add_argument('--cache-size', dest='cache_size_mb', type=int, default=cacheSizeMB, metavar='MB',
+                        help="size cap of the parse cache in megabytes (default: %(default)s)")
+    parser.add_argument('--compact', dest='bPretty', action='store_false', default=bPretty,
+                        help="write the .drawio XML without indentation")
+    parser.add_argument('--compressed', dest='bCompressed', action='store_true', default=bCompressed,
+                        help="store the .drawio pages deflated and base64 encoded")
+    parser.add_argument('--shared-styles', dest='bSharedStyles', action='store_true', default=bSharedStyles,
+                        help="leave out the style keys the draw.io named styles already set")
+    parser.add_argument('--auto-size', dest='bAutoSize', action='store_true', default=bAutoSize,
+                        help="fit each class box to its members instead of the fixed 500 x 500 box")
+    parser.add_argument('--merge', dest='bMerge', action='store_true', default=bMerge,
+                        help="update the existing .drawio files instead of overwriting them, keeping the boxes "
+                             "moved or resized in draw.io and the cells added by hand")
+    parser.add_argument('--format', dest='formats', action='append', default=formats,
+                        choices=['drawio', 'plantuml', 'mermaid', 'json'],
+                        help="write this output format (repeatable, default: drawio), every format is written "
+                             "from a single parse; the formats other than drawio imply --direct")
+    parser.add_argument('--namespace', dest='namespaces', action='append', default=namespaces, metavar='NAME',
+                        help="only convert the classes of this namespace (repeatable), with --backend index the "
+                             "other compound files are not even opened")
+    parser.add_argument('--class', dest='class_names', action='append', default=class_names, metavar='NAME',
+                        help="only convert this class, e.g. Player or Game::Player (repeatable)")
+    parser.add_argument('--pipelined', dest='bPipelined', action='store_true', default=bPipelined,
+                        help="like --direct, with the reads, the parsing and the writes overlapped in threads")
+    parser.add_argument('--io-threads', dest='io_threads', type=int, default=ioThreads,
+                        help="with --pipelined, number of reading and of writing threads (default: %(default)s)")
+    parser.add_argument('--queue-size', dest='queue_size', type=int, default=queueSize,
+                        help="with --pipelined, most files waiting between two stages (default: %(default)s)")
+    parser.add_argument('--verbose', dest='bVerbose', action='store_true', default=bVerbose,
+                        help="print every extracted class and every written file")
+    parser.add_argument('--metrics', dest='bMetrics', action='store_true', default=bMetrics,
+                        help="print the time, bytes and members of each stage and the slowest files")
+    parser.add_argument('--metrics-json', default=metrics_json, metavar='PATH',
+                        help="save the time, bytes and members of every file and stage as JSON")
+    parser.add_argument('--chrome-trace', default=chrome_trace, metavar='PATH',
+                        help="save the time of every file and stage as a Chrome trace (chrome://tracing)")
+    parser.add_argument('--watch', dest='bWatch', action='store_true', default=bWatch,
+                        help="keep running and regenerate the diagrams of the .xml files which change, until Ctrl+C")
+    parser.add_argument('--poll-interval', dest='poll_interval', type=float, default=pollInterval, metavar='SECONDS',
+                        help="with --watch, seconds between two scans of the xml folder (default: %(default)s)")
+    parser.add_argument('--debounce', dest='debounce', type=float, default=debounceSeconds,
+                        metavar='SECONDS', help="with --watch, seconds the xml folder has to stay unchanged "
+                                                "before a rebuild (default: %(default)s)")
+    parser.add_argument('--access', dest='access_levels', action='append', default=access_levels,
+                        choices=list(languages.ACCESS_SPECIFIERS),
+                        help="only keep the members of this access level (repeatable)")
+    parser.add_argument('--kind', dest='member_kinds', action='append', default=member_kinds,
+                        choices=memberFilter.MEMBER_KINDS, help="only keep the members of this kind (repeatable)")
+    parser.add_argument('--member', dest='member_patterns', action='append', default=member_patterns,
+                        metavar='PATTERN', help="only keep the members whose name matches this pattern, "
+                                                "e.g. 'Get*' (repeatable)")
+    parser.add_argument('--exclude-member', dest='exclude_patterns', action='append', default=exclude_patterns,
+                        metavar='PATTERN', help="drop the members whose name matches this pattern (repeatable)")
+    args = parser.parse_args(argv)
+    # The limit is only checked by the worker pool, see parallel.iter_files
+    if args.memory_limit_mb is not None:
+        if args.workers <= 1:
+            parser.error("--memory-limit needs --workers above 1, a single process already reads one file at a time")
+        if args.bPipelined or args.bWatch:
+            parser.error("--memory-limit does not apply to --pipelined (see --queue-size) nor to --watch")
+        if args.memory_limit_mb <= 0:
+            parser.error("--memory-limit must be a positive number of megabytes")
+    return args
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    # Every dest is the name of a parameter of convert
+    convert(**vars(args))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Compact model of the members of a class.
+
+The extractors used to store each member as its formatted line, e.g.
+"+ Foo(int x) : void", which was sorted as a string and parsed back out of the
+.txt files. A Member keeps the fields instead: it has no __dict__ and three
+slots, the access, the signature and the type. The signature and the type are
+interned, so every "Update()" or "int" of a project is stored once, and
+sorting, filtering and rendering read the fields directly. str(member) gives
+the same line as before.
+
+The name and the arguments are read back from the signature: keeping them as
+two more strings took more memory than the lines on a small project.
+benchmarks/bench_model.py measures the memory and the sort time.
+"""
+import sys
+
+# Order of the access specifiers in a class box, the unknown ones come last
+ACCESS_ORDER = {'+': 1, '#': 2, '-': 3}
+# The same order with the other access specifiers of a Member, so it alone orders them
+ACCESS_RANK = {'+': 1, '#': 2, '': 3, '-': 4, '~': 5}
+
+# Separates the signature and the type in a member line
+TYPE_SEPARATOR = ' : '
+
+# The only member name with a parenthesis, the C++ function call operator
+CALL_OPERATOR = 'operator()'
+
+class Member:
+    """
+    One member function or variable.
+
+    Args:
+    - access (str): '+', '#', '-' or '~', '' if unknown.
+    - name (str): The member name.
+    - arguments (str): The parameter list with its parentheses, e.g. "(int x)", '' for variables.
+    - type_name (str): The return or variable type, None when the types are not shown.
+    """
+    __slots__ = ('access', 'signature', 'type_name')
+
+    def __init__(self, access, name, arguments='', type_name=None):
+        self.access = access
+        # The name followed by the arguments, e.g. "Foo(int x)"
+        self.signature = sys.intern(name + arguments)
+        self.type_name = sys.intern(type_name) if type_name is not None else None
+
+    @property
+    def name(self):
+        return self.signature[:self.arguments_start()]
+
+    @property
+    def arguments(self):
+        return self.signature[self.arguments_start():]
+
+    def arguments_start(self):
+        start = self.signature.find('(', len(CALL_OPERATOR) if self.signature.startswith(CALL_OPERATOR) else 0)
+        return start if start >= 0 else len(self.signature)
+
+    def sort_key(self):
+        # By access and then in the order of the formatted line
+        return ACCESS_RANK.get(self.access, 6), self.signature, self.type_name or ''
+
+    def __str__(self):
+        if not self.access:
+            # Only the lines of a hand edited .txt file have no access specifier
+            return self.signature if self.type_name is None else f"{self.signature} : {self.type_name}"
+        if self.type_name is None:
+            return f"{self.access} {self.signature}"
+        return f"{self.access} {self.signature} : {self.type_name}"
+
+    def __repr__(self):
+        return f"Member({self.access!r}, {self.name!r}, {self.arguments!r}, {self.type_name!r})"
+
+    def __reduce__(self):
+        # Through __init__, so the strings of the members read from the parse cache are interned too
+        return Member, (self.access, self.signature, '', self.type_name)
+
+    def __eq__(self, other):
+        if not isinstance(other, Member):
+            return NotImplemented
+        return (self.access, self.signature, self.type_name) == (other.access, other.signature, other.type_name)
+
+    def __hash__(self):
+        return hash((self.access, self.signature, self.type_name))
+
+def sort_members(members):
+    return sorted(members, key=Member.sort_key)
+
+def parse_member(line, bWithType=True):
+    """
+    Read a member back from its formatted line, e.g. "+ Foo(int x) : void".
+    str() of the result is the line again.
+
+    Args:
+    - line (str): The member line of a .txt file.
+    - bWithType (bool): The line ends with " : type".
+    """
+    if line[1:2] == ' ':
+        access, line = line[0], line[2:]
+    else:
+        access = ''
+
+    type_name = None
+    if bWithType:
+        signature, separator, type_name = line.rpartition(TYPE_SEPARATOR)
+        if separator:
+            line = signature
+        else:
+            type_name = None
+
+    name, parenthesis, parameters = line.partition('(')
+    return Member(access, name, parenthesis + parameters, type_name)
@@ -0,0 +1,82 @@
+"""
+Enumerate the compounds of a Doxygen XML output from its index.xml.
+
+Doxygen lists every compound it wrote in index.xml with its kind, its
+qualified name and its refid, which is also the name of its .xml file.
+Reading the index finds the class compounds without guessing from the file
+names, and a subset of the classes (some namespaces or class names) can be
+converted without opening the other compound files at all.
+"""
+import os
+import xml.etree.ElementTree as ET
+
+INDEX_FILE_NAME = 'index.xml'
+
+# Kinds of the compounds drawn as class boxes
+CLASS_KINDS = ('class', 'struct', 'interface')
+
+def read_index(xml_folder, kinds=CLASS_KINDS):
+    """
+    Read the index.xml of a Doxygen XML folder.
+
+    The index is read with iterparse and each <compound> is freed once read,
+    so the member lists of a large project are never all in memory.
+
+    Args:
+    - xml_folder (str): The folder of the Doxygen .xml files.
+    - kinds (tuple): The compound kinds to return.
+
+    Returns:
+    - list: (name, kind, file name) of each compound, in index order,
+      or None if the index can not be read.
+    """
+    index_path = os.path.join(xml_folder, INDEX_FILE_NAME)
+    compounds = []
+    doxygenindex = None
+    try:
+        for event, elem in ET.iterparse(index_path, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "doxygenindex":
+                    doxygenindex = elem
+                continue
+
+            if elem.tag == "compound":
+                kind = elem.get("kind")
+                if kind in kinds:
+                    name = elem.findtext("name", "").strip()
+                    compounds.append((name, kind, elem.get("refid") + '.xml'))
+                elem.clear()
+                if doxygenindex is not None:
+                    doxygenindex.remove(elem)
+    except (OSError, ET.ParseError) as e:
+        print(f"Error reading {index_path}: {e}")
+        return None
+
+    return compounds
+
+def is_in_namespaces(name, namespaces):
+    """
+    Return True if the qualified name is in one of the namespaces or their nested namespaces.
+    """
+    return any(name.startswith(namespace + '::') for namespace in namespaces)
+
+def is_selected(name, namespaces=None, class_names=None):
+    """
+    Return True if a compound is in the subset, which is every compound when
+    neither namespaces nor class_names is set. A class name matches either the
+    qualified name ('Game::Player') or the name alone ('Player').
+    """
+    if not namespaces and not class_names:
+        return True
+    if namespaces and is_in_namespaces(name, namespaces):
+        return True
+    return bool(class_names) and (name in class_names or name.rsplit('::', 1)[-1] in class_names)
+
+def list_index_files(xml_folder, namespaces=None, class_names=None):
+    """
+    Return the sorted file names of the class compounds of the subset, see is_selected.
+    """
+    compounds = read_index(xml_folder)
+    if compounds is None:
+        return []
+    return sorted({file_name for name, _, file_name in compounds if is_selected(name, namespaces, class_names)})
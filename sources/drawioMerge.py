@@ -0,0 +1,816 @@
+"""
+Merge regenerated classes into an existing .drawio file instead of overwriting it.
+
+The generated diagrams are often arranged by hand in draw.io: boxes are moved
+and resized, notes and arrows are added. In merge mode the existing file is
+read, and only the cells of the members which were added, changed or removed
+are touched. Every other cell keeps its attributes and its geometry, the cells
+the user added are left alone, and a diagram without changes is not written.
+
+The cells are matched by their stable ids, see txt2drawio.stable_cell_ids,
+which derive from the class name and the member signature. The cells of a
+file written before merge mode have positional ids: their boxes are matched by
+the class name and their members by the signature read back from the cell
+value, and they keep their ids.
+
+The file is patched rather than written again: the cells are read with expat
+along with their byte offsets, and only the attributes which changed and the
+cells added or removed are spliced in. The rest of the file, its indentation
+and its attribute order included, stays byte for byte the same, so the cost of
+a merge beyond reading the file grows with the changes. A compressed page
+which changed is deflated again as a whole.
+
+Each generated box keeps the hash of its members and of its edges in its
+sourceHash attribute, see txt2drawio.source_hash. When the file holds the boxes
+of the same classes, the hashes are found with a plain search of the bytes and
+only the boxes whose hash changed are parsed, so a diagram without changes is
+not parsed at all. Otherwise, e.g. when a class was added or removed, an edge
+changed or the page is compressed, the whole file is read.
+"""
+import binascii
+import bisect
+import re
+import zlib
+from xml.parsers import expat
+
+from sources import classModel
+from sources import drawioWriter
+from sources import layout
+from sources import metrics
+from sources import txt2drawio
+
+# The space between the existing boxes and the boxes of the new classes
+NEW_BOX_GAP = 40
+
+# The stable ids, and the positional ids of the files written before merge mode with the ids of the
+# rows added to their boxes since, e.g. '12' and '12-3fa4c1d2e5b6'
+GENERATED_ID_PATTERN = re.compile(r'cls-|\d+(?:-|$)')
+
+# The attribute holding the value of a cell, draw.io moves it to 'label' when a cell has properties
+VALUE_ATTRIBUTES = {'mxCell': 'value', 'UserObject': 'label', 'object': 'label'}
+
+SOURCE_HASH_PATTERN = re.compile(rb'sourceHash="([^"]*)"')
+START_TAG_PATTERN = re.compile(rb'<[^\s/>]+(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|\'[^\']*\'))*\s*/?>')
+ATTRIBUTE_PATTERN = re.compile(rb'\s+([^\s=/>]+)\s*=\s*("[^"]*"|\'[^\']*\')')
+WHITESPACE = b" \t\r\n"
+
+# The cells of one box are parsed from the bytes of the file, chunk by chunk, after this start tag
+CELLS_START = b"<root>"
+CELLS_CHUNK = 1 << 16
+
+def is_generated_id(cell_id):
+    """
+    Return True for the ids of the generated cells: the stable ids and the positional ids
+    of the files written before merge mode. draw.io gives the cells added by hand random ids.
+    """
+    return GENERATED_ID_PATTERN.match(cell_id) is not None
+
+def edge_kind(style):
+    return 'inheritance' if 'endArrow=block' in style else 'association'
+
+def apply_patches(data, patches, start=0, end=None):
+    """
+    Return data[start:end] with the (start, end, order, replacement) patches applied.
+    """
+    parts = []
+    position = start
+    for patch_start, patch_end, _, replacement in sorted(patches):
+        if patch_start < position:
+            # Inside a range already replaced, e.g. a cell which was removed
+            continue
+        parts.append(data[position:patch_start])
+        parts.append(replacement)
+        position = patch_end
+    parts.append(data[position:end])
+    return b"".join(parts)
+
+class XmlText:
+    """
+    The bytes of an XML document and the patches to apply to them, see apply_patches.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.patches = []
+
+    def replace(self, start, end, text):
+        if isinstance(text, str):
+            text = text.encode('utf-8')
+        self.patches.append((start, end, len(self.patches), text))
+
+    def insert(self, position, text):
+        self.replace(position, position, text)
+
+    def apply(self):
+        return apply_patches(self.data, self.patches)
+
+    def start_tag_end(self, start):
+        return START_TAG_PATTERN.match(self.data, start).end()
+
+    def element_end(self, start, end_index):
+        """
+        Return the offset after an element. end_index is the CurrentByteIndex of expat at its end:
+        the offset of its end tag, or the offset after it if the element is empty.
+        """
+        tag_end = self.start_tag_end(start)
+        if self.data[tag_end - 2:tag_end] == b"/>":
+            return tag_end
+        return self.data.index(b">", end_index) + 1
+
+    def whitespace_start(self, position):
+        while position and self.data[position - 1] in WHITESPACE:
+            position -= 1
+        return position
+
+    def indent_before(self, position):
+        return self.data[self.whitespace_start(position):position].decode('ascii')
+
+    def set_attribute(self, tag_start, name, value):
+        """
+        Set an attribute in the start tag at tag_start, the other attributes are left as they are.
+        """
+        tag_end = self.start_tag_end(tag_start)
+        quoted = '"' + drawioWriter.escape_attribute(value) + '"'
+        key = name.encode('ascii')
+        for match in ATTRIBUTE_PATTERN.finditer(self.data, tag_start, tag_end):
+            if match.group(1) == key:
+                self.replace(match.start(2), match.end(2), quoted)
+                return
+        position = self.whitespace_start(tag_end - (2 if self.data[tag_end - 2:tag_end] == b"/>" else 1))
+        self.insert(position, f" {name}={quoted}")
+
+    def take(self, start, end):
+        """
+        Return the bytes from start to end with their patches applied, and remove them.
+        """
+        inside = []
+        outside = []
+        for patch in self.patches:
+            bEmpty = patch[0] == patch[1]
+            if start <= patch[0] and patch[1] <= end and not (bEmpty and patch[0] in (start, end)):
+                inside.append(patch)
+            else:
+                outside.append(patch)
+        self.patches = outside
+        self.replace(start, end, b"")
+        return apply_patches(self.data, inside, start, end)
+
+class Cell:
+    """
+    A child of <root>: an <mxCell>, or the <UserObject> or <object> draw.io wraps it in when it has
+    properties, with the attributes of its <mxCell> and <mxGeometry> and its offsets in the page.
+    The new cells have no offsets.
+    """
+    __slots__ = ('page', 'tag', 'id', 'attributes', 'cell', 'geometry', 'start', 'end_index', 'geometry_start')
+
+    def __init__(self, page, tag, attributes, start=None, geometry=None):
+        self.page = page
+        self.tag = tag
+        self.id = attributes.get('id')
+        self.attributes = attributes
+        self.cell = attributes if tag == 'mxCell' else None
+        self.geometry = geometry
+        self.start = start
+        self.end_index = None
+        self.geometry_start = None
+
+    @property
+    def value(self):
+        return self.attributes.get(VALUE_ATTRIBUTES.get(self.tag, 'value'))
+
+    @property
+    def style(self):
+        return self.cell.get('style', '')
+
+    def end(self):
+        return self.page.text.element_end(self.start, self.end_index)
+
+class EndOfCells(Exception):
+    """
+    Stops read_cells after the cells of one box.
+    """
+
+def read_cells(text, page=None, start=None):
+    """
+    Read the cells of the <root> elements of text with their offsets.
+
+    If page is None each <diagram> holding its <mxGraphModel> gets a Page, else all the cells go to page.
+    If start is the offset of a cell, only this cell and its children are read: draw.io writes the
+    children of a cell right after it, so they end at the first cell with another parent.
+
+    Returns:
+    - list: (attributes, start, end_index, page) of each <diagram>, page is None if it is compressed.
+    """
+    diagrams = []
+    stack = []
+    state = {'page': page, 'cell': None, 'depth': 0}
+    parent_ids = set()
+    parser = expat.ParserCreate()
+    # expat counts the offsets from the start of what it is given
+    shift = 0 if start is None else start - len(CELLS_START)
+
+    def start_element(tag, attributes):
+        cell = state['cell']
+        depth = len(stack)
+        if cell is not None:
+            if tag == 'mxCell' and depth == state['depth'] + 1:
+                cell.cell = attributes
+            elif tag == 'mxGeometry' and cell.geometry is None and stack[-1] == 'mxCell':
+                cell.geometry = attributes
+                cell.geometry_start = parser.CurrentByteIndex + shift
+        elif stack and stack[-1] == 'root':
+            cell = Cell(state['page'], tag, attributes, parser.CurrentByteIndex + shift)
+            state['page'].cells.append(cell)
+            state['cell'] = cell
+            state['depth'] = depth
+        elif tag == 'diagram':
+            diagrams.append([attributes, parser.CurrentByteIndex, None, None])
+        elif tag == 'mxGraphModel' and page is None and diagrams:
+            diagrams[-1][3] = state['page'] = Page(text, diagrams[-1][0])
+        elif tag == 'root' and start is None:
+            state['page'].root_start = parser.CurrentByteIndex
+        stack.append(tag)
+
+    def end_element(tag):
+        stack.pop()
+        cell = state['cell']
+        if cell is not None and len(stack) == state['depth']:
+            cell.end_index = parser.CurrentByteIndex + shift
+            state['cell'] = None
+            if start is not None:
+                if parent_ids and (cell.cell is None or cell.cell.get('parent') not in parent_ids):
+                    state['page'].cells.pop()
+                    raise EndOfCells()
+                parent_ids.add(cell.id)
+        elif tag == 'root':
+            if start is not None:
+                raise EndOfCells()
+            state['page'].root_end_index = parser.CurrentByteIndex
+        elif tag == 'diagram':
+            diagrams[-1][2] = parser.CurrentByteIndex
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    if start is None:
+        parser.Parse(text.data, True)
+        return diagrams
+    parser.Parse(CELLS_START, False)
+    try:
+        for position in range(start, len(text.data), CELLS_CHUNK):
+            parser.Parse(text.data[position:position + CELLS_CHUNK], False)
+    except EndOfCells:
+        pass
+    return diagrams
+
+def cell_xml(attributes, geometry, indent, bSharedStyles=False):
+    """
+    Return the XML of a new cell the way drawioWriter writes it, each line starting with indent.
+    """
+    if bSharedStyles and 'style' in attributes:
+        attributes = dict(attributes, style=drawioWriter.shared_style(attributes['style']))
+    if geometry is None:
+        return indent + drawioWriter.start_tag('mxCell', attributes) + " />"
+    return (indent + drawioWriter.start_tag('mxCell', attributes) + ">"
+            + indent + (drawioWriter.INDENT if indent else "") + drawioWriter.start_tag('mxGeometry', geometry) + " />"
+            + indent + "</mxCell>")
+
+class Page:
+    """
+    One <diagram> of a .drawio file and its cells. The text of a compressed page is its own XmlText.
+    """
+
+    def __init__(self, text, attributes, bCompressed=False):
+        self.text = text
+        self.name = attributes.get('name')
+        self.attributes = attributes
+        self.bCompressed = bCompressed
+        self.bNew = False
+        # The indentation of the <diagram> of a new page
+        self.indent = ""
+        self.cells = []
+        self.root_start = None
+        self.root_end_index = None
+        self.layer_id = None
+        # The offsets of the deflated text of a compressed page in the file
+        self.diagram_text = None
+        self.bRemoved = False
+
+    def append(self, attributes, geometry=None, bSharedStyles=False):
+        """
+        Add a cell at the end of the page and return it.
+        """
+        if self.cells:
+            position = self.cells[-1].end()
+            indent = self.text.indent_before(self.cells[-1].start)
+        else:
+            position = self.text.whitespace_start(self.root_end_index)
+            indent = self.text.indent_before(self.root_start)
+            indent += drawioWriter.INDENT if indent else ""
+        self.text.insert(position, cell_xml(attributes, geometry, indent, bSharedStyles))
+        return Cell(self, 'mxCell', attributes, geometry=geometry)
+
+    def diagram_xml(self):
+        """
+        Return the XML of a new page.
+        """
+        content = self.text.apply().decode('utf-8')
+        if not self.bCompressed:
+            return content
+        return (self.indent + drawioWriter.start_tag('diagram', self.attributes) + ">"
+                + drawioWriter.encode_page(content) + "</diagram>")
+
+class DrawioDocument:
+    """
+    A .drawio file with its cells indexed by id and by parent.
+
+    If box_starts is given, only the cells of the boxes at these offsets are read, in one page
+    which stands for the whole file (see changed_boxes): bPartial is True.
+    """
+
+    def __init__(self, file_path, data, box_starts=None):
+        self.file_path = file_path
+        self.text = XmlText(data)
+        self.pages = []
+        # Where the new pages go, after the last one
+        self.pages_end = None
+        self.page_indent = ""
+        self.bPartial = box_starts is not None
+        if self.bPartial:
+            page = Page(self.text, {})
+            for start in box_starts:
+                read_cells(self.text, page, start)
+            self.pages.append(page)
+        else:
+            for attributes, start, end_index, page in read_cells(self.text):
+                if page is None:
+                    tag_end = self.text.start_tag_end(start)
+                    graph_model = drawioWriter.decode_page(self.text.data[tag_end:end_index].decode('ascii'))
+                    page = Page(XmlText(graph_model.encode('utf-8')), attributes, bCompressed=True)
+                    page.diagram_text = (tag_end, end_index)
+                    read_cells(page.text, page)
+                self.pages.append(page)
+                self.pages_end = self.text.element_end(start, end_index)
+                self.page_indent = self.text.indent_before(start)
+        # id -> Cell, parent id -> [Cell] in document order
+        self.cells = {}
+        self.children = {}
+        # The generated class boxes, and their ids by class name for the positional ids
+        self.boxes = []
+        self.legacy_boxes = {}
+        self.removed_ids = []
+        self.counts = {'added': 0, 'updated': 0, 'removed': 0, 'classes_added': 0, 'classes_removed': 0}
+        for page in self.pages:
+            self.index_page(page)
+
+    def index_page(self, page):
+        root_id = None
+        for cell in page.cells:
+            if cell.cell is None or cell.id is None:
+                continue
+            self.cells[cell.id] = cell
+            parent_id = cell.cell.get('parent')
+            if parent_id is None:
+                root_id = cell.id
+                continue
+            self.children.setdefault(parent_id, []).append(cell)
+            if page.layer_id is None and parent_id == root_id:
+                page.layer_id = cell.id
+            if cell.style.startswith('swimlane') and is_generated_id(cell.id):
+                self.boxes.append(cell)
+                if cell.id.isdigit():
+                    self.legacy_boxes.setdefault(cell.value, cell.id)
+
+    @property
+    def bChanged(self):
+        return any(page.text.patches for page in self.pages)
+
+    def page_named(self, name, bCompressed=False):
+        """
+        Return the page of this name, added at the end if there is none.
+        """
+        for page in self.pages:
+            if page.name == name:
+                return page
+        attributes = {'id': 'page-' + txt2drawio.short_digest(name), 'name': name}
+        root_id, layer_id = txt2drawio.page_cell_ids(name)
+        # The same layout as drawioWriter, the content of a compressed page is never indented
+        indent = "" if bCompressed else self.page_indent
+        step = drawioWriter.INDENT if indent else ""
+        graph_model = (indent + step + drawioWriter.start_tag('mxGraphModel', drawioWriter.GRAPH_MODEL_ATTRIBUTES) + ">"
+                       + indent + step * 2 + "<root>"
+                       + cell_xml({'id': root_id}, None, indent + step * 3)
+                       + cell_xml({'id': layer_id, 'parent': root_id}, None, indent + step * 3)
+                       + indent + step * 2 + "</root>"
+                       + indent + step + "</mxGraphModel>")
+        if not bCompressed:
+            graph_model = (indent + drawioWriter.start_tag('diagram', attributes) + ">" + graph_model
+                           + indent + "</diagram>")
+        page = Page(XmlText(graph_model.encode('utf-8')), attributes, bCompressed)
+        page.bNew = True
+        page.indent = self.page_indent
+        read_cells(page.text, page)
+        self.pages.append(page)
+        self.index_page(page)
+        return page
+
+    def remove_cell(self, cell):
+        """
+        Remove a cell and its children, remove_dangling_edges removes the edges attached to them.
+        """
+        if self.cells.pop(cell.id, None) is None:
+            return
+        page = cell.page
+        page.text.replace(page.text.whitespace_start(cell.start), cell.end(), b"")
+        page.bRemoved = True
+        self.removed_ids.append(cell.id)
+        for child in self.children.pop(cell.id, ()):
+            self.remove_cell(child)
+
+    def add_cell(self, cell):
+        self.cells[cell.id] = cell
+        parent_id = cell.attributes.get('parent')
+        if parent_id is not None:
+            self.children.setdefault(parent_id, []).append(cell)
+
+    def write(self):
+        """
+        Write the file with the changes of its pages.
+        """
+        new_pages = []
+        for page in self.pages:
+            if page.bNew:
+                new_pages.append(page.diagram_xml())
+            elif page.bCompressed and page.text.patches:
+                self.text.replace(*page.diagram_text, drawioWriter.encode_page(page.text.apply().decode('utf-8')))
+        if new_pages:
+            self.text.insert(self.pages_end, "".join(new_pages))
+        with open(self.file_path, 'wb') as file:
+            file.write(self.text.apply())
+
+def merge_diagram(file_path, classes, edges=None, bPagePerNamespace=False, bCompressed=False, bSharedStyles=False,
+                  bAutoSize=False):
+    """
+    Merge classes into the existing .drawio file at file_path.
+
+    Args:
+    - file_path (str): The existing .drawio file.
+    - classes (list): (class_name, member_funcs, member_vars) tuples, the whole content of the diagram.
+      The generated boxes of the other classes are removed.
+    - edges (list): (source, target, kind) tuples, see txt2drawio.create_multi_class_diagram.
+      If None the existing edges are kept.
+    - bPagePerNamespace (bool): New classes go to the page of their namespace instead of the first page.
+    - bCompressed (bool): Store the new pages deflated, the existing pages keep their format.
+    - bSharedStyles (bool): Leave out the style keys of the draw.io named styles in the new cells.
+    - bAutoSize (bool): Grow or shrink the class boxes by the rows added or removed.
+
+    Returns:
+    - dict: The numbers of members added, updated and removed and of classes added and removed,
+      or None if the file can not be read, then the caller writes it again.
+    """
+    with metrics.span('merge', file_path) as counts:
+        source_hashes = class_source_hashes(classes, edges)
+        document = read_document(file_path, {txt2drawio.class_box_id(class_name): source_hash
+                                             for (class_name, _, _), source_hash in zip(classes, source_hashes)})
+        if document is not None and document.bPartial:
+            for (class_name, member_funcs, member_vars), source_hash in zip(classes, source_hashes):
+                box = document.cells.get(txt2drawio.class_box_id(class_name))
+                if box is not None:
+                    merge_members(document, box, member_funcs, member_vars, bSharedStyles, bAutoSize)
+                    set_source_hash(box, source_hash)
+            # An edge drawn by hand to a row which was removed is only found in the whole file
+            if any(f'{end}="{cell_id}"'.encode('utf-8') in document.text.data
+                   for cell_id in document.removed_ids for end in ('source', 'target')):
+                document = read_document(file_path)
+        if document is None or not document.pages:
+            return None
+
+        if not document.bPartial:
+            merge_document(document, classes, source_hashes, edges, bPagePerNamespace, bCompressed, bSharedStyles,
+                           bAutoSize)
+
+        counts.update(document.counts)
+        if not document.bChanged:
+            metrics.verbose_print(f"File '{file_path}' is up to date.")
+            return document.counts
+
+        document.write()
+        metrics.verbose_print(f"File '{file_path}' merged: members {document.counts['added']} added, "
+                              f"{document.counts['updated']} updated, {document.counts['removed']} removed, "
+                              f"classes {document.counts['classes_added']} added, "
+                              f"{document.counts['classes_removed']} removed.")
+    return document.counts
+
+def class_source_hashes(classes, edges):
+    """
+    Return the txt2drawio.source_hash of each class box, edges are the ones of merge_diagram.
+    """
+    targets = [[] for _ in classes]
+    for source, target, kind in edges or ():
+        targets[source].append((classes[target][0], kind))
+    return [txt2drawio.source_hash(member_funcs, member_vars, class_edges)
+            for (_, member_funcs, member_vars), class_edges in zip(classes, targets)]
+
+def changed_boxes(data, source_hashes):
+    """
+    Return the offsets of the boxes whose sourceHash attribute differs from source_hashes, box id -> hash,
+    found without parsing the file.
+
+    Returns None if the whole file must be read: it does not hold the boxes of exactly these classes
+    with their hashes, or the edges leaving a box changed.
+    """
+    stored = {}
+    for match in SOURCE_HASH_PATTERN.finditer(data):
+        # A quote or a bracket in an attribute value is escaped, the tag starts at the last '<'
+        tag_start = data.rindex(b"<", 0, match.start())
+        tag_end = START_TAG_PATTERN.match(data, tag_start).end()
+        box_id = None
+        for attribute in ATTRIBUTE_PATTERN.finditer(data, tag_start, tag_end):
+            if attribute.group(1) == b'id':
+                box_id = attribute.group(2)[1:-1].decode('utf-8')
+        if box_id is None or box_id in stored:
+            return None
+        stored[box_id] = (tag_start, match.group(1).decode('utf-8'))
+    if stored.keys() != source_hashes.keys():
+        return None
+
+    starts = []
+    for box_id, source_hash in source_hashes.items():
+        start, stored_hash = stored[box_id]
+        if stored_hash == source_hash:
+            continue
+        if stored_hash.partition('.')[2] != source_hash.partition('.')[2]:
+            return None
+        starts.append(start)
+    return starts
+
+def read_document(file_path, source_hashes=None):
+    """
+    Read a .drawio file, only the boxes which changed if source_hashes is given, see changed_boxes.
+
+    Returns:
+    - DrawioDocument: The document, or None if the file can not be read.
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        box_starts = changed_boxes(data, source_hashes) if source_hashes is not None else None
+        return DrawioDocument(file_path, data, box_starts)
+    except (OSError, expat.ExpatError, AttributeError, UnicodeError, zlib.error, binascii.Error) as e:
+        print(f"Error reading {file_path}, it is written again: {e}")
+        return None
+
+def merge_document(document, classes, source_hashes, edges=None, bPagePerNamespace=False, bCompressed=False,
+                   bSharedStyles=False, bAutoSize=False):
+    """
+    Merge classes into a whole document, the arguments are the ones of merge_diagram.
+    """
+    new_boxes = {}
+    box_ids = []
+    for (class_name, member_funcs, member_vars), source_hash in zip(classes, source_hashes):
+        box_id = document.legacy_boxes.get(class_name, txt2drawio.class_box_id(class_name))
+        box = document.cells.get(box_id)
+        if box is not None:
+            merge_members(document, box, member_funcs, member_vars, bSharedStyles, bAutoSize)
+            set_source_hash(box, source_hash)
+        else:
+            page = (document.page_named(txt2drawio.get_namespace(class_name), bCompressed)
+                    if bPagePerNamespace else document.pages[0])
+            new_boxes.setdefault(id(page), (page, []))[1].append((class_name, member_funcs, member_vars,
+                                                                  source_hash))
+        box_ids.append(box_id)
+
+    kept_box_ids = set(box_ids)
+    for box in document.boxes:
+        if box.id not in kept_box_ids:
+            document.remove_cell(box)
+            document.counts['classes_removed'] += 1
+
+    for page, page_classes in new_boxes.values():
+        add_class_boxes(document, page, page_classes, bSharedStyles, bAutoSize)
+
+    remove_dangling_edges(document)
+    if edges is not None:
+        merge_edges(document, [(box_ids[source], box_ids[target], kind) for source, target, kind in edges],
+                    bSharedStyles)
+
+def set_source_hash(box, source_hash):
+    if box.attributes.get('sourceHash') != source_hash:
+        box.page.text.set_attribute(box.start, 'sourceHash', source_hash)
+
+def merge_members(document, box, member_funcs, member_vars, bSharedStyles=False, bAutoSize=False):
+    """
+    Update the rows of an existing class box: the values of the members which changed are set,
+    the new members are added and the rows of the members which are gone are removed.
+    """
+    page = box.page
+    rows = document.children.get(box.id, [])
+
+    separator = None
+    by_id = {}
+    for row in rows:
+        if row.cell is None:
+            continue
+        if separator is None and row.style.startswith('line'):
+            separator = row
+        else:
+            by_id[row.id] = row
+    by_signature = None
+
+    width = box.geometry.get('width') if box.geometry is not None else txt2drawio.sub_width
+    cell_ids = txt2drawio.stable_cell_ids(None, member_funcs, member_vars, box.id)
+    members = list(member_vars) + [None] + list(member_funcs)
+
+    new_rows = []
+    y_position = txt2drawio.HEADER_HEIGHT
+    for cell_id, member in zip(cell_ids[1:], members):
+        if member is None:
+            row = separator
+            if row is None:
+                row = Cell(page, 'mxCell',
+                           {'id': cell_id, 'style': txt2drawio.SEPARATOR_STYLE, 'vertex': '1', 'parent': box.id},
+                           geometry={'y': '0', 'width': width, 'height': str(txt2drawio.SEPARATOR_HEIGHT),
+                                     'as': 'geometry'})
+            new_rows.append(row)
+            set_row_y(row, y_position)
+            y_position += txt2drawio.SEPARATOR_HEIGHT
+            continue
+
+        value = str(member)
+        row = by_id.pop(cell_id, None)
+        if row is None:
+            # The rows of a file written before merge mode are matched by their signature
+            if by_signature is None:
+                by_signature = signature_index(by_id)
+            row = by_signature.pop(member.signature, None)
+            if row is not None:
+                by_id.pop(row.id, None)
+        if row is None:
+            row = Cell(page, 'mxCell',
+                       {'id': cell_id, 'value': value, 'style': txt2drawio.MEMBER_STYLE, 'vertex': '1',
+                        'parent': box.id},
+                       geometry={'y': '0', 'width': width, 'height': str(txt2drawio.MEMBER_HEIGHT), 'as': 'geometry'})
+            document.counts['added'] += 1
+        elif row.value != value:
+            page.text.set_attribute(row.start, VALUE_ATTRIBUTES[row.tag], value)
+            document.counts['updated'] += 1
+        new_rows.append(row)
+        set_row_y(row, y_position)
+        y_position += txt2drawio.MEMBER_HEIGHT
+
+    # The rows left are the members which are gone, the cells the user put in the box stay
+    for row in by_id.values():
+        if is_generated_id(row.id):
+            document.remove_cell(row)
+            document.counts['removed'] += 1
+        else:
+            new_rows.append(row)
+
+    if bAutoSize and box.geometry is not None and len(new_rows) != len(rows):
+        height = float(box.geometry.get('height', 0)) + txt2drawio.MEMBER_HEIGHT * (len(new_rows) - len(rows))
+        page.text.set_attribute(box.geometry_start, 'height', format_number(height))
+    place_rows(box, rows, new_rows, bSharedStyles)
+
+def place_rows(box, rows, new_rows, bSharedStyles=False):
+    """
+    Put the rows of a box in the order of new_rows. The longest run of existing rows already in
+    that order stays in place, the new rows and the other existing rows are inserted around it.
+    """
+    text = box.page.text
+    positions = {id(row): position for position, row in enumerate(rows)}
+    existing = [row for row in new_rows if row.start is not None]
+    stationary = {id(existing[index]) for index in longest_increasing([positions[id(row)] for row in existing])}
+
+    indent = text.indent_before(box.start)
+    pending = []
+    last = rows[-1] if rows else box
+    for row in new_rows:
+        if id(row) in stationary:
+            if pending:
+                text.insert(text.whitespace_start(row.start), b"".join(pending))
+                pending = []
+            last = row
+        elif row.start is None:
+            pending.append(cell_xml(row.attributes, row.geometry, indent, bSharedStyles).encode('utf-8'))
+        else:
+            pending.append(text.take(text.whitespace_start(row.start), row.end()))
+    if pending:
+        text.insert(last.end(), b"".join(pending))
+
+def longest_increasing(values):
+    """
+    Return the indexes of a longest increasing subsequence of values.
+    """
+    tails = []
+    tail_indexes = []
+    previous = []
+    for index, value in enumerate(values):
+        position = bisect.bisect_left(tails, value)
+        if position == len(tails):
+            tails.append(value)
+            tail_indexes.append(index)
+        else:
+            tails[position] = value
+            tail_indexes[position] = index
+        previous.append(tail_indexes[position - 1] if position else None)
+    indexes = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        indexes.add(index)
+        index = previous[index]
+    return indexes
+
+def signature_index(rows_by_id):
+    """
+    Return the rows by the signature of the member read back from their value.
+    """
+    rows = {}
+    for row in rows_by_id.values():
+        value = row.value
+        if value:
+            rows.setdefault(classModel.parse_member(value).signature, row)
+    return rows
+
+def set_row_y(row, y_position):
+    """
+    Move a row to its place in the stack of its box, the stackLayout of draw.io would do the same.
+    """
+    if row.geometry is None or row.geometry.get('y') == str(y_position):
+        return
+    if row.start is None:
+        row.geometry['y'] = str(y_position)
+    else:
+        row.page.text.set_attribute(row.geometry_start, 'y', str(y_position))
+
+def format_number(number):
+    return str(int(number)) if number == int(number) else str(number)
+
+def add_class_boxes(document, page, classes, bSharedStyles=False, bAutoSize=False):
+    """
+    Add the boxes of new classes to a page, packed below its existing cells.
+    classes are (class_name, member_funcs, member_vars, source_hash) tuples.
+    """
+    sizes = [txt2drawio.class_box_size(member_funcs, member_vars, class_name, bAutoSize)
+             for class_name, member_funcs, member_vars, _ in classes]
+    top = page_bottom(document, page)
+    top = top + NEW_BOX_GAP if top is not None else 0
+    for (class_name, member_funcs, member_vars, source_hash), size, (x, y) in zip(classes, sizes,
+                                                                                  layout.pack_boxes(sizes)):
+        cell_ids = txt2drawio.stable_cell_ids(class_name, member_funcs, member_vars)
+        for attributes, geometry in txt2drawio.class_cells(class_name, member_funcs, member_vars, x=str(x),
+                                                           y=str(top + y), layer_id=page.layer_id or '1', size=size,
+                                                           cell_ids=cell_ids, source_hash=source_hash):
+            document.add_cell(page.append(attributes, geometry, bSharedStyles))
+        document.counts['classes_added'] += 1
+        document.counts['added'] += len(member_funcs) + len(member_vars)
+
+def page_bottom(document, page):
+    """
+    Return the bottom of the lowest cell on the layer of a page, or None if it is empty.
+    """
+    bottom = None
+    for cell in document.children.get(page.layer_id, ()):
+        if cell.geometry is None or cell.cell.get('vertex') != '1' or cell.id not in document.cells:
+            continue
+        cell_bottom = float(cell.geometry.get('y', 0)) + float(cell.geometry.get('height', 0))
+        bottom = cell_bottom if bottom is None else max(bottom, cell_bottom)
+    return int(bottom) if bottom is not None else None
+
+def remove_dangling_edges(document):
+    """
+    Remove the edges whose source or target was removed.
+    """
+    for page in document.pages:
+        if not page.bRemoved:
+            continue
+        for cell in page.cells:
+            if cell.cell is None or cell.cell.get('edge') != '1' or cell.id not in document.cells:
+                continue
+            if any(cell.cell.get(end) is not None and cell.cell.get(end) not in document.cells
+                   for end in ('source', 'target')):
+                document.remove_cell(cell)
+
+def merge_edges(document, edges, bSharedStyles=False):
+    """
+    Keep the generated edges which are still wanted with their waypoints, add the new ones
+    and remove the others. The edges added by hand are left alone.
+    """
+    wanted = {}
+    for source_id, target_id, kind in edges:
+        source = document.cells.get(source_id)
+        target = document.cells.get(target_id)
+        # Edges across pages are dropped, like in create_multi_class_diagram
+        if source is not None and target is not None and source.page is target.page:
+            wanted.setdefault((source_id, target_id, kind), source.page)
+
+    for page in document.pages:
+        for cell in list(document.children.get(page.layer_id, ())):
+            if (cell.cell.get('edge') != '1' or cell.start is None or not is_generated_id(cell.id)
+                    or cell.id not in document.cells):
+                continue
+            if wanted.pop((cell.cell.get('source'), cell.cell.get('target'), edge_kind(cell.style)), None) is None:
+                document.remove_cell(cell)
+
+    for (source_id, target_id, kind), page in wanted.items():
+        document.add_cell(page.append(*txt2drawio.edge_cell(txt2drawio.edge_cell_id(source_id, target_id, kind),
+                                                            source_id, target_id, kind, page.layer_id or '1'),
+                                      bSharedStyles=bSharedStyles))
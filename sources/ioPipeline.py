@@ -0,0 +1,153 @@
+"""
+Threaded pipeline that overlaps reading, parsing and writing files.
+
+Every stage runs in its own threads and hands its results to the next stage
+through a bounded queue, so a slow file system is read and written while the
+previous files are parsed, and at most queue_size items wait between two
+stages. Parsing holds the GIL, so it keeps one thread, but reads and writes
+release it while they wait on the disk or the network.
+"""
+import io
+import queue
+import threading
+import time
+
+from sources import metrics
+
+# Marks the end of the items in a queue
+_END = object()
+
+class XmlBytes(io.BytesIO):
+    """
+    The content of an .xml file read in memory. It can be given to the parse
+    functions instead of the path, and prints as the path in error messages.
+    """
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+def read_xml_file(xml_file_path):
+    with metrics.span('read', xml_file_path) as counts:
+        with open(xml_file_path, 'rb') as file:
+            xml_bytes = XmlBytes(file.read(), xml_file_path)
+        counts['bytes_read'] = xml_size(xml_bytes)
+    return xml_bytes
+
+def xml_size(xml_bytes):
+    return xml_bytes.getbuffer().nbytes
+
+class Stage:
+    """
+    One stage of the pipeline and its statistics.
+
+    Args:
+    - name (str): The name shown in the statistics.
+    - function (callable): Called with each item of the previous stage, returns
+      the item of the next stage. None drops the item.
+    - threads (int): The number of threads of the stage.
+    - measure (callable): If set, returns the number of bytes of a result.
+    """
+
+    def __init__(self, name, function, threads=1, measure=None):
+        self.name = name
+        self.function = function
+        self.threads = max(1, threads)
+        self.measure = measure
+        self.items = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, elapsed, result):
+        with self.lock:
+            self.items += 1
+            self.busy_seconds += elapsed
+            if self.measure is not None and result is not None:
+                self.bytes += self.measure(result)
+
+def run_stages(items, stages, queue_size=64, results=None):
+    """
+    Pass every item through the stages, the order of the items is not kept.
+    If results is a list, the results of the last stage are appended to it.
+
+    Returns:
+    - float: The wall time in seconds. The statistics are in the stages.
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    errors = []
+    threads = []
+
+    for stage, input_queue, output_queue in zip(stages, queues, queues[1:]):
+        remaining = [stage.threads]
+        remaining_lock = threading.Lock()
+        for _ in range(stage.threads):
+            thread = threading.Thread(target=_run_stage, daemon=True,
+                                      args=(stage, input_queue, output_queue, remaining, remaining_lock, errors))
+            thread.start()
+            threads.append(thread)
+
+    start = time.perf_counter()
+    # Drain the last queue in its own thread so the stages never block on it
+    drain = threading.Thread(target=_drain, args=(queues[-1], results), daemon=True)
+    drain.start()
+    for item in items:
+        queues[0].put(item)
+    queues[0].put(_END)
+    for thread in threads:
+        thread.join()
+    drain.join()
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        raise errors[0]
+    return elapsed
+
+def _run_stage(stage, input_queue, output_queue, remaining, remaining_lock, errors):
+    while True:
+        item = input_queue.get()
+        if item is _END:
+            # Let the other threads of the stage see the end too
+            input_queue.put(_END)
+            break
+        start = time.perf_counter()
+        try:
+            result = stage.function(item)
+        except Exception as e:
+            # Keep draining the queue so that the other stages do not block
+            errors.append(e)
+            continue
+        stage.record(time.perf_counter() - start, result)
+        if result is not None:
+            output_queue.put(result)
+
+    with remaining_lock:
+        remaining[0] -= 1
+        if remaining[0] == 0:
+            output_queue.put(_END)
+
+def _drain(output_queue, results=None):
+    while True:
+        result = output_queue.get()
+        if result is _END:
+            break
+        if results is not None:
+            results.append(result)
+
+def print_stage_stats(stages, elapsed):
+    """
+    Print the items, busy time and throughput of each stage. The throughput is
+    items per busy second of one thread times the threads, which is what the
+    stage could sustain if it never waited on the others.
+    """
+    print(f"{'stage':<10} {'threads':>7} {'items':>8} {'busy s':>8} {'items/s':>10} {'MB/s':>8}")
+    for stage in stages:
+        capacity_seconds = stage.busy_seconds / stage.threads
+        items_per_second = stage.items / capacity_seconds if capacity_seconds else 0.0
+        megabytes_per_second = stage.bytes / 1024 / 1024 / capacity_seconds if capacity_seconds else 0.0
+        print(f"{stage.name:<10} {stage.threads:>7} {stage.items:>8} {stage.busy_seconds:>8.2f} "
+              f"{items_per_second:>10.1f} {megabytes_per_second:>8.1f}")
+    print(f"wall time {elapsed:.2f} s")
@@ -0,0 +1,131 @@
+"""
+Registry of the source languages handled by the codeline extractors.
+
+Doxygen writes the language of every compound in <compounddef language="...">.
+The extractors look it up once per file and classify every member line of the
+file with the tables of that language, see memberClassifier: its modifier
+keywords, how the access of a member is written, the annotations to skip and
+how the type is read. A folder mixing C#, C++ and Java compounds is converted
+in one pass.
+"""
+import re
+
+# Access levels and the access specifiers of classModel.Member, 'package' is the Doxygen
+# protection of the Java members without a modifier
+ACCESS_SPECIFIERS = {
+    'public': '+',
+    'protected': '#',
+    'private': '-',
+    'package': '~'
+}
+
+# Spaces left by the <sp/> and <ref> elements inside a type, e.g. "std::vector< Item *>"
+TYPE_SPACING_PATTERN = re.compile(r'\s+(?=[<>*&,)\]])|(?<=[<(\[])\s+|\s*::\s*')
+# A pointer or reference written against the parameter name, e.g. "Player &other"
+POINTER_NAME_PATTERN = re.compile(r'(?<=[*&])(?=\w)')
+
+class Language:
+    """
+    The tables used to classify the member lines of one language.
+
+    Args:
+    - name (str): The language attribute Doxygen writes, e.g. 'C#'.
+    - file_suffixes (tuple): The endings of the names of its file compounds, e.g. ('cs.xml',).
+    - source_extensions (tuple): The extensions of its source files, removed from the class names.
+    - modifiers (iterable): The keywords which can come before the type of a member, access keywords included.
+    - default_access (str): The access of a member without an access keyword.
+    - attribute_pattern (str): The regular expression of the attributes or annotations skipped in a line.
+    - bFullType (bool): The type is all the text between the modifiers and the name, e.g. 'const std::string&',
+      instead of only its first word.
+    - bSectionAccess (bool): The access is set for the following members by labels such as 'public:'.
+    """
+
+    def __init__(self, name, file_suffixes, source_extensions, modifiers, default_access='-',
+                 attribute_pattern=r'\[[^\]]*\]', bFullType=False, bSectionAccess=False):
+        self.name = name
+        self.file_suffixes = file_suffixes
+        self.source_extensions = source_extensions
+        self.modifiers = frozenset(modifiers)
+        self.default_access = default_access
+        self.bFullType = bFullType
+        self.bSectionAccess = bSectionAccess
+        # Attributes, words and parentheses, and with bFullType the end of a variable declaration
+        self.token_pattern = re.compile(rf'{attribute_pattern}|\w+|[()]' + ('|[=;{]' if bFullType else ''))
+        self.attribute_pattern = re.compile(attribute_pattern)
+        self.attribute_start = attribute_pattern.lstrip('\\')[0]
+        self.modifier_pattern = re.compile(rf"\b({'|'.join(sorted(self.modifiers))})\b")
+
+    def access_of_label(self, text):
+        """
+        Return the access set by a label line such as 'public:', or None.
+        """
+        match = SECTION_LABEL_PATTERN.match(text)
+        return ACCESS_SPECIFIERS[match.group(1)] if match else None
+
+    def access_of_compound(self, text):
+        """
+        Return the access of the members of a class declared by a compound line.
+        """
+        return '+' if STRUCT_PATTERN.search(text) else self.default_access
+
+    def __repr__(self):
+        return f"Language({self.name!r})"
+
+# 'public:', 'protected slots:', ... but not 'public::'
+SECTION_LABEL_PATTERN = re.compile(r'\s*(public|protected|private)\b[^:;()]*:(?!:)')
+STRUCT_PATTERN = re.compile(r'\bstruct\b')
+
+LANGUAGES = {}
+
+def register(language):
+    """
+    Add a language to the registry, under the language attribute Doxygen writes.
+    """
+    LANGUAGES[language.name] = language
+    return language
+
+CSHARP = register(Language(
+    'C#', ('cs.xml',), ('.cs',),
+    ('public', 'protected', 'private', 'static', 'override', 'virtual', 'abstract')))
+
+CPP = register(Language(
+    'C++', ('_8h.xml', '_8hh.xml', '_8hpp.xml', '_8hxx.xml'), ('.h', '.hh', '.hpp', '.hxx'),
+    ('public', 'protected', 'private', 'static', 'virtual', 'inline', 'explicit', 'constexpr', 'consteval',
+     'friend', 'extern', 'mutable', 'template'),
+    attribute_pattern=r'\[\[[^\]]*\]\]', bFullType=True, bSectionAccess=True))
+
+JAVA = register(Language(
+    'Java', ('_8java.xml',), ('.java',),
+    ('public', 'protected', 'private', 'static', 'final', 'abstract', 'synchronized', 'native', 'transient',
+     'volatile', 'default', 'strictfp'),
+    default_access='~', attribute_pattern=r'@\w+(?:\([^)]*\))?', bFullType=True))
+
+# The codeline extractors read the file compounds of every registered language
+CODELINE_FILE_SUFFIXES = tuple(suffix for language in LANGUAGES.values() for suffix in language.file_suffixes)
+SOURCE_EXTENSIONS = tuple(extension for language in LANGUAGES.values() for extension in language.source_extensions)
+
+def get_language(name):
+    """
+    Return the language of a <compounddef language=...> attribute, C# when it is missing or not registered.
+    """
+    return LANGUAGES.get(name, CSHARP)
+
+def is_codeline_file(file_name):
+    return file_name.endswith(CODELINE_FILE_SUFFIXES)
+
+def strip_source_extension(class_name):
+    """
+    Remove the source file extension from a class named after its file compound, e.g. 'Player.cs' -> 'Player'.
+    """
+    for extension in SOURCE_EXTENSIONS:
+        if class_name.endswith(extension):
+            return class_name[:-len(extension)]
+    return class_name
+
+def normalize_type(text):
+    """
+    Return a type or a parameter list read from a codeline without the spaces of the XML layout,
+    e.g. "const std :: vector< Item *> &" -> "const std::vector<Item*>&".
+    """
+    text = TYPE_SPACING_PATTERN.sub(lambda match: '::' if ':' in match.group() else '', ' '.join(text.split()))
+    return POINTER_NAME_PATTERN.sub(' ', text)
@@ -0,0 +1,84 @@
+import math
+
+# Advance widths of Helvetica (draw.io's default font) in 1/1000 of the font size
+HELVETICA_WIDTHS = {
+    191: "'",
+    222: "ijl",
+    260: "|",
+    278: " !,./:;I[\\]ft",
+    333: "()-`r",
+    334: "{}",
+    355: '"',
+    389: "*",
+    469: "^",
+    500: "Jckvxyzs",
+    556: "#$0123456789?L_abdeghnopqu",
+    584: "+<=>~",
+    611: "FTZ",
+    667: "&ABEKPSVXY",
+    722: "CDHNRUw",
+    778: "GOQ",
+    833: "Mm",
+    889: "%",
+    944: "W",
+    1015: "@"
+}
+
+FONT_SIZE = 12
+# Bold text is about 10 % wider
+BOLD_FACTOR = 1.1
+
+# Width of every ASCII character at FONT_SIZE, built once
+CHAR_WIDTHS = {char: width * FONT_SIZE / 1000 for width, chars in HELVETICA_WIDTHS.items() for char in chars}
+# Other characters, e.g. Hangul, are taken as full width
+DEFAULT_CHAR_WIDTH = FONT_SIZE
+
+def text_width(text, bBold=False):
+    """
+    Return the approximate width in pixels of text drawn in Helvetica at FONT_SIZE.
+    """
+    width = sum(CHAR_WIDTHS.get(char, DEFAULT_CHAR_WIDTH) for char in text)
+    return width * BOLD_FACTOR if bBold else width
+
+def pack_boxes(sizes, gap=40, max_row_width=None):
+    """
+    Place boxes with a shelf packing: the boxes are sorted by height and put
+    left to right on rows ("shelves") which are stacked top to bottom.
+    Boxes of the same size end up on a regular grid.
+
+    It runs in O(n log n), so it is fine for thousands of classes.
+
+    Args:
+    - sizes (list): (width, height) of each box.
+    - gap (int): The space between the boxes.
+    - max_row_width (int): The width of a row, by default about the side of a
+      square holding all the boxes.
+
+    Returns:
+    - list: The (x, y) position of each box, in the order of sizes.
+    """
+    if not sizes:
+        return []
+
+    if max_row_width is None:
+        area = sum((width + gap) * (height + gap) for width, height in sizes)
+        max_row_width = max(int(math.sqrt(area)), max(width for width, _ in sizes) + gap)
+
+    # Tallest first, the index keeps the order of equal boxes stable
+    order = sorted(range(len(sizes)), key=lambda index: -sizes[index][1])
+
+    positions = [None] * len(sizes)
+    x = y = 0
+    row_height = 0
+    for index in order:
+        width, height = sizes[index]
+        if x > 0 and x + width > max_row_width:
+            # Start a new shelf
+            x = 0
+            y += row_height + gap
+            row_height = 0
+        positions[index] = (x, y)
+        x += width + gap
+        row_height = max(row_height, height)
+
+    return positions
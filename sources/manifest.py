@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+
+MANIFEST_FILE_NAME = '.manifest.json'
+# Increase when the generated outputs change so that old manifests are not trusted
+MANIFEST_VERSION = 1
+
+def file_hash(file_path):
+    """
+    Return the sha256 hex digest of the content of a file.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def output_names(output):
+    """
+    Return the file names of the "output" of a manifest entry, a file name or a list of them.
+    """
+    return [output] if isinstance(output, str) else list(output)
+
+def load_manifest(folder_path):
+    """
+    Load the manifest of an output folder, or return an empty one if there is none.
+    """
+    manifest_path = os.path.join(folder_path, MANIFEST_FILE_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (IOError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+def save_manifest(folder_path, manifest):
+    """
+    Save the manifest of an output folder, None (a build which is not incremental) saves nothing.
+    """
+    if manifest is None:
+        return
+    manifest_path = os.path.join(folder_path, MANIFEST_FILE_NAME)
+    try:
+        with open(manifest_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=1, sort_keys=True)
+    except IOError as e:
+        print(f"Error creating file '{manifest_path}': {e}")
+
+def save_build_manifest(output_folder, manifest, changed_names, built_names):
+    """
+    Save the manifest of plan_incremental_build once the changed sources are built.
+
+    The changed sources which wrote no output (a parse error, a class filtered out or
+    skipped) are left out of the manifest, so that they are tried again on the next run,
+    and their outputs of an earlier run are removed.
+
+    Args:
+    - output_folder (str): The folder of the generated files.
+    - manifest (dict): The new manifest from plan_incremental_build, None saves nothing.
+    - changed_names (list): The source names plan_incremental_build returned.
+    - built_names (iterable): The source names among them whose outputs were written.
+    """
+    if manifest is None:
+        return
+    built_names = set(built_names)
+    for source_name in changed_names:
+        if source_name in built_names:
+            continue
+        entry = manifest["files"].pop(source_name, None)
+        if entry is not None:
+            for output_name in output_names(entry["output"]):
+                remove_file(os.path.join(output_folder, output_name))
+    save_manifest(output_folder, manifest)
+
+def plan_incremental_build(source_folder, source_names, output_folder, output_name_for, settings, bIncremental=True,
+                           hash_threads=1):
+    """
+    Compare the sources with the manifest of the output folder.
+
+    Sources whose content hash and settings match the manifest, and whose output
+    still exists, are skipped. Outputs of sources that no longer exist are removed.
+    When the build is not incremental the sources are not hashed at all, and the
+    manifest of the output folder is removed since its outputs are about to change.
+
+    Args:
+    - source_folder (str): The folder of the input files.
+    - source_names (list): The input file names.
+    - output_folder (str): The folder of the generated files, where the manifest is stored.
+    - output_name_for (callable): Returns the output file name of an input file name,
+      or the list of its output file names.
+    - settings (dict): The generator settings, any change rebuilds every file.
+    - bIncremental (bool): If False every source is returned as changed, without hashing it.
+    - hash_threads (int): Hash the sources in this many threads, for slow file systems.
+
+    Returns:
+    - tuple: (list of source names to build, new manifest to save with save_build_manifest
+      once they are built, None if not bIncremental)
+    """
+    old_manifest = load_manifest(output_folder)
+    old_files = old_manifest.get("files", {})
+    output_names_by_source = {source_name: output_name_for(source_name) for source_name in source_names}
+    remove_deleted_outputs(output_folder, old_files, output_names_by_source)
+
+    if not bIncremental:
+        remove_file(os.path.join(output_folder, MANIFEST_FILE_NAME))
+        return list(source_names), None
+
+    bSameSettings = old_manifest.get("settings") == settings
+    source_paths = [os.path.join(source_folder, source_name) for source_name in source_names]
+    if hash_threads > 1 and len(source_paths) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=hash_threads) as executor:
+            digests = list(executor.map(file_hash, source_paths))
+    else:
+        digests = map(file_hash, source_paths)
+
+    new_files = {}
+    changed_names = []
+    for source_name, digest in zip(source_names, digests):
+        output_name = output_names_by_source[source_name]
+        new_files[source_name] = {"hash": digest, "output": output_name}
+
+        old_entry = old_files.get(source_name) if bSameSettings else None
+        if (old_entry is None or old_entry.get("hash") != digest
+                or not all(os.path.exists(os.path.join(output_folder, name)) for name in output_names(output_name))):
+            changed_names.append(source_name)
+
+    new_manifest = {
+        "version": MANIFEST_VERSION,
+        "settings": settings,
+        "files": new_files
+    }
+    return changed_names, new_manifest
+
+def remove_deleted_outputs(output_folder, old_files, output_names_by_source):
+    """
+    Remove the outputs of the old manifest entries whose source was deleted,
+    unless a current source writes the same file.
+    """
+    current_outputs = {name for output in output_names_by_source.values() for name in output_names(output)}
+    for source_name, old_entry in old_files.items():
+        if source_name in output_names_by_source or old_entry.get("output") is None:
+            continue
+        for output_name in output_names(old_entry["output"]):
+            if output_name not in current_outputs:
+                remove_file(os.path.join(output_folder, output_name))
+
+def remove_file(file_path):
+    try:
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+    except OSError as e:
+        print(f"Error removing file {file_path}: {e}")
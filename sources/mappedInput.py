@@ -0,0 +1,99 @@
+"""
+Memory-mapped input of the compound .xml files, with a pre-scan that skips the
+compounds which have nothing to extract.
+
+Every member the extractors read is marked in the raw bytes: the codeline
+backend only extracts the codelines with refkind="member", the memberdef
+backend only the <memberdef> elements. The file is mapped with mmap and the
+marker is searched in the mapping, which costs a memchr over the page cache
+instead of building a tree. The files without it (files of enums or of
+free functions, forward declarations, empty partial classes) are skipped
+before the XML parser starts, the others are parsed from the same mapping
+without reading the file into a bytes object first.
+
+A skipped file gives no class at all, where a full parse gives an empty box,
+so the pre-scan is only used when asked for.
+"""
+import io
+import mmap
+import os
+
+from sources import metrics
+
+# The bytes every file with something to extract contains, by backend
+MEMBER_MARKERS = {
+    'codeline': b'refkind="member"',
+    'memberdef': b'<memberdef',
+}
+
+class MappedXml:
+    """
+    A read only file object over the mapping of an .xml file. It can be given to
+    the parse functions instead of the path, and prints as the path in error messages.
+    """
+
+    def __init__(self, mapping, name):
+        self.mapping = mapping
+        self.name = name
+
+    def read(self, size=-1):
+        return self.mapping.read(size)
+
+    def seek(self, position, whence=os.SEEK_SET):
+        return self.mapping.seek(position, whence)
+
+    def tell(self):
+        return self.mapping.tell()
+
+    def __str__(self):
+        return self.name
+
+def has_members(data, marker):
+    """
+    Return True if data (bytes or a mapping) holds the member marker of a backend.
+    """
+    return data.find(marker) >= 0
+
+def skip_file(xml_file, size):
+    with metrics.span('skip', xml_file) as counts:
+        counts['bytes_read'] = size
+    metrics.verbose_print(f"Skipped '{xml_file}', it has no members.")
+    return None
+
+def prescreened_parse(xml_file, parse, marker):
+    """
+    Return parse(xml_file) if the file holds marker, None without parsing it otherwise.
+
+    Args:
+    - xml_file (str): The .xml file, or its content already read in a BytesIO.
+    - parse (callable): The parse function, given a MappedXml instead of the path.
+    - marker (bytes): See MEMBER_MARKERS.
+    """
+    if isinstance(xml_file, io.BytesIO):
+        # getvalue shares the buffer of a BytesIO which was not written to
+        xml_bytes = xml_file.getvalue()
+        if not has_members(xml_bytes, marker):
+            return skip_file(xml_file, len(xml_bytes))
+        return parse(xml_file)
+
+    try:
+        with open(xml_file, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                # mmap can not map an empty file
+                return skip_file(xml_file, size)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                if not has_members(mapping, marker):
+                    return skip_file(xml_file, size)
+                return parse(MappedXml(mapping, xml_file))
+    except (OSError, ValueError) as e:
+        print(f"Error reading {xml_file}: {e}")
+        return None
+
+def prescan_settings(settings, bSkipEmpty):
+    """
+    Add the pre-scan to the settings of a manifest, it leaves out the outputs of the skipped files.
+    """
+    if bSkipEmpty:
+        settings["skip_empty"] = True
+    return settings
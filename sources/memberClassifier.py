@@ -0,0 +1,123 @@
+"""
+Single pass classifier for the text of a member codeline.
+
+It replaces the chain remove_attributes -> extract_type_info ->
+extract_function_signature -> remove_access_specifiers_and_return_type,
+which ran the modifier regex twice and several other regular expressions
+on every line (it is kept in benchmarks/bench_classifier.py for the comparison).
+Here one precompiled tokenizer walks the line once.
+
+The keywords and the tokenizer come from the language of the file, see languages.
+"""
+from sources import languages
+
+def classify_member_line(text, language=languages.CSHARP, default_access=None):
+    """
+    Classify the text of a member codeline in one pass.
+
+    Args:
+    - text (str): The codeline text, e.g. "[SerializeField] public static int Foo(int a, float b){".
+    - language (Language): The language of the file, see languages.
+    - default_access (str): The access without an access keyword, e.g. from a C++ 'public:' label.
+      The default access of the language if None.
+
+    Returns:
+    - tuple: (access, modifiers, return_type, name, parameters)
+      - access (str): '+', '#', '-' or '~', default_access when there is no access keyword.
+      - modifiers (list): The modifier keywords in order, e.g. ['public', 'static'].
+      - return_type (str): The first word after the modifiers, or with language.bFullType all the
+        text up to the name. 'void' if there is none.
+      - name (str): The word before the parameter list, with the '~' of a destructor, None for variables.
+      - parameters (str): The text between the parentheses, None for variables.
+    """
+    modifier_keywords = language.modifiers
+    attribute_start = language.attribute_start
+    access = None
+    modifiers = []
+    return_type = None
+    # End of the modifiers and match of the name, for bFullType
+    type_start = 0
+    name_start = None
+    last_word = None
+    last_match = None
+    name = None
+    parameters = None
+    parameters_start = None
+    depth = 0
+
+    for match in language.token_pattern.finditer(text):
+        token = match.group()
+        first = token[0]
+        if first == attribute_start:
+            # Attribute
+            if return_type is None:
+                type_start = match.end()
+            continue
+        if first == '(':
+            if parameters_start is None:
+                name = last_word
+                name_start = last_match
+                parameters_start = match.end()
+            depth += 1
+        elif first == ')':
+            if depth:
+                depth -= 1
+                if not depth:
+                    parameters = text[parameters_start:match.start()]
+                    # The rest of the line is the body
+                    break
+        elif depth:
+            continue
+        elif first in '=;{':
+            # The end of a variable declaration, only in the bFullType tokenizers
+            if last_word != 'operator':
+                break
+        else:
+            if return_type is None and token in modifier_keywords:
+                modifiers.append(token)
+                if access is None:
+                    access = languages.ACCESS_SPECIFIERS.get(token)
+                type_start = match.end()
+            elif return_type is None:
+                return_type = token
+            last_word = token
+            last_match = match
+
+    if parameters is None:
+        # A variable, or a signature that goes on past this line
+        name = None
+        name_start = last_match
+    elif attribute_start in parameters:
+        parameters = language.attribute_pattern.sub('', parameters)
+    if parameters is not None:
+        parameters = parameters.strip()
+        if text[:name_start.start()].rstrip().endswith('~'):
+            # A destructor: the '~' is not part of the word token, and there is no return type
+            name = '~' + name
+            if not text[type_start:name_start.start()].strip().rstrip('~'):
+                return_type = None
+
+    if language.bFullType and return_type is not None:
+        return_type = full_type(text[type_start:name_start.start()]) or 'void'
+        if parameters is not None:
+            parameters = languages.normalize_type(parameters)
+
+    return access or default_access or language.default_access, modifiers, return_type or 'void', name, parameters
+
+def full_type(text):
+    """
+    Return the type written before a member name, without the generic parameters
+    of a generic method, e.g. "<T> List<T>" -> "List<T>", and without the '~' of a destructor.
+    """
+    text = text.strip().rstrip('~')
+    if text.startswith('<'):
+        depth = 0
+        for index, character in enumerate(text):
+            if character == '<':
+                depth += 1
+            elif character == '>':
+                depth -= 1
+                if not depth:
+                    text = text[index + 1:]
+                    break
+    return languages.normalize_type(text)
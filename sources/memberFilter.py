@@ -0,0 +1,128 @@
+"""
+Class and member filters applied by the extractors while they parse.
+
+A member which is filtered out is dropped as soon as its access, kind and
+name are known: it is never turned into a classModel.Member, sorted or
+written, and its type references are not recorded. A class which is filtered
+out stops the parse before its members are read, so excluding a large
+generated class costs almost nothing.
+"""
+import fnmatch
+import io
+import re
+import xml.etree.ElementTree as ET
+
+from sources import doxygenIndex
+from sources import languages
+from sources import mappedInput
+
+MEMBER_KINDS = ('function', 'variable')
+
+def compile_patterns(patterns):
+    """
+    Compile shell-style name patterns (e.g. 'Get*', 'On?Click') into one regular expression.
+    """
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+class MemberFilter:
+    """
+    The classes and members kept in the diagrams, see make_filter.
+    """
+
+    def __init__(self, access_levels=None, member_kinds=None, name_patterns=None, exclude_patterns=None,
+                 namespaces=None, class_names=None):
+        self.access = frozenset(languages.ACCESS_SPECIFIERS[level] for level in access_levels) if access_levels else None
+        self.bFunctions = not member_kinds or 'function' in member_kinds
+        self.bVariables = not member_kinds or 'variable' in member_kinds
+        self.name_pattern = compile_patterns(name_patterns)
+        self.exclude_pattern = compile_patterns(exclude_patterns)
+        self.namespaces = namespaces
+        self.class_names = class_names
+        self.bSelectsClasses = bool(namespaces or class_names)
+        # Identifies the filter in the parse cache keys and the manifests
+        self.key = repr((sorted(access_levels or []), sorted(member_kinds or []), sorted(name_patterns or []),
+                         sorted(exclude_patterns or []), sorted(namespaces or []), sorted(class_names or [])))
+
+    def accepts_kind_and_access(self, bFunction, access):
+        if not (self.bFunctions if bFunction else self.bVariables):
+            return False
+        return self.access is None or access in self.access
+
+    def accepts_name(self, name):
+        if self.name_pattern is not None and not self.name_pattern.match(name):
+            return False
+        return self.exclude_pattern is None or not self.exclude_pattern.match(name)
+
+    def accepts_member(self, bFunction, access, name):
+        return self.accepts_kind_and_access(bFunction, access) and self.accepts_name(name)
+
+    def accepts_class(self, class_name):
+        return doxygenIndex.is_selected(class_name, self.namespaces, self.class_names)
+
+    def accepts_any_class(self, class_names):
+        """
+        Return True if one of the classes of a file compound is selected.
+        """
+        if not self.bSelectsClasses:
+            return True
+        return any(self.accepts_class(class_name) for class_name in class_names)
+
+    def accepts_file_compound(self, xml_file):
+        """
+        Return False if none of the classes of a file compound is selected. Only the
+        head of the file is read, the <innerclass> elements come before the code.
+        """
+        if not self.bSelectsClasses:
+            return True
+        class_names = read_inner_class_names(xml_file)
+        return class_names is None or self.accepts_any_class(class_names)
+
+def read_inner_class_names(xml_file):
+    """
+    Return the <innerclass> names of a file compound, read up to its <programlisting>,
+    or None if the file can not be read (the parser reports the error).
+
+    Args:
+    - xml_file (str): The .xml file, or its content in a BytesIO or a MappedXml which is rewound afterwards.
+    """
+    class_names = []
+    try:
+        for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "programlisting":
+                    break
+            elif elem.tag == "innerclass":
+                class_names.append((elem.text or '').strip())
+    except (OSError, ET.ParseError):
+        return None
+    finally:
+        if isinstance(xml_file, (io.BytesIO, mappedInput.MappedXml)):
+            xml_file.seek(0)
+    return class_names
+
+def make_filter(access_levels=None, member_kinds=None, name_patterns=None, exclude_patterns=None, namespaces=None,
+                class_names=None):
+    """
+    Return the MemberFilter of the options, or None if they keep everything.
+
+    Args:
+    - access_levels (list): Only keep the members of these access levels, see languages.ACCESS_SPECIFIERS.
+    - member_kinds (list): Only keep these kinds of members, 'function' and/or 'variable'.
+    - name_patterns (list): Only keep the members whose name matches one of these shell-style patterns.
+    - exclude_patterns (list): Drop the members whose name matches one of these shell-style patterns.
+    - namespaces (list): Only keep the classes of these namespaces, see doxygenIndex.is_selected.
+    - class_names (list): Only keep these classes.
+    """
+    if not (access_levels or member_kinds or name_patterns or exclude_patterns or namespaces or class_names):
+        return None
+    return MemberFilter(access_levels, member_kinds, name_patterns, exclude_patterns, namespaces, class_names)
+
+def filter_settings(settings, member_filter):
+    """
+    Add the filter to the settings of a manifest, a filtered build does not reuse the unfiltered outputs.
+    """
+    if member_filter is not None:
+        settings["filter"] = member_filter.key
+    return settings
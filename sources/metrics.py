@@ -0,0 +1,176 @@
+"""
+Optional instrumentation of a conversion run.
+
+When enabled, every parse, text write, text read and diagram write records a
+span: its stage, its file, its start and duration, and counters such as the
+bytes read or written and the members parsed. The spans can be printed as a
+summary table, saved as JSON, or saved in the Chrome trace event format
+(open it in chrome://tracing or https://ui.perfetto.dev).
+
+Disabled, which is the default, span() returns a shared no-op object, so the
+instrumented code pays almost nothing.
+
+The per-class messages of the converter go through verbose_print, so a run
+is quiet unless bVerbose is set.
+"""
+import io
+import json
+import os
+import threading
+import time
+
+bEnabled = False
+bVerbose = False
+
+_records = []
+
+# Number of spans listed by print_summary as the slowest files
+SLOWEST_COUNT = 10
+
+def enable(bEnable=True):
+    """
+    Turn the recording on or off, and forget the recorded spans.
+    """
+    global bEnabled
+    bEnabled = bEnable
+    _records.clear()
+
+def set_verbose(bVerboseOutput=True):
+    global bVerbose
+    bVerbose = bVerboseOutput
+
+def verbose_print(*args):
+    if bVerbose:
+        print(*args)
+
+class _Span:
+    __slots__ = ('stage', 'file_name', 'start', 'counts')
+
+    def __init__(self, stage, file_name):
+        self.stage = stage
+        self.file_name = file_name
+        self.counts = {}
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self.counts
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = time.perf_counter() - self.start
+        _records.append(dict(self.counts, stage=self.stage, file=self.file_name, start=self.start,
+                             seconds=seconds, pid=os.getpid(), tid=threading.get_ident()))
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        # Written to by the instrumented code and thrown away
+        return {}
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+def span(stage, file_name=None):
+    """
+    Return a context manager recording one span. Its value is a dict where the
+    code can put counters, e.g. counts['bytes_written'] = len(text).
+    """
+    if bEnabled:
+        return _Span(stage, str(file_name))
+    return _NULL_SPAN
+
+def measured_parse(xml_file, parse):
+    """
+    Call parse(xml_file) in a 'parse' span, with the bytes read and the members parsed.
+    """
+    with span('parse', xml_file) as counts:
+        extracted_info = parse(xml_file)
+        if isinstance(xml_file, io.BytesIO):
+            counts['bytes_read'] = xml_file.getbuffer().nbytes
+        else:
+            counts['bytes_read'] = os.path.getsize(xml_file)
+        if extracted_info is not None:
+            counts['members'] = len(extracted_info["member_functions"]) + len(extracted_info["member_variables"])
+    return extracted_info
+
+def get_state():
+    """
+    Return the settings a worker process needs, see call_with_state.
+    """
+    return bEnabled, bVerbose
+
+def call_with_state(state, func, *args):
+    """
+    Run func(*args) in a worker process with the settings of the main process,
+    and return (result, spans recorded by the call) for add_records.
+    """
+    enable(state[0])
+    set_verbose(state[1])
+    result = func(*args)
+    records = list(_records)
+    _records.clear()
+    return result, records
+
+def add_records(records):
+    _records.extend(records)
+
+def get_records():
+    return list(_records)
+
+def summarize(records=None):
+    """
+    Return the totals of each stage, in the order the stages first appear.
+    """
+    stages = {}
+    for record in _records if records is None else records:
+        stage = stages.setdefault(record["stage"], {
+            "count": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes_read": 0, "bytes_written": 0, "members": 0})
+        stage["count"] += 1
+        stage["seconds"] += record["seconds"]
+        stage["max_seconds"] = max(stage["max_seconds"], record["seconds"])
+        for counter in ("bytes_read", "bytes_written", "members"):
+            stage[counter] += record.get(counter, 0)
+    return stages
+
+def slowest(records=None, count=SLOWEST_COUNT):
+    return sorted(_records if records is None else records, key=lambda record: -record["seconds"])[:count]
+
+def print_summary():
+    stages = summarize()
+    print(f"{'stage':<12} {'files':>7} {'total s':>9} {'mean ms':>9} {'max ms':>9} "
+          f"{'read KB':>9} {'written KB':>10} {'members':>9}")
+    for name, stage in stages.items():
+        print(f"{name:<12} {stage['count']:>7} {stage['seconds']:>9.3f} "
+              f"{stage['seconds'] / stage['count'] * 1000:>9.2f} {stage['max_seconds'] * 1000:>9.2f} "
+              f"{stage['bytes_read'] / 1024:>9.0f} {stage['bytes_written'] / 1024:>10.0f} {stage['members']:>9}")
+    print("slowest files:")
+    for record in slowest():
+        print(f"{record['seconds'] * 1000:>9.2f} ms  {record['stage']:<12} {record['file']}")
+
+def write_json(output_file_path):
+    """
+    Save the stage totals, the slowest spans and every span as JSON.
+    """
+    with open(output_file_path, 'w', encoding='utf-8') as file:
+        json.dump({"stages": summarize(), "slowest": slowest(), "spans": _records}, file, indent=1)
+
+def write_chrome_trace(output_file_path):
+    """
+    Save the spans in the Chrome trace event format, one complete event ('X') per span.
+    """
+    origin = min((record["start"] for record in _records), default=0.0)
+    events = [{
+        "name": record["stage"],
+        "cat": "doxygen2drawio",
+        "ph": "X",
+        "ts": (record["start"] - origin) * 1e6,
+        "dur": record["seconds"] * 1e6,
+        "pid": record["pid"],
+        "tid": record["tid"],
+        "args": {key: value for key, value in record.items()
+                 if key not in ("stage", "start", "seconds", "pid", "tid")}
+    } for record in _records]
+    with open(output_file_path, 'w', encoding='utf-8') as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,101 @@
+import os
+from collections import deque
+from functools import partial
+from itertools import repeat
+
+from sources import metrics
+
+def map_files(func, file_paths, workers=1, *args, **kwargs):
+    """
+    Call func(file_path, *args, **kwargs) for every file, optionally in a process pool.
+
+    The results are returned in the order of file_paths whatever the number of
+    workers, so the output of a run does not depend on it. The workers get the
+    metrics settings of this process, and their spans are gathered here.
+
+    Args:
+    - func (callable): A module level function (it must be picklable).
+    - file_paths (list): The files to process.
+    - workers (int): The number of worker processes, 1 runs everything in this process.
+    - args: Extra arguments passed to every call.
+    - kwargs: Extra keyword arguments passed to every call.
+
+    Returns:
+    - list: The result of each call.
+    """
+    return list(iter_files(func, file_paths, workers, *args, **kwargs))
+
+def iter_files(func, file_paths, workers=1, *args, max_pending_bytes=None, **kwargs):
+    """
+    Like map_files, but yield the results one by one, so the caller can write
+    each one and let it go before the next file is parsed.
+
+    Args:
+    - max_pending_bytes (int): If set, the pool only gets new files while the files
+      sent to it and not yet yielded take less than this many bytes (at least one
+      chunk is always pending). None sends every file at once.
+    """
+    if kwargs:
+        # A partial of a module level function can still be sent to the workers
+        func = partial(func, **kwargs)
+    if workers is None or workers <= 1 or len(file_paths) <= 1:
+        yield from map(func, file_paths, *[repeat(arg) for arg in args])
+        return
+
+    # Imported here because it pulls in multiprocessing, which is slow to import
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Send the files in chunks so that small files do not pay one round trip each
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    call = partial(metrics.call_with_state, metrics.get_state(), func)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if max_pending_bytes is None:
+            extra_args = [[arg] * len(file_paths) for arg in args]
+            for result, records in executor.map(call, file_paths, *extra_args, chunksize=chunksize):
+                metrics.add_records(records)
+                yield result
+            return
+
+        # Oldest first: (future, bytes of its files)
+        pending = deque()
+        pending_bytes = 0
+        for chunk, chunk_bytes in split_chunks(file_paths, chunksize, max_pending_bytes // (workers * 2)):
+            while pending and pending_bytes + chunk_bytes > max_pending_bytes:
+                future, done_bytes = pending.popleft()
+                pending_bytes -= done_bytes
+                yield from collect_chunk(future)
+            pending.append((executor.submit(call_chunk, call, chunk, args), chunk_bytes))
+            pending_bytes += chunk_bytes
+        while pending:
+            yield from collect_chunk(pending.popleft()[0])
+
+def split_chunks(file_paths, chunksize, chunk_bytes):
+    """
+    Yield (files, their bytes) chunks of at most chunksize files, cut once they reach chunk_bytes,
+    so that each worker gets a share of the pending bytes and the results come back in small parts.
+    """
+    chunk = []
+    size = 0
+    for file_path in file_paths:
+        chunk.append(file_path)
+        size += file_size(file_path)
+        if len(chunk) >= chunksize or size >= chunk_bytes:
+            yield chunk, size
+            chunk = []
+            size = 0
+    if chunk:
+        yield chunk, size
+
+def call_chunk(call, chunk, args):
+    return [call(file_path, *args) for file_path in chunk]
+
+def collect_chunk(future):
+    for result, records in future.result():
+        metrics.add_records(records)
+        yield result
+
+def file_size(file_path):
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
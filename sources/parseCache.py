@@ -0,0 +1,124 @@
+"""
+On-disk cache of the extracted class info, keyed by the content of the .xml file.
+
+The key is the sha256 of the file content, the extractor variant (which
+extractor module and backend) and EXTRACTOR_VERSION. Entries are stored as
+zlib compressed pickles, one file per entry. The modification time of an
+entry is refreshed on every hit, and evict_cache removes the least recently
+used entries once the cache is bigger than its size cap.
+"""
+import hashlib
+import io
+import mmap
+import os
+import pickle
+import zlib
+
+from sources import mappedInput
+
+# Increase when the extracted info of the same .xml file changes
+EXTRACTOR_VERSION = 6
+
+DEFAULT_CACHE_FOLDER = '.doxygen2drawio_cache'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+CACHE_FILE_SUFFIX = '.bin'
+
+def cache_key(xml_bytes, variant):
+    digest = hashlib.sha256()
+    digest.update(f"{EXTRACTOR_VERSION}:{variant}:".encode('utf-8'))
+    digest.update(xml_bytes)
+    return digest.hexdigest()
+
+def load_entry(cache_folder, key):
+    """
+    Return the cached extracted info of key, or None on a miss.
+    """
+    entry_path = os.path.join(cache_folder, key + CACHE_FILE_SUFFIX)
+    try:
+        with open(entry_path, 'rb') as file:
+            extracted_info = pickle.loads(zlib.decompress(file.read()))
+        # Mark the entry as recently used
+        os.utime(entry_path)
+    except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+        return None
+    return extracted_info
+
+def store_entry(cache_folder, key, extracted_info):
+    entry_path = os.path.join(cache_folder, key + CACHE_FILE_SUFFIX)
+    # Several workers can store the same entry, write to a temporary file and rename it
+    temp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        if not os.path.exists(cache_folder):
+            os.makedirs(cache_folder, exist_ok=True)
+        with open(temp_path, 'wb') as file:
+            file.write(zlib.compress(pickle.dumps(extracted_info, pickle.HIGHEST_PROTOCOL), 1))
+        os.replace(temp_path, entry_path)
+    except OSError as e:
+        print(f"Error writing cache entry {entry_path}: {e}")
+
+def cached_parse(xml_file, parse, variant, cache_folder=DEFAULT_CACHE_FOLDER):
+    """
+    Return parse(xml_file), from the cache when the same content was parsed before.
+
+    Args:
+    - xml_file (str): The .xml file, or its content already read in a BytesIO or mapped in a MappedXml.
+    - parse (callable): The parse function of the extractor, used on a miss.
+    - variant (str): Identifies the extractor and backend, part of the key.
+    - cache_folder (str): The cache folder.
+    """
+    if isinstance(xml_file, io.BytesIO):
+        return load_or_parse(xml_file.getvalue(), xml_file, parse, variant, cache_folder)
+    if isinstance(xml_file, mappedInput.MappedXml):
+        # Hashed straight from the mapping
+        return load_or_parse(xml_file.mapping, xml_file, parse, variant, cache_folder)
+
+    try:
+        with open(xml_file, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # mmap can not map an empty file
+                return load_or_parse(b'', xml_file, parse, variant, cache_folder)
+            # The file is hashed from its mapping and, on a miss, parsed from the same mapping,
+            # so it is read once and never copied into a bytes object
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                return load_or_parse(mapping, mappedInput.MappedXml(mapping, xml_file), parse, variant,
+                                     cache_folder)
+    except (OSError, ValueError) as e:
+        print(f"Error reading {xml_file}: {e}")
+        return None
+
+def load_or_parse(xml_bytes, xml_file, parse, variant, cache_folder):
+    """
+    Return the cached extracted info of xml_bytes, or parse(xml_file) and store it.
+    """
+    key = cache_key(xml_bytes, variant)
+    extracted_info = load_entry(cache_folder, key)
+    if extracted_info is None:
+        extracted_info = parse(xml_file)
+        if extracted_info is not None:
+            store_entry(cache_folder, key, extracted_info)
+    return extracted_info
+
+def evict_cache(cache_folder=DEFAULT_CACHE_FOLDER, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Remove the least recently used entries until the cache holds at most max_bytes.
+    """
+    if not os.path.isdir(cache_folder):
+        return
+    entries = []
+    total_bytes = 0
+    for entry in os.scandir(cache_folder):
+        if entry.is_file() and entry.name.endswith(CACHE_FILE_SUFFIX):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_bytes += stat.st_size
+
+    entries.sort()
+    for _, size, entry_path in entries:
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(entry_path)
+            total_bytes -= size
+        except OSError as e:
+            print(f"Error removing file {entry_path}: {e}")
@@ -0,0 +1,312 @@
+import os
+from functools import partial
+
+from sources import ioPipeline
+from sources import languages
+from sources import manifest
+from sources import mappedInput
+from sources import memberFilter
+from sources import metrics
+from sources import parallel
+from sources import relations
+from sources import renderers
+from sources import txt2drawio
+from sources import xmlExtractor
+from sources import xmlExtractorWithType
+
+def get_extractor(bWithType):
+    return xmlExtractorWithType if bWithType else xmlExtractor
+
+def convert_xml_file(xml_file_path, drawio_folder, bWithType=True, bStreaming=False, text_folder=None,
+                     backend='codeline', cache_folder=None, bPretty=True, bCompressed=False, bSharedStyles=False,
+                     bAutoSize=False, member_filter=None, bMerge=False, formats=None, bSkipEmpty=False):
+    """
+    Convert one Doxygen compound .xml file straight into a .drawio file.
+
+    The extracted class is handed to the diagram generator in memory instead of
+    being written to a .txt file and parsed back.
+
+    Args:
+    - xml_file_path (str): The Doxygen compound .xml file.
+    - drawio_folder (str): The folder of the .drawio file.
+    - bWithType (bool): Show the return and variable types.
+    - bStreaming (bool): Parse the .xml file with iterparse.
+    - text_folder (str): If set, the .txt file is also written in this folder.
+    - backend (str): 'codeline', 'memberdef' or 'index', see xmlExtractorWithType.get_parser.
+    - cache_folder (str): If set, the parse results are kept in this parse cache.
+    - bPretty (bool): Indent the .drawio XML.
+    - bCompressed (bool): Store the .drawio page deflated.
+    - bSharedStyles (bool): Leave out the style keys of the draw.io named styles.
+    - bAutoSize (bool): Fit the class box to its members.
+    - member_filter (MemberFilter): If set, only the selected classes and members are converted, see memberFilter.
+    - bMerge (bool): Update the existing .drawio file instead of overwriting it, see drawioMerge.
+    - formats (list): The output formats, see renderers. The other formats are written next to the .drawio file.
+    - bSkipEmpty (bool): Skip the .xml files without members before parsing them, see mappedInput.
+
+    Returns:
+    - bool: False if the .xml file could not be parsed, or its classes are filtered out or skipped.
+    """
+    entry = extract_class_entry(xml_file_path, bWithType=bWithType, bStreaming=bStreaming, backend=backend,
+                                cache_folder=cache_folder, member_filter=member_filter, bSkipEmpty=bSkipEmpty)
+    if entry is None:
+        return False
+    write_class_files(xml_file_path, entry, drawio_folder, bWithType=bWithType, text_folder=text_folder,
+                      bPretty=bPretty, bCompressed=bCompressed, bSharedStyles=bSharedStyles, bAutoSize=bAutoSize,
+                      bMerge=bMerge, formats=formats)
+    return True
+
+def write_class_files(xml_file_path, entry, drawio_folder, bWithType=True, text_folder=None, bPretty=True,
+                      bCompressed=False, bSharedStyles=False, bAutoSize=False, bMerge=False, formats=None):
+    """
+    Write the .drawio file, or the file of each output format, and the .txt file if text_folder
+    is set, of an entry from extract_class_entry. The arguments are the same as convert_xml_file.
+    """
+    (class_name, member_funcs, member_vars), extracted_info = entry
+
+    extractor = get_extractor(bWithType)
+    txt_file_name = extractor.format_file_name(os.path.basename(xml_file_path))
+    if text_folder is not None:
+        extractor.create_text_file(os.path.join(text_folder, txt_file_name),
+                                   extractor.render_class_lines(extracted_info))
+
+    output_file_path = os.path.join(drawio_folder, txt2drawio.diagram_file_name(txt_file_name))
+    for renderer in renderers.make_renderers(formats, bPretty=bPretty, bCompressed=bCompressed,
+                                             bSharedStyles=bSharedStyles, bAutoSize=bAutoSize, bMerge=bMerge):
+        renderer.write_class(class_name, member_funcs, member_vars, renderer.output_path(output_file_path))
+
+def get_class_model(extractor, extracted_info):
+    """
+    Return the (class_name, member_funcs, member_vars) model of an extracted class,
+    the same model as txt2drawio.extract_class_info reads back from a .txt file.
+    """
+    class_name = languages.strip_source_extension(str(extracted_info["class_name"]))
+    member_funcs, member_vars = extractor.get_sorted_member_info(extracted_info)
+    return class_name, member_funcs, member_vars
+
+def namespaced_class_model(class_model, extracted_info):
+    """
+    Return the class model named after its namespace, e.g. 'Game::Player', for the pages of
+    bPagePerNamespace. The codeline backend names a class after its file, the namespace is the
+    one of the first class declared in the file; the memberdef names are already qualified.
+    """
+    class_name, member_funcs, member_vars = class_model
+    namespace = extracted_info.get("namespace")
+    if not namespace or '::' in class_name:
+        return class_model
+    return f"{namespace}::{class_name}", member_funcs, member_vars
+
+def extract_class_model(xml_file_path, bWithType=True, bStreaming=False, backend='codeline', cache_folder=None,
+                        member_filter=None, bSkipEmpty=False):
+    """
+    Parse one compound .xml file and return its class model, or None if it can not be parsed.
+    """
+    entry = extract_class_entry(xml_file_path, bWithType=bWithType, bStreaming=bStreaming, backend=backend,
+                                cache_folder=cache_folder, member_filter=member_filter, bSkipEmpty=bSkipEmpty)
+    return entry[0] if entry is not None else None
+
+def extract_class_entry(xml_file_path, bWithType=True, bStreaming=False, backend='codeline', cache_folder=None,
+                        member_filter=None, bSkipEmpty=False):
+    """
+    Parse one compound .xml file and return (class model, extracted info), or None
+    if it can not be parsed. The extracted info holds the refids used by relations.
+    xml_file_path can also be the content of the file, see ioPipeline.XmlBytes.
+    """
+    extractor = get_extractor(bWithType)
+    extracted_info = extractor.get_parser(bStreaming=bStreaming, backend=backend, cache_folder=cache_folder,
+                                          member_filter=member_filter, bSkipEmpty=bSkipEmpty)(xml_file_path)
+    if extracted_info is None:
+        return None
+    return get_class_model(extractor, extracted_info), extracted_info
+
+def prepare_folder(folder_path, bIncremental):
+    if not os.path.exists(folder_path):
+        os.makedirs(folder_path)
+    elif not bIncremental:
+        xmlExtractorWithType.clear_results_folder(folder_path)
+
+def diagram_file_name_for_xml(xml_file_name):
+    return txt2drawio.diagram_file_name(xmlExtractorWithType.format_file_name(xml_file_name))
+
+def output_file_names_for_xml(xml_file_name, formats=None):
+    return renderers.output_file_names(diagram_file_name_for_xml(xml_file_name), formats)
+
+def manifest_settings(bWithType=True, backend='codeline', bPretty=True, bCompressed=False, bSharedStyles=False,
+                      bAutoSize=False, member_filter=None, formats=None, bSkipEmpty=False):
+    """
+    Return the settings of the manifest of a drawio folder written from the .xml files,
+    by convert_xml_folder or by the watcher, so that either can continue the other's build.
+    """
+    return mappedInput.prescan_settings(renderers.format_settings(memberFilter.filter_settings(
+        {"bWithType": bWithType, "sub_width": txt2drawio.sub_width, "backend": backend, "bPretty": bPretty,
+         "bCompressed": bCompressed, "bSharedStyles": bSharedStyles, "bAutoSize": bAutoSize}, member_filter),
+        formats), bSkipEmpty)
+
+def convert_xml_folder(xml_folder, drawio_folder, *, bWithType=True, bStreaming=False,
+                       workers=1, bIncremental=False, text_folder=None, backend='codeline', cache_folder=None,
+                       bPretty=True, bCompressed=False, bSharedStyles=False, bAutoSize=False, namespaces=None,
+                       class_names=None, bPipelined=False, io_threads=4, queue_size=64, member_filter=None,
+                       bMerge=False, formats=None, bSkipEmpty=False, memory_limit=None):
+    """
+    Convert every compound .xml file of a folder into .drawio files in one pass.
+
+    Args:
+    - xml_folder (str): The folder of the Doxygen .xml files.
+    - drawio_folder (str): The folder of the .drawio files.
+    - bWithType (bool): Show the return and variable types.
+    - bStreaming (bool): Parse the .xml files with iterparse.
+    - workers (int): The number of worker processes.
+    - bIncremental (bool): Only convert the .xml files which changed since the last run.
+    - text_folder (str): If set, the .txt files are also written in this folder.
+    - backend (str): 'codeline', 'memberdef' or 'index', see xmlExtractorWithType.get_parser.
+    - cache_folder (str): If set, the parse results are kept in this parse cache.
+    - bPretty (bool): Indent the .drawio XML.
+    - bCompressed (bool): Store the .drawio pages deflated.
+    - bSharedStyles (bool): Leave out the style keys of the draw.io named styles.
+    - bAutoSize (bool): Fit the class boxes to their members.
+    - namespaces (list): With the 'index' backend, only convert the classes of these namespaces.
+    - class_names (list): With the 'index' backend, only convert these classes.
+    - bPipelined (bool): Overlap the reads, the parsing and the writes in threads
+      instead of using worker processes, see ioPipeline.
+    - io_threads (int): With bPipelined, the number of reading and of writing threads.
+    - queue_size (int): With bPipelined, the most files waiting between two stages.
+    - member_filter (MemberFilter): If set, only the selected classes and members are converted, see memberFilter.
+    - bMerge (bool): Update the existing .drawio files instead of overwriting them, see drawioMerge.
+    - formats (list): The output formats, see renderers. The other formats are written in drawio_folder too.
+    - bSkipEmpty (bool): Skip the .xml files without members before parsing them, see mappedInput.
+    - memory_limit (int): With workers, the most bytes of .xml files sent to the worker processes and not
+      finished yet, see parallel.iter_files. None sends them all at once.
+    """
+    # In merge mode the existing diagrams are updated instead of cleared
+    prepare_folder(drawio_folder, bIncremental or bMerge)
+    if text_folder is not None:
+        prepare_folder(text_folder, bIncremental)
+
+    all_xml_file_names = xmlExtractorWithType.list_xml_files(xml_folder, backend, namespaces, class_names)
+    # Read before the plan replaces it, the texts of the deleted sources are found from it
+    old_files = manifest.load_manifest(drawio_folder).get("files", {}) if bIncremental else {}
+    xml_file_names, new_manifest = manifest.plan_incremental_build(
+        xml_folder, all_xml_file_names, drawio_folder,
+        partial(output_file_names_for_xml, formats=formats),
+        manifest_settings(bWithType=bWithType, backend=backend, bPretty=bPretty, bCompressed=bCompressed,
+                          bSharedStyles=bSharedStyles, bAutoSize=bAutoSize, member_filter=member_filter,
+                          formats=formats, bSkipEmpty=bSkipEmpty),
+        bIncremental, io_threads if bPipelined else 1)
+
+    file_paths = [os.path.join(xml_folder, file_name) for file_name in xml_file_names]
+    if bPipelined:
+        stages = [
+            ioPipeline.Stage('read', ioPipeline.read_xml_file, io_threads, ioPipeline.xml_size),
+            ioPipeline.Stage('parse', partial(parse_xml_bytes, bWithType=bWithType, bStreaming=bStreaming,
+                                              backend=backend, cache_folder=cache_folder,
+                                              member_filter=member_filter, bSkipEmpty=bSkipEmpty)),
+            ioPipeline.Stage('write', partial(write_parsed_class, drawio_folder=drawio_folder, bWithType=bWithType,
+                                              text_folder=text_folder, bPretty=bPretty, bCompressed=bCompressed,
+                                              bSharedStyles=bSharedStyles, bAutoSize=bAutoSize, bMerge=bMerge,
+                                              formats=formats),
+                            io_threads)
+        ]
+        written_paths = []
+        elapsed = ioPipeline.run_stages(file_paths, stages, queue_size, written_paths)
+        built_names = [os.path.basename(xml_file_path) for xml_file_path in written_paths]
+        # Quiet by default, like the other steps
+        if metrics.bVerbose or metrics.bEnabled:
+            ioPipeline.print_stage_stats(stages, elapsed)
+    else:
+        # The workers write the files, only whether each one was written comes back
+        results = parallel.iter_files(convert_xml_file, file_paths, workers, max_pending_bytes=memory_limit,
+                                      drawio_folder=drawio_folder, bWithType=bWithType, bStreaming=bStreaming,
+                                      text_folder=text_folder, backend=backend, cache_folder=cache_folder,
+                                      bPretty=bPretty, bCompressed=bCompressed, bSharedStyles=bSharedStyles,
+                                      bAutoSize=bAutoSize, member_filter=member_filter, bMerge=bMerge,
+                                      formats=formats, bSkipEmpty=bSkipEmpty)
+        built_names = [xml_file_name for xml_file_name, bWritten in zip(xml_file_names, results) if bWritten]
+
+    manifest.save_build_manifest(drawio_folder, new_manifest, xml_file_names, built_names)
+    if bIncremental and text_folder is not None:
+        # The texts folder has no manifest, its files go the same way as the diagrams: those of the
+        # deleted sources, and those of the sources which wrote nothing
+        format_file_name = xmlExtractorWithType.format_file_name
+        manifest.remove_deleted_outputs(
+            text_folder, {xml_file_name: {"output": format_file_name(xml_file_name)} for xml_file_name in old_files},
+            {xml_file_name: format_file_name(xml_file_name) for xml_file_name in all_xml_file_names})
+        for xml_file_name in set(xml_file_names).difference(built_names):
+            manifest.remove_file(os.path.join(text_folder, format_file_name(xml_file_name)))
+
+def parse_xml_bytes(xml_bytes, bWithType=True, bStreaming=False, backend='codeline', cache_folder=None,
+                    member_filter=None, bSkipEmpty=False):
+    """
+    The parse stage of the pipelined convert_xml_folder: returns (xml file path, entry),
+    or None if the file can not be parsed.
+    """
+    entry = extract_class_entry(xml_bytes, bWithType=bWithType, bStreaming=bStreaming, backend=backend,
+                                cache_folder=cache_folder, member_filter=member_filter, bSkipEmpty=bSkipEmpty)
+    return (xml_bytes.name, entry) if entry is not None else None
+
+def write_parsed_class(parsed_class, drawio_folder, **options):
+    """
+    The write stage of the pipelined convert_xml_folder, see write_class_files.
+    """
+    xml_file_path, entry = parsed_class
+    write_class_files(xml_file_path, entry, drawio_folder, **options)
+    return xml_file_path
+
+def convert_xml_folder_to_single_file(xml_folder, output_file_path, *, bWithType=True, bStreaming=False,
+                                      workers=1, bPagePerNamespace=False, bRelations=False, backend='codeline',
+                                      cache_folder=None, bPretty=True, bCompressed=False, bSharedStyles=False,
+                                      bAutoSize=False, namespaces=None, class_names=None, member_filter=None,
+                                      bMerge=False, formats=None, bSkipEmpty=False, memory_limit=None):
+    """
+    Convert every compound .xml file of a folder into one .drawio file holding all the classes.
+
+    With several output formats the classes are parsed once and handed to each renderer.
+
+    Args:
+    - xml_folder (str): The folder of the Doxygen .xml files.
+    - output_file_path (str): The path of the .drawio file.
+    - bWithType (bool): Show the return and variable types.
+    - bStreaming (bool): Parse the .xml files with iterparse.
+    - workers (int): The number of worker processes used for parsing.
+    - bPagePerNamespace (bool): Put the classes of each namespace on their own page.
+    - bRelations (bool): Draw inheritance and association edges between the classes.
+    - backend (str): 'codeline', 'memberdef' or 'index', see xmlExtractorWithType.get_parser.
+    - cache_folder (str): If set, the parse results are kept in this parse cache.
+    - bPretty (bool): Indent the .drawio XML.
+    - bCompressed (bool): Store the .drawio pages deflated.
+    - bSharedStyles (bool): Leave out the style keys of the draw.io named styles.
+    - bAutoSize (bool): Fit the class boxes to their members, so they are packed tightly.
+    - namespaces (list): With the 'index' backend, only convert the classes of these namespaces.
+    - class_names (list): With the 'index' backend, only convert these classes.
+    - member_filter (MemberFilter): If set, only the selected classes and members are converted, see memberFilter.
+    - bMerge (bool): Update the existing .drawio file, keeping the boxes where they were moved, see drawioMerge.
+    - formats (list): The output formats, see renderers. The other formats get the path of the .drawio file
+      with their extension.
+    - bSkipEmpty (bool): Skip the .xml files without members before parsing them, see mappedInput.
+    - memory_limit (int): With workers, the most bytes of .xml files sent to the worker processes and not
+      finished yet, see parallel.iter_files. None sends them all at once.
+    """
+    output_folder = os.path.dirname(output_file_path)
+    if output_folder and not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+
+    file_paths = [os.path.join(xml_folder, file_name)
+                  for file_name in xmlExtractorWithType.list_xml_files(xml_folder, backend, namespaces, class_names)]
+    # The boxes are packed on one grid, so every class model is kept, but the
+    # extracted info is only kept for the relations
+    class_models = []
+    all_extracted_info = []
+    for entry in parallel.iter_files(extract_class_entry, file_paths, workers, max_pending_bytes=memory_limit,
+                                     bWithType=bWithType, bStreaming=bStreaming, backend=backend,
+                                     cache_folder=cache_folder, member_filter=member_filter, bSkipEmpty=bSkipEmpty):
+        if entry is not None:
+            class_models.append(namespaced_class_model(*entry) if bPagePerNamespace else entry[0])
+            if bRelations:
+                all_extracted_info.append(entry[1])
+
+    edges = None
+    if bRelations:
+        edges = relations.resolve_edges(all_extracted_info, relations.build_refid_index(all_extracted_info))
+
+    for renderer in renderers.make_renderers(formats, bPretty=bPretty, bCompressed=bCompressed,
+                                             bSharedStyles=bSharedStyles, bAutoSize=bAutoSize, bMerge=bMerge,
+                                             bPagePerNamespace=bPagePerNamespace):
+        renderer.write_classes(class_models, renderer.output_path(output_file_path), edges)
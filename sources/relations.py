@@ -0,0 +1,80 @@
+"""
+Inheritance and association edges between the parsed classes.
+
+The extractors record the refids found in each compound (see the add_* functions).
+The refids are the keys of dicts, used as sets which keep the order the refids were
+found in, so recording a refid again is a single lookup whatever the number of refs.
+build_refid_index maps every class refid to its class once, so resolving an edge is
+a single dictionary lookup.
+"""
+
+def add_innerclass(innerclass, extracted_info):
+    """
+    Record the refid of a class declared in a file compound (<innerclass refid=...>),
+    and the namespace of the first one: 'Game' for <innerclass>Game::Player</innerclass>,
+    '' for a class outside of any namespace.
+    """
+    refid = innerclass.get("refid")
+    if refid:
+        extracted_info["refids"][refid] = None
+    if extracted_info.get("namespace") is None:
+        namespace, _, _ = (innerclass.text or '').strip().rpartition('::')
+        extracted_info["namespace"] = namespace
+
+def add_compound_codeline(codeline, extracted_info):
+    """
+    Record the refids of a class declaration line (refkind="compound").
+    The codeline refid is the declared class, the other compound refs of the line are its base classes.
+    """
+    class_refid = codeline.get("refid")
+    if not class_refid or class_refid.startswith("namespace"):
+        return
+    extracted_info["refids"][class_refid] = None
+
+    for ref in codeline.iter("ref"):
+        refid = ref.get("refid")
+        if ref.get("kindref") == "compound" and refid != class_refid:
+            extracted_info["base_refids"][refid] = None
+
+def add_member_type_refs(codeline, extracted_info):
+    """
+    Record the classes referenced by the type or the parameters of a member line.
+    """
+    member_refid = codeline.get("refid")
+    for ref in codeline.iter("ref"):
+        refid = ref.get("refid")
+        if ref.get("kindref") == "compound" and refid != member_refid:
+            extracted_info["type_refids"][refid] = None
+
+def build_refid_index(all_extracted_info):
+    """
+    Map every class refid to the position of its class in all_extracted_info.
+    """
+    refid_index = {}
+    for position, extracted_info in enumerate(all_extracted_info):
+        for refid in extracted_info.get("refids", ()):
+            refid_index.setdefault(refid, position)
+    return refid_index
+
+def resolve_edges(all_extracted_info, refid_index):
+    """
+    Resolve the recorded refids into edges between known classes.
+
+    Args:
+    - all_extracted_info (list): The extracted info of every class.
+    - refid_index (dict): The index returned by build_refid_index.
+
+    Returns:
+    - list: (source position, target position, kind) tuples, kind is 'inheritance' or 'association'.
+      A pair of classes gets at most one edge, inheritance wins over association.
+    """
+    edges = []
+    for source, extracted_info in enumerate(all_extracted_info):
+        linked = {source}
+        for kind, key in (('inheritance', "base_refids"), ('association', "type_refids")):
+            for refid in extracted_info.get(key, ()):
+                target = refid_index.get(refid)
+                if target is not None and target not in linked:
+                    linked.add(target)
+                    edges.append((source, target, kind))
+    return edges
@@ -0,0 +1,262 @@
+"""
+Output formats of the class diagrams.
+
+A renderer writes the class models, (class_name, member_funcs, member_vars)
+tuples, either one class per file or all the classes and their edges in one
+file. Besides draw.io there are three text formats, which take a few lines per
+class, are much faster to write than the draw.io XML and can be diffed:
+- plantuml: a PlantUML class diagram (.puml)
+- mermaid: a Mermaid classDiagram (.mmd)
+- json: the class model itself (.json)
+
+The renderers of several formats are given the same parsed classes, so every
+format comes out of a single parse.
+"""
+import abc
+import io
+import json
+import os
+import re
+
+from sources import drawioWriter
+from sources import metrics
+from sources import txt2drawio
+
+DEFAULT_FORMATS = ['drawio']
+
+IDENTIFIER_PATTERN = re.compile(r'\W')
+
+def class_aliases(classes):
+    """
+    Return an identifier for each class, e.g. 'Game::Player' -> 'Game_Player'.
+    The text formats need one because a class name can hold '::', '<' or spaces.
+    """
+    aliases = []
+    used = set()
+    for class_name, _, _ in classes:
+        alias = IDENTIFIER_PATTERN.sub('_', class_name) or '_'
+        if alias[0].isdigit():
+            alias = '_' + alias
+        unique_alias = alias
+        number = 2
+        while unique_alias in used:
+            unique_alias = f"{alias}_{number}"
+            number += 1
+        used.add(unique_alias)
+        aliases.append(unique_alias)
+    return aliases
+
+class Renderer(abc.ABC):
+    """
+    Base class of the output formats. The text formats only implement render.
+    """
+    name = None
+    extension = None
+
+    def output_path(self, drawio_file_path):
+        """
+        Return the path of the output of this format next to a .drawio file path.
+        """
+        return os.path.splitext(drawio_file_path)[0] + self.extension
+
+    def write_class(self, class_name, member_funcs, member_vars, output_file_path):
+        """
+        Write the diagram of one class.
+        """
+        self.write_classes([(class_name, member_funcs, member_vars)], output_file_path)
+
+    def write_classes(self, classes, output_file_path, edges=None):
+        """
+        Write the diagram of many classes, edges are (source, target, kind) tuples from relations.resolve_edges.
+        """
+        with metrics.span('render', output_file_path) as counts:
+            # The parts go through the file buffer as they are rendered, the whole text is never built
+            size = 0
+            try:
+                with open(output_file_path, 'w', encoding='utf-8', buffering=drawioWriter.WRITE_BUFFER_SIZE) as file:
+                    for part in self.render(classes, edges):
+                        file.write(part)
+                        size += len(part)
+            except IOError as e:
+                print(f"Error creating file '{output_file_path}': {e}")
+                return
+            counts['bytes_written'] = size
+        metrics.verbose_print(f"File '{output_file_path}' created successfully.")
+
+    @abc.abstractmethod
+    def render(self, classes, edges=None):
+        """
+        Return the parts of the text of the file.
+        """
+
+class DrawioRenderer(Renderer):
+    """
+    The draw.io diagrams of txt2drawio, with its options.
+    """
+    name = 'drawio'
+    extension = '.drawio'
+
+    def __init__(self, bPretty=True, bCompressed=False, bSharedStyles=False, bAutoSize=False, bMerge=False,
+                 bPagePerNamespace=False):
+        self.bPretty = bPretty
+        self.bCompressed = bCompressed
+        self.bSharedStyles = bSharedStyles
+        self.bAutoSize = bAutoSize
+        self.bMerge = bMerge
+        self.bPagePerNamespace = bPagePerNamespace
+
+    def output_path(self, drawio_file_path):
+        return drawio_file_path
+
+    def write_class(self, class_name, member_funcs, member_vars, output_file_path):
+        txt2drawio.create_class_diagram_from_model(class_name, member_funcs, member_vars, output_file_path,
+                                                   bPretty=self.bPretty, bCompressed=self.bCompressed,
+                                                   bSharedStyles=self.bSharedStyles, bAutoSize=self.bAutoSize,
+                                                   bMerge=self.bMerge)
+
+    def write_classes(self, classes, output_file_path, edges=None):
+        txt2drawio.create_multi_class_diagram(classes, output_file_path, bPagePerNamespace=self.bPagePerNamespace,
+                                              edges=edges, bPretty=self.bPretty, bCompressed=self.bCompressed,
+                                              bSharedStyles=self.bSharedStyles, bAutoSize=self.bAutoSize,
+                                              bMerge=self.bMerge)
+
+    def render(self, classes, edges=None):
+        # The text of a new file, only write_classes merges into an existing one
+        text = io.StringIO()
+        txt2drawio.create_multi_class_diagram(classes, text, bPagePerNamespace=self.bPagePerNamespace, edges=edges,
+                                              bPretty=self.bPretty, bCompressed=self.bCompressed,
+                                              bSharedStyles=self.bSharedStyles, bAutoSize=self.bAutoSize)
+        yield text.getvalue()
+
+class PlantUmlRenderer(Renderer):
+    """
+    A PlantUML class diagram, the members are written as in the class boxes of draw.io.
+    """
+    name = 'plantuml'
+    extension = '.puml'
+
+    # source is the derived class, target its base class or the class it uses
+    EDGE_ARROWS = {'inheritance': "{target} <|-- {source}", 'association': "{source} ..> {target}"}
+
+    def render(self, classes, edges=None):
+        aliases = class_aliases(classes)
+        yield "@startuml\n"
+        for (class_name, member_funcs, member_vars), alias in zip(classes, aliases):
+            if not member_funcs and not member_vars:
+                yield f"class \"{class_name}\" as {alias}\n"
+                continue
+            yield f"class \"{class_name}\" as {alias} {{\n"
+            for member in list(member_vars) + list(member_funcs):
+                yield f"  {self.member_line(member)}\n"
+            yield "}\n"
+        for source, target, kind in edges or ():
+            yield self.EDGE_ARROWS[kind].format(source=aliases[source], target=aliases[target]) + "\n"
+        yield "@enduml\n"
+
+    @staticmethod
+    def member_line(member):
+        # PlantUML reads the access specifier only when the name follows it directly
+        text = f"{member.access}{member.name}{member.arguments}"
+        return text if member.type_name is None else f"{text} : {member.type_name}"
+
+class MermaidRenderer(Renderer):
+    """
+    A Mermaid classDiagram. Mermaid writes the generic types with '~', e.g. List~int~,
+    the type of a variable before its name and the return type after the parameters.
+    """
+    name = 'mermaid'
+    extension = '.mmd'
+
+    EDGE_ARROWS = {'inheritance': "{target} <|-- {source}", 'association': "{source} ..> {target}"}
+    GENERIC_TABLE = str.maketrans('<>', '~~')
+
+    def render(self, classes, edges=None):
+        aliases = class_aliases(classes)
+        yield "classDiagram\n"
+        for (class_name, member_funcs, member_vars), alias in zip(classes, aliases):
+            label = f"[\"{class_name}\"]" if alias != class_name else ""
+            if not member_funcs and not member_vars:
+                yield f"    class {alias}{label}\n"
+                continue
+            yield f"    class {alias}{label} {{\n"
+            for member in member_vars:
+                yield f"        {self.variable_line(member)}\n"
+            for member in member_funcs:
+                yield f"        {self.function_line(member)}\n"
+            yield "    }\n"
+        for source, target, kind in edges or ():
+            yield "    " + self.EDGE_ARROWS[kind].format(source=aliases[source], target=aliases[target]) + "\n"
+
+    def variable_line(self, member):
+        if member.type_name is None:
+            return f"{member.access}{member.name}"
+        return f"{member.access}{member.type_name.translate(self.GENERIC_TABLE)} {member.name}"
+
+    def function_line(self, member):
+        text = f"{member.access}{member.name}{member.arguments.translate(self.GENERIC_TABLE)}"
+        return text if member.type_name is None else f"{text} {member.type_name.translate(self.GENERIC_TABLE)}"
+
+class JsonRenderer(Renderer):
+    """
+    The class model as JSON: {"classes": [{"name", "functions", "variables"}], "edges": [...]},
+    each member as {"access", "name", "arguments", "type"}. The edges are only written with many classes.
+    Each class and each edge takes one line, so the files diff well and are written by the C encoder
+    of the json module, which indent would turn off.
+    """
+    name = 'json'
+    extension = '.json'
+
+    def render(self, classes, edges=None):
+        yield '{"classes": ['
+        yield from self.lines({"name": class_name,
+                               "functions": [self.member_record(member) for member in member_funcs],
+                               "variables": [self.member_record(member) for member in member_vars]}
+                              for class_name, member_funcs, member_vars in classes)
+        if edges is not None:
+            yield '],\n"edges": ['
+            yield from self.lines({"source": classes[source][0], "target": classes[target][0], "kind": kind}
+                                  for source, target, kind in edges)
+        yield "]}\n"
+
+    @staticmethod
+    def lines(records):
+        separator = "\n"
+        for record in records:
+            yield separator + json.dumps(record)
+            separator = ",\n"
+
+    @staticmethod
+    def member_record(member):
+        return {"access": member.access, "name": member.name, "arguments": member.arguments,
+                "type": member.type_name}
+
+RENDERERS = {renderer.name: renderer for renderer in (DrawioRenderer, PlantUmlRenderer, MermaidRenderer, JsonRenderer)}
+FORMATS = list(RENDERERS)
+
+def make_renderers(formats=None, **drawio_options):
+    """
+    Return a renderer for each format, in order and without repeats.
+
+    Args:
+    - formats (list): Names of RENDERERS, None for DEFAULT_FORMATS.
+    - drawio_options: The options of DrawioRenderer.
+    """
+    return [RENDERERS[name](**drawio_options) if name == DrawioRenderer.name else RENDERERS[name]()
+            for name in dict.fromkeys(formats or DEFAULT_FORMATS)]
+
+def output_file_names(drawio_file_name, formats=None):
+    """
+    Return the name of the output of drawio_file_name, or the list of the names of
+    the outputs of each format if there are other formats than draw.io.
+    """
+    if not formats or list(formats) == DEFAULT_FORMATS:
+        return drawio_file_name
+    return [renderer.output_path(drawio_file_name) for renderer in make_renderers(formats)]
+
+def format_settings(settings, formats):
+    """
+    Add the formats to the settings of a manifest, when they are not the default ones.
+    """
+    if formats and list(formats) != DEFAULT_FORMATS:
+        settings["formats"] = list(dict.fromkeys(formats))
+    return settings
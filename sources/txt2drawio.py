@@ -1,143 +1,383 @@
-import xml.etree.ElementTree as ET
+import hashlib
+import itertools
+import math
 import os
 import shutil
 
+from sources import classModel
+from sources import drawioWriter
+from sources import languages
+from sources import layout
+from sources import manifest
+from sources import metrics
+from sources import parallel
+
 sub_width = '500'
 
+# Heights of the rows of a class box
+HEADER_HEIGHT = 26
+MEMBER_HEIGHT = 26
+SEPARATOR_HEIGHT = 8
+# Auto-sized boxes are at least this wide, and their width is rounded up to the grid
+MIN_BOX_WIDTH = 120
+GRID_SIZE = 10
+# spacingLeft + spacingRight of the member rows plus a margin, and the room around the bold title
+MEMBER_PADDING = 16
+TITLE_PADDING = 40
+
+# Styles of the cells of a class box
+CLASS_BOX_STYLE = 'swimlane;fontStyle=1;align=center;verticalAlign=top;childLayout=stackLayout;horizontal=1;startSize=26;horizontalStack=0;resizeParent=1;resizeParentMax=0;resizeLast=0;collapsible=1;marginBottom=0;whiteSpace=wrap;html=1;'
+MEMBER_STYLE = 'text;strokeColor=none;fillColor=none;align=left;verticalAlign=top;spacingLeft=4;spacingRight=4;overflow=hidden;rotatable=0;points=[[0,0.5],[1,0.5]];portConstraint=eastwest;whiteSpace=wrap;html=1;'
+SEPARATOR_STYLE = 'line;strokeWidth=1;fillColor=none;align=left;verticalAlign=middle;spacingTop=-1;spacingLeft=3;spacingRight=3;rotatable=0;labelPosition=right;points=[];portConstraint=eastwest;strokeColor=inherit;'
+
 # XML 구조 정의
-def create_class_diagram(file_path, output_folder):
-    def indent(elem, level=0):
-        """Recursively indent XML elements for pretty printing"""
-        i = "\n" + level * "  "
-        if len(elem):
-            if not elem.text or not elem.text.strip():
-                elem.text = i + "  "
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-            for elem in elem:
-                indent(elem, level + 1)
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-        else:
-            if level and (not elem.tail or not elem.tail.strip()):
-                elem.tail = i
-
-    # XML의 루트 요소 생성
-    mxfile = ET.Element('mxfile', {
-        'host': 'Electron',
-        'agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) draw.io/24.7.5 Chrome/126.0.6478.183 Electron/31.3.0 Safari/537.36',
-        'version': '24.7.5'
-    })
-
-    # 다이어그램 요소 생성
-    diagram = ET.SubElement(mxfile, 'diagram', {
-        'id': 'C5RBs43oDa-KdzZeNtuy',
-        'name': 'Page-1'
-    })
-
-    # mxGraphModel 요소 생성
-    mxGraphModel = ET.SubElement(diagram, 'mxGraphModel', {
-        'dx': '516',
-        'dy': '494',
-        'grid': '1',
-        'gridSize': '10',
-        'guides': '1',
-        'tooltips': '1',
-        'connect': '1',
-        'arrows': '1',
-        'fold': '1',
-        'page': '1',
-        'pageScale': '1',
-        'pageWidth': '827',
-        'pageHeight': '1169',
-        'math': '0',
-        'shadow': '0'
-    })
-
-    # root 요소 생성
-    root = ET.SubElement(mxGraphModel, 'root')
-    ET.SubElement(root, 'mxCell', {'id': '0'})
-    ET.SubElement(root, 'mxCell', {'id': '1', 'parent': '0'})
-
-    class_name, member_funcs, member_vars = extract_class_info(file_path)
+def create_class_diagram(file_path, output_folder, bPretty=True, bCompressed=False, bSharedStyles=False,
+                         bAutoSize=False, bMerge=False):
+    with metrics.span('read_text', file_path) as counts:
+        class_name, member_funcs, member_vars = extract_class_info(file_path)
+        counts['members'] = len(member_funcs) + len(member_vars)
+
+    output_file_name = diagram_file_name(file_path)
+    output_file_path = os.path.join(output_folder, output_file_name)
+
+    create_class_diagram_from_model(class_name, member_funcs, member_vars, output_file_path, bPretty=bPretty,
+                                    bCompressed=bCompressed, bSharedStyles=bSharedStyles, bAutoSize=bAutoSize,
+                                    bMerge=bMerge)
+
+def create_class_diagram_from_model(class_name, member_funcs, member_vars, output_file_path, bPretty=True,
+                                    bCompressed=False, bSharedStyles=False, bAutoSize=False, bMerge=False):
+    """
+    Write the class diagram of one class without going through a .txt file.
+
+    The cells are streamed to the file by drawioWriter.
+
+    Args:
+    - class_name (str): The name shown in the class box.
+    - member_funcs (list): The member functions (classModel.Member), shown as e.g. "+ Foo(int x) : void".
+    - member_vars (list): The member variables (classModel.Member), shown as e.g. "- bar : int".
+    - output_file_path (str): The path of the .drawio file.
+    - bPretty (bool): Indent the XML.
+    - bCompressed (bool): Store the page deflated, see drawioWriter.
+    - bSharedStyles (bool): Leave out the style keys of the draw.io named styles.
+    - bAutoSize (bool): Fit the class box to its members, see class_box_size.
+    - bMerge (bool): Use stable cell ids, and if the file exists only update the cells of the members
+      which changed, see drawioMerge.
+    """
+    if bMerge and os.path.exists(output_file_path):
+        from sources import drawioMerge
+        if drawioMerge.merge_diagram(output_file_path, [(class_name, member_funcs, member_vars)],
+                                     bCompressed=bCompressed, bSharedStyles=bSharedStyles,
+                                     bAutoSize=bAutoSize) is not None:
+            return
+
+    with metrics.span('diagram', output_file_path) as counts:
+        size = class_box_size(member_funcs, member_vars, class_name, bAutoSize)
+        cell_ids = stable_cell_ids(class_name, member_funcs, member_vars) if bMerge else None
+        box_hash = source_hash(member_funcs, member_vars) if bMerge else None
+        with drawioWriter.DrawioWriter(output_file_path, bPretty, bCompressed, bSharedStyles) as writer:
+            writer.start_diagram()
+            writer.write_cells(class_cells(class_name, member_funcs, member_vars, size=size, cell_ids=cell_ids,
+                                           source_hash=box_hash))
+            writer.end_diagram()
+        counts['bytes_written'] = writer.bytes_written
+
+def create_multi_class_diagram(classes, output_file_path, bPagePerNamespace=False, edges=None, bPretty=True,
+                               bCompressed=False, bSharedStyles=False, bAutoSize=False, bMerge=False):
+    """
+    Write many classes into a single .drawio file.
+
+    The class boxes are placed with layout.pack_boxes, either all on one page or
+    on one page per namespace. Cell ids are unique in the whole file.
+
+    Args:
+    - classes (list): (class_name, member_funcs, member_vars) tuples.
+    - output_file_path (str): The path of the .drawio file.
+    - bPagePerNamespace (bool): Put the classes of each namespace on their own page.
+    - edges (list): (source, target, kind) tuples from relations.resolve_edges, where
+      source and target are positions in classes. Edges across pages are dropped.
+    - bPretty (bool): Indent the XML.
+    - bCompressed (bool): Store the pages deflated, see drawioWriter.
+    - bSharedStyles (bool): Leave out the style keys of the draw.io named styles.
+    - bAutoSize (bool): Fit each class box to its members, so the boxes are packed tightly.
+    - bMerge (bool): Use stable cell ids, and if the file exists keep its boxes where they are and only
+      update the cells which changed, see drawioMerge.
+    """
+    if bMerge and os.path.exists(output_file_path):
+        from sources import drawioMerge
+        if drawioMerge.merge_diagram(output_file_path, classes, edges, bPagePerNamespace=bPagePerNamespace,
+                                     bCompressed=bCompressed, bSharedStyles=bSharedStyles,
+                                     bAutoSize=bAutoSize) is not None:
+            return
+
+    if bPagePerNamespace:
+        pages = {}
+        for position, class_model in enumerate(classes):
+            pages.setdefault(get_namespace(class_model[0]), []).append(position)
+        pages = sorted(pages.items())
+    else:
+        pages = [('Page-1', list(range(len(classes))))]
+
+    edges_by_source = {}
+    for source, target, kind in edges or ():
+        edges_by_source.setdefault(source, []).append((target, kind))
+
+    with metrics.span('diagram', output_file_path) as counts:
+        with drawioWriter.DrawioWriter(output_file_path, bPretty, bCompressed, bSharedStyles) as writer:
+            write_class_pages(writer, classes, pages, edges_by_source, bAutoSize, bMerge)
+        counts['bytes_written'] = writer.bytes_written
+
+def write_class_pages(writer, classes, pages, edges_by_source, bAutoSize=False, bStableIds=False):
+    """
+    Write the pages of create_multi_class_diagram, pages are (page name, positions in classes).
+    With bStableIds the cells get the ids of stable_cell_ids instead of counting up, and the boxes their source_hash.
+    """
+    cell_id = 0
+    for page_index, (page_name, positions) in enumerate(pages):
+        diagram_id = 'C5RBs43oDa-KdzZeNtuy' if page_index == 0 else f'C5RBs43oDa-KdzZeNtuy-{page_index}'
+        # The first page keeps the usual '0' and '1' root cells, the others continue the numbering
+        root_id, layer_id = page_cell_ids(page_name) if bStableIds and page_index else (str(cell_id),
+                                                                                        str(cell_id + 1))
+        writer.start_diagram(diagram_id, page_name, root_id, layer_id)
+        cell_id += 2
+
+        sizes = [class_box_size(classes[position][1], classes[position][2], classes[position][0], bAutoSize)
+                 for position in positions]
+        box_ids = {}
+        for position, size, (x, y) in zip(positions, sizes, layout.pack_boxes(sizes)):
+            class_name, member_funcs, member_vars = classes[position]
+            cell_ids = None
+            box_hash = None
+            if bStableIds:
+                cell_ids = stable_cell_ids(class_name, member_funcs, member_vars)
+                box_hash = source_hash(member_funcs, member_vars, [(classes[target][0], kind) for target, kind
+                                                                   in edges_by_source.get(position, ())])
+            box_ids[position] = cell_ids[0] if bStableIds else str(cell_id)
+            writer.write_cells(class_cells(class_name, member_funcs, member_vars, cell_id, str(x), str(y),
+                                           layer_id, size, cell_ids, box_hash))
+            cell_id += class_cell_count(member_funcs, member_vars)
+
+        for source in positions:
+            for target, kind in edges_by_source.get(source, ()):
+                if target in box_ids:
+                    edge_id = edge_cell_id(box_ids[source], box_ids[target], kind) if bStableIds else str(cell_id)
+                    writer.write_cell(*edge_cell(edge_id, box_ids[source], box_ids[target], kind, layer_id))
+                    cell_id += 1
+
+        writer.end_diagram()
+
+EDGE_STYLES = {
+    'inheritance': 'endArrow=block;endSize=16;endFill=0;html=1;rounded=0;',
+    'association': 'endArrow=open;endSize=12;html=1;rounded=0;dashed=1;'
+}
+
+def edge_cell(cell_id, source_id, target_id, kind, layer_id='1'):
+    """
+    Return the (cell attributes, geometry attributes) of an edge between two
+    class boxes, kind is a key of EDGE_STYLES.
+    """
+    return {
+        'id': cell_id,
+        'style': EDGE_STYLES[kind],
+        'edge': '1',
+        'parent': layer_id,
+        'source': source_id,
+        'target': target_id
+    }, {
+        'relative': '1',
+        'as': 'geometry'
+    }
+
+def edge_cell_id(source_id, target_id, kind):
+    """
+    Return the stable id of an edge, derived from the boxes it links.
+    """
+    return f"{source_id}-{kind}-{target_id}"
+
+def get_namespace(class_name):
+    """
+    Return the namespace part of a Doxygen compound name, e.g. 'Game::Player' -> 'Game'.
+    """
+    if '::' in class_name:
+        return class_name.rsplit('::', 1)[0]
+    return 'Global'
+
+def class_box_size(member_funcs, member_vars, class_name='', bAutoSize=False):
+    """
+    Return the (width, height) of a class box.
+
+    By default every box is sub_width x 500. With bAutoSize the height is the
+    sum of the rows, and the width fits the longest row or the class name,
+    measured with layout.text_width.
+    """
+    if not bAutoSize:
+        return int(sub_width), 500
+
+    width = max([layout.text_width(str(member)) + MEMBER_PADDING for member in member_funcs + member_vars]
+                + [layout.text_width(class_name, bBold=True) + TITLE_PADDING, MIN_BOX_WIDTH])
+    width = math.ceil(width / GRID_SIZE) * GRID_SIZE
+    height = HEADER_HEIGHT + MEMBER_HEIGHT * (len(member_funcs) + len(member_vars)) + SEPARATOR_HEIGHT
+    return width, height
+
+def short_digest(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=6).hexdigest()
+
+def class_box_id(class_name):
+    """
+    Return the stable id of the box of a class, derived from the class name.
+    """
+    return 'cls-' + short_digest(class_name)
+
+def member_cell_id(box_id, member):
+    """
+    Return the stable id of the row of a member, derived from its signature, so a member keeps
+    its id when its type or access changes.
+    """
+    return f"{box_id}-{short_digest(member.signature)}"
+
+def separator_cell_id(box_id):
+    return f"{box_id}-sep"
+
+def page_cell_ids(page_name):
+    """
+    Return the stable ids of the root and layer cells of a page which is not the first one.
+    """
+    page_id = 'page-' + short_digest(page_name)
+    return f"{page_id}-0", f"{page_id}-1"
+
+def stable_cell_ids(class_name, member_funcs, member_vars, box_id=None):
+    """
+    Return the ids of the cells of a class box in document order (the box, the variables, the separator
+    and the functions), derived from the class name and the member signatures instead of their position.
+    A regenerated diagram keeps the ids of the cells which did not change, see drawioMerge.
+
+    Args:
+    - box_id (str): The id of the box, class_box_id(class_name) by default.
+    """
+    if box_id is None:
+        box_id = class_box_id(class_name)
+    cell_ids = [box_id]
+    used_ids = set()
+    for members in (member_vars, None, member_funcs):
+        if members is None:
+            cell_ids.append(separator_cell_id(box_id))
+            continue
+        for member in members:
+            cell_id = member_cell_id(box_id, member)
+            # The same signature twice in a class, e.g. from a hand edited .txt file
+            suffix = 2
+            unique_id = cell_id
+            while unique_id in used_ids:
+                unique_id = f"{cell_id}-{suffix}"
+                suffix += 1
+            used_ids.add(unique_id)
+            cell_ids.append(unique_id)
+    return cell_ids
+
+def source_hash(member_funcs, member_vars, edges=()):
+    """
+    Return the hash of what the cells of a class box are generated from, kept in its sourceHash
+    attribute in merge mode: the hash of the members and the hash of the edges leaving it, joined
+    by a dot. drawioMerge does not read again the boxes whose hash did not change.
+
+    Args:
+    - edges (list): (target class name, kind) tuples.
+    """
+    members = "\n".join(map(str, itertools.chain(member_vars, [''], member_funcs)))
+    edge_lines = "\n".join(f"{kind} {target}" for target, kind in sorted(edges))
+    return f"{short_digest(members)}.{short_digest(edge_lines)}"
+
+def class_cell_count(member_funcs, member_vars):
+    """
+    Return the number of cells of a class box: the box, the members and the separator.
+    """
+    return len(member_funcs) + len(member_vars) + 2
+
+def class_cells(class_name, member_funcs, member_vars, cell_id=2, x='480', y='100', layer_id='1', size=None,
+                cell_ids=None, source_hash=None):
+    """
+    Yield the (cell attributes, geometry attributes) of the cells of one class box,
+    in document order, for drawioWriter and drawioMerge.
+
+    Args:
+    - class_name (str): The name shown in the class box.
+    - member_funcs (list): The member functions (classModel.Member).
+    - member_vars (list): The member variables (classModel.Member).
+    - cell_id (int): The id of the class box, the member cells use the following ids.
+    - x, y (str): The position of the class box.
+    - layer_id (str): The id of the layer cell of the page.
+    - size (tuple): The (width, height) of the box, see class_box_size.
+    - cell_ids (list): The ids of the cells in document order (see stable_cell_ids), when they
+      do not count up from cell_id.
+    - source_hash (str): The sourceHash attribute of the box in merge mode, see source_hash.
+    """
+    width, height = (str(value) for value in size or class_box_size(member_funcs, member_vars))
+    cell_ids = iter(cell_ids) if cell_ids is not None else map(str, itertools.count(cell_id))
+    class_id = next(cell_ids)
 
     # Class Box
-    class_box = ET.SubElement(root, 'mxCell', {
-        'id': '2',
+    box = {
+        'id': class_id,
         'value': class_name,
-        'style': 'swimlane;fontStyle=1;align=center;verticalAlign=top;childLayout=stackLayout;horizontal=1;startSize=26;horizontalStack=0;resizeParent=1;resizeParentMax=0;resizeLast=0;collapsible=1;marginBottom=0;whiteSpace=wrap;html=1;',
+        'style': CLASS_BOX_STYLE,
         'vertex': '1',
-        'parent': '1'
-    })
-    ET.SubElement(class_box, 'mxGeometry', {
-        'x': '480',
-        'y': '100',
-        'width': sub_width,
-        'height': '500',
+        'parent': layer_id
+    }
+    if source_hash is not None:
+        box['sourceHash'] = source_hash
+    yield box, {
+        'x': x,
+        'y': y,
+        'width': width,
+        'height': height,
         'as': 'geometry'
-    })
+    }
 
     # Member Variables
-    y_position = 26
+    y_position = HEADER_HEIGHT
     for var in member_vars:
-        ET.SubElement(root, 'mxCell', {
-            'id': str(len(root)),
-            'value': var,
-            'style': 'text;strokeColor=none;fillColor=none;align=left;verticalAlign=top;spacingLeft=4;spacingRight=4;overflow=hidden;rotatable=0;points=[[0,0.5],[1,0.5]];portConstraint=eastwest;whiteSpace=wrap;html=1;',
+        yield {
+            'id': next(cell_ids),
+            'value': str(var),
+            'style': MEMBER_STYLE,
             'vertex': '1',
-            'parent': '2'
-        }).append(
-            ET.Element('mxGeometry', {
-                'y': str(y_position),
-                'width': sub_width,
-                'height': '26',
-                'as': 'geometry'
-            })
-        )
-        y_position += 26
+            'parent': class_id
+        }, {
+            'y': str(y_position),
+            'width': width,
+            'height': str(MEMBER_HEIGHT),
+            'as': 'geometry'
+        }
+        y_position += MEMBER_HEIGHT
 
     # Separator
-    ET.SubElement(root, 'mxCell', {
-        'id': str(len(root)),
-        'style': 'line;strokeWidth=1;fillColor=none;align=left;verticalAlign=middle;spacingTop=-1;spacingLeft=3;spacingRight=3;rotatable=0;labelPosition=right;points=[];portConstraint=eastwest;strokeColor=inherit;',
+    yield {
+        'id': next(cell_ids),
+        'style': SEPARATOR_STYLE,
         'vertex': '1',
-        'parent': '2'
-    }).append(
-        ET.Element('mxGeometry', {
-            'y': str(y_position),
-            'width': sub_width,
-            'height': '8',
-            'as': 'geometry'
-        })
-    )
-    y_position += 8
+        'parent': class_id
+    }, {
+        'y': str(y_position),
+        'width': width,
+        'height': str(SEPARATOR_HEIGHT),
+        'as': 'geometry'
+    }
+    y_position += SEPARATOR_HEIGHT
 
     # Member Functions
     for func in member_funcs:
-        ET.SubElement(root, 'mxCell', {
-            'id': str(len(root)),
-            'value': func,
-            'style': 'text;strokeColor=none;fillColor=none;align=left;verticalAlign=top;spacingLeft=4;spacingRight=4;overflow=hidden;rotatable=0;points=[[0,0.5],[1,0.5]];portConstraint=eastwest;whiteSpace=wrap;html=1;',
+        yield {
+            'id': next(cell_ids),
+            'value': str(func),
+            'style': MEMBER_STYLE,
             'vertex': '1',
-            'parent': '2'
-        }).append(
-            ET.Element('mxGeometry', {
-                'y': str(y_position),
-                'width': sub_width,
-                'height': '26',
-                'as': 'geometry'
-            })
-        )
-        y_position += 26
-
-    # XML 트리 생성 및 저장
-    indent(mxfile)  # 적용된 들여쓰기
-    
-    output_file_name = os.path.basename(file_path).replace('.txt', '_Diagram.drawio')
-    output_file_path = os.path.join(output_folder, output_file_name)
-
-    tree = ET.ElementTree(mxfile)
-    tree.write(output_file_path, encoding='UTF-8', xml_declaration=True)
+            'parent': class_id
+        }, {
+            'y': str(y_position),
+            'width': width,
+            'height': str(MEMBER_HEIGHT),
+            'as': 'geometry'
+        }
+        y_position += MEMBER_HEIGHT
 
 def extract_class_info(txt_file):
     with open(txt_file, 'r') as file:
@@ -153,8 +393,8 @@ def extract_class_info(txt_file):
     for line in lines:
         line = line.strip()
         if line.startswith('Class Name:'):
-            # Remove '.cs' from the class name if it exists
-            class_name = line.split(':', 1)[1].strip().replace('.cs', '')
+            # Remove the source extension ('.cs', '.h', '.java') from the class name if it exists
+            class_name = languages.strip_source_extension(line.split(':', 1)[1].strip())
         elif line.startswith('Member functions:'):
             parsing_functions = True
             parsing_variables = False
@@ -162,19 +402,24 @@ def extract_class_info(txt_file):
             parsing_functions = False
             parsing_variables = True
         elif parsing_functions and line:
-            # Capture the entire function line
-            member_functions.append(f"{line}")
+            # Read the fields back from the function line
+            member_functions.append(classModel.parse_member(line))
         elif parsing_variables and line:
-            # Capture the entire variable line
-            member_variables.append(f"{line}")
+            # Read the fields back from the variable line
+            member_variables.append(classModel.parse_member(line))
     
     return class_name, member_functions, member_variables
 
-def process_all_files_in_folder(folder_path, output_folder):
+def diagram_file_name(txt_file_name):
+    return os.path.basename(txt_file_name).replace('.txt', '_Diagram.drawio')
+
+def process_all_files_in_folder(folder_path, output_folder, workers=1, bIncremental=False, bPretty=True,
+                                bCompressed=False, bSharedStyles=False, bAutoSize=False, bMerge=False):
     # Output folder 생성 및 XML 파일 저장
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
-    else:
+    elif not (bIncremental or bMerge):
+        # In merge mode the existing diagrams are updated instead
         # 폴더를 비운 후 다시 생성
         for filename in os.listdir(output_folder):
             file_path = os.path.join(output_folder, filename)
@@ -183,15 +428,26 @@ def process_all_files_in_folder(folder_path, output_folder):
             elif os.path.isdir(file_path):
                 shutil.rmtree(file_path)
 
-    for file_name in os.listdir(folder_path):
-        if file_name.endswith('.txt'):
-            file_path = os.path.join(folder_path, file_name)
-            create_class_diagram(file_path, output_folder)
+    txt_file_names = [file_name for file_name in sorted(os.listdir(folder_path)) if file_name.endswith('.txt')]
+    # Only the text files which changed since the last run are converted again
+    txt_file_names, new_manifest = manifest.plan_incremental_build(
+        folder_path, txt_file_names, output_folder, diagram_file_name, 
+        {"sub_width": sub_width, "bPretty": bPretty, "bCompressed": bCompressed, "bSharedStyles": bSharedStyles,
+         "bAutoSize": bAutoSize},
+        bIncremental)
+
+    file_paths = [os.path.join(folder_path, file_name) for file_name in txt_file_names]
+    parallel.map_files(create_class_diagram, file_paths, workers, output_folder=output_folder, bPretty=bPretty,
+                       bCompressed=bCompressed, bSharedStyles=bSharedStyles, bAutoSize=bAutoSize, bMerge=bMerge)
+
+    # Every text file gives its diagram
+    manifest.save_build_manifest(output_folder, new_manifest, txt_file_names, txt_file_names)
 
-def txtToDrawio():
-    folder_path = 'texts'
-    output_folder = 'drawio'
-    process_all_files_in_folder(folder_path, output_folder)
+def txtToDrawio(workers=1, bIncremental=False, folder_path='texts', output_folder='drawio', bPretty=True,
+                bCompressed=False, bSharedStyles=False, bAutoSize=False, bMerge=False):
+    process_all_files_in_folder(folder_path, output_folder, workers=workers, bIncremental=bIncremental,
+                                bPretty=bPretty, bCompressed=bCompressed, bSharedStyles=bSharedStyles,
+                                bAutoSize=bAutoSize, bMerge=bMerge)
 
 if __name__ == '__main__':
     txtToDrawio()
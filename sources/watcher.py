@@ -0,0 +1,289 @@
+"""
+Watch mode: keep the parsed classes in memory and regenerate the diagrams of
+the compound .xml files that changed, as soon as Doxygen has finished writing.
+
+The xml folder is polled with os.scandir, which only reads the directory
+entries. Once a change is seen, the rebuild waits until the folder has been
+quiet for the debounce delay, so a Doxygen run that rewrites hundreds of files
+triggers a single rebuild. Doxygen rewrites every file on each run, so the
+files whose size or modification time changed are read and hashed, and only
+the ones whose content really changed are parsed and written again.
+
+With bIncremental, the first rebuild skips the files whose outputs are up to
+date in the manifest of the drawio folder, like convert_xml_folder, and the
+manifest is saved after every rebuild, so the next run starts from it too.
+"""
+import hashlib
+import os
+import time
+
+from sources import ioPipeline
+from sources import manifest
+from sources import pipeline
+from sources import relations
+from sources import renderers
+from sources import xmlExtractorWithType
+
+class _Compound:
+    """
+    The last seen state of one compound .xml file.
+    """
+    __slots__ = ('signature', 'digest', 'entry')
+
+    def __init__(self, signature, digest, entry):
+        self.signature = signature
+        self.digest = digest
+        # (class model, extracted info) from pipeline.extract_class_entry, None if it could not be parsed
+        self.entry = entry
+
+def scan_folder(folder_path):
+    """
+    Return {file name: (modification time, size)} of the .xml files of a folder.
+    """
+    snapshot = {}
+    try:
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.name.endswith('.xml') and entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        # The folder is being replaced, the next poll sees the new one
+        pass
+    return snapshot
+
+def remove_file(file_path):
+    try:
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+    except OSError as e:
+        print(f"Error removing file {file_path}: {e}")
+
+class Watcher:
+    """
+    The classes of an xml folder kept in memory, and the diagrams generated from them.
+
+    Args:
+    - xml_folder (str): The folder of the Doxygen .xml files.
+    - drawio_folder (str): The folder of the .drawio files (unused with single_file).
+    - text_folder (str): If set, the .txt files are also written in this folder.
+    - single_file (str): If set, every class is written into this single .drawio file,
+      which is rewritten from the classes in memory when any of them changes.
+    - bIncremental (bool): Without single_file, keep the manifest of the drawio folder, see manifest.
+    - options (dict): The other options of doxygen2drawio.convert: bWithType, bStreaming,
+      backend, cache_folder, namespaces, class_names, member_filter, bPagePerNamespace,
+      bRelations, bPretty, bCompressed, bSharedStyles, bAutoSize, bMerge, formats and bSkipEmpty.
+    """
+
+    def __init__(self, xml_folder, drawio_folder, text_folder=None, single_file=None, bIncremental=False,
+                 **options):
+        self.xml_folder = xml_folder
+        self.drawio_folder = drawio_folder
+        self.text_folder = text_folder
+        self.single_file = single_file
+        # The single file is rewritten whole, it has no manifest
+        self.bIncremental = bIncremental and not single_file
+        self.options = options
+        self.compounds = {}
+        self.snapshot = {}
+        # With bIncremental, the manifest of the drawio folder once the first rebuild has read it
+        self.manifest = None
+
+    def option(self, name, default=None):
+        return self.options.get(name, default)
+
+    def rebuild(self):
+        """
+        Parse and write the compounds which changed since the last rebuild, and
+        remove the outputs of the compounds which were deleted.
+
+        Returns:
+        - tuple: (number of classes written, number of classes removed)
+        """
+        self.snapshot = scan_folder(self.xml_folder)
+        xml_file_names = xmlExtractorWithType.list_xml_files(self.xml_folder, self.option('backend', 'codeline'),
+                                                             self.option('namespaces'), self.option('class_names'))
+
+        bFirst = self.bIncremental and self.manifest is None
+        if bFirst:
+            self.skip_unchanged(xml_file_names)
+
+        changed_names = [file_name for file_name in xml_file_names if self.update_compound(file_name)]
+        removed_names = set(self.compounds).difference(xml_file_names)
+        for file_name in removed_names:
+            del self.compounds[file_name]
+
+        if self.single_file:
+            if changed_names or removed_names:
+                self.write_single_file(xml_file_names)
+        else:
+            for file_name in removed_names:
+                self.remove_class_files(file_name)
+            for file_name in changed_names:
+                self.write_class_files(file_name)
+        if self.manifest is not None and (bFirst or changed_names or removed_names):
+            # The first save also drops the compounds deleted since the last run
+            self.save_manifest(changed_names, removed_names)
+        return len(changed_names), len(removed_names)
+
+    def output_file_names(self, file_name):
+        return pipeline.output_file_names_for_xml(file_name, self.option('formats'))
+
+    def skip_unchanged(self, xml_file_names):
+        """
+        Read the manifest of the drawio folder, and mark the compounds whose outputs are up to
+        date as seen, with the hash of the manifest, so that they are neither parsed nor written.
+        The outputs of the compounds deleted since the last run are removed.
+        """
+        settings = pipeline.manifest_settings(
+            bWithType=self.option('bWithType', True), backend=self.option('backend', 'codeline'),
+            bPretty=self.option('bPretty', True), bCompressed=self.option('bCompressed', False),
+            bSharedStyles=self.option('bSharedStyles', False), bAutoSize=self.option('bAutoSize', False),
+            member_filter=self.option('member_filter'), formats=self.option('formats'),
+            bSkipEmpty=self.option('bSkipEmpty', False))
+        changed_names, self.manifest = manifest.plan_incremental_build(
+            self.xml_folder, xml_file_names, self.drawio_folder, self.output_file_names, settings)
+        for file_name in set(xml_file_names).difference(changed_names):
+            # The entry is only needed to write the compound, which is parsed again once it changes
+            self.compounds[file_name] = _Compound(self.snapshot.get(file_name),
+                                                  bytes.fromhex(self.manifest["files"][file_name]["hash"]), None)
+
+    def save_manifest(self, changed_names, removed_names):
+        """
+        Record the compounds written by a rebuild in the manifest and save it. The compounds
+        which wrote nothing are left out, so that the next run tries them again.
+        """
+        files = self.manifest["files"]
+        for file_name in removed_names:
+            files.pop(file_name, None)
+        for file_name in changed_names:
+            compound = self.compounds[file_name]
+            if compound.entry is None:
+                files.pop(file_name, None)
+            else:
+                files[file_name] = {"hash": compound.digest.hex(), "output": self.output_file_names(file_name)}
+        manifest.save_manifest(self.drawio_folder, self.manifest)
+
+    def update_compound(self, file_name):
+        """
+        Parse a compound again if its content changed. Returns True if it did.
+        """
+        signature = self.snapshot.get(file_name)
+        compound = self.compounds.get(file_name)
+        if compound is not None and signature is not None and compound.signature == signature:
+            return False
+
+        xml_file_path = os.path.join(self.xml_folder, file_name)
+        try:
+            xml_bytes = ioPipeline.read_xml_file(xml_file_path)
+        except OSError as e:
+            print(f"Error reading file {xml_file_path}: {e}")
+            return False
+        digest = hashlib.sha256(xml_bytes.getbuffer()).digest()
+        if compound is not None and compound.digest == digest:
+            compound.signature = signature
+            return False
+
+        entry = pipeline.extract_class_entry(xml_bytes, bWithType=self.option('bWithType', True),
+                                             bStreaming=self.option('bStreaming', False),
+                                             backend=self.option('backend', 'codeline'),
+                                             cache_folder=self.option('cache_folder'),
+                                             member_filter=self.option('member_filter'),
+                                             bSkipEmpty=self.option('bSkipEmpty', False))
+        self.compounds[file_name] = _Compound(signature, digest, entry)
+        return True
+
+    def write_class_files(self, file_name):
+        entry = self.compounds[file_name].entry
+        if entry is None:
+            # Do not leave the diagram of the previous content behind
+            self.remove_class_files(file_name)
+            return
+        pipeline.write_class_files(os.path.join(self.xml_folder, file_name), entry, self.drawio_folder,
+                                   bWithType=self.option('bWithType', True), text_folder=self.text_folder,
+                                   bPretty=self.option('bPretty', True), bCompressed=self.option('bCompressed', False),
+                                   bSharedStyles=self.option('bSharedStyles', False),
+                                   bAutoSize=self.option('bAutoSize', False), bMerge=self.option('bMerge', False),
+                                   formats=self.option('formats'))
+
+    def remove_class_files(self, file_name):
+        for output_file_name in manifest.output_names(pipeline.output_file_names_for_xml(file_name,
+                                                                                          self.option('formats'))):
+            remove_file(os.path.join(self.drawio_folder, output_file_name))
+        if self.text_folder is not None:
+            remove_file(os.path.join(self.text_folder, xmlExtractorWithType.format_file_name(file_name)))
+
+    def write_single_file(self, xml_file_names):
+        entries = [self.compounds[file_name].entry for file_name in xml_file_names
+                   if self.compounds[file_name].entry is not None]
+        edges = None
+        if self.option('bRelations', False):
+            all_extracted_info = [extracted_info for _, extracted_info in entries]
+            edges = relations.resolve_edges(all_extracted_info, relations.build_refid_index(all_extracted_info))
+        if self.option('bPagePerNamespace', False):
+            class_models = [pipeline.namespaced_class_model(*entry) for entry in entries]
+        else:
+            class_models = [class_model for class_model, _ in entries]
+        for renderer in renderers.make_renderers(self.option('formats'), bPretty=self.option('bPretty', True),
+                                                 bCompressed=self.option('bCompressed', False),
+                                                 bSharedStyles=self.option('bSharedStyles', False),
+                                                 bAutoSize=self.option('bAutoSize', False),
+                                                 bMerge=self.option('bMerge', False),
+                                                 bPagePerNamespace=self.option('bPagePerNamespace', False)):
+            renderer.write_classes(class_models, renderer.output_path(self.single_file), edges)
+
+    def has_changed(self):
+        return scan_folder(self.xml_folder) != self.snapshot
+
+def watch(xml_folder, drawio_folder, text_folder=None, single_file=None, bIncremental=False, poll_interval=0.1,
+          debounce=0.25, **options):
+    """
+    Convert the xml folder, then keep converting the compounds which change until Ctrl+C.
+
+    Args:
+    - xml_folder (str): The folder of the Doxygen .xml files.
+    - drawio_folder (str): The folder of the .drawio files.
+    - text_folder (str): If set, the .txt files are also written in this folder.
+    - single_file (str): If set, write every class into this single .drawio file.
+    - bIncremental (bool): Keep the files already in the output folders at the start, and only write
+      the compounds which changed since the last run, see Watcher.
+    - poll_interval (float): Seconds between two scans of the xml folder.
+    - debounce (float): Seconds the xml folder has to stay unchanged before a rebuild.
+    - options: The other options of Watcher.
+    """
+    if single_file:
+        output_folder = os.path.dirname(single_file)
+        if output_folder and not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+    else:
+        pipeline.prepare_folder(drawio_folder, bIncremental or options.get('bMerge', False))
+        if text_folder is not None:
+            pipeline.prepare_folder(text_folder, bIncremental)
+
+    watcher = Watcher(xml_folder, drawio_folder, text_folder, single_file, bIncremental, **options)
+    print_rebuild(watcher)
+    print(f"Watching '{xml_folder}' for changes, press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(poll_interval)
+            if not watcher.has_changed():
+                continue
+            # Wait until the folder stays the same for the debounce delay
+            snapshot = scan_folder(xml_folder)
+            quiet_since = time.perf_counter()
+            while time.perf_counter() - quiet_since < debounce:
+                time.sleep(poll_interval)
+                new_snapshot = scan_folder(xml_folder)
+                if new_snapshot != snapshot:
+                    snapshot = new_snapshot
+                    quiet_since = time.perf_counter()
+            print_rebuild(watcher)
+    except KeyboardInterrupt:
+        pass
+
+def print_rebuild(watcher):
+    start = time.perf_counter()
+    written, removed = watcher.rebuild()
+    elapsed = time.perf_counter() - start
+    if written or removed:
+        print(f"{time.strftime('%H:%M:%S')} updated {written} classes, removed {removed} in {elapsed * 1000:.0f} ms")
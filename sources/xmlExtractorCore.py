@@ -0,0 +1,434 @@
+"""
+Extract the classes of the Doxygen .xml files into the .txt files read by txt2drawio.
+
+xmlExtractorWithType and xmlExtractor are this module with and without the types of
+the members, bWithType selects one or the other.
+"""
+import os
+import xml.etree.ElementTree as ET
+import re
+from functools import partial
+
+from sources import classModel
+from sources import doxygenIndex
+from sources import languages
+from sources import manifest
+from sources import mappedInput
+from sources import memberClassifier
+from sources import memberFilter
+from sources import memberdefExtractor
+from sources import metrics
+from sources import parallel
+from sources import parseCache
+from sources import relations
+
+def parse_doxygen_xml(xml_file, bWithType=True, member_filter=None):
+    # A file without a selected class is skipped before the whole tree is built
+    if member_filter is not None and not member_filter.accepts_file_compound(xml_file):
+        return None
+    try:
+        tree = ET.parse(xml_file)
+        root = tree.getroot()
+    except ET.ParseError as e:
+        print(f"Error parsing {xml_file}: {e}")
+        return None
+
+    extracted_info = {
+        "class_name": None,
+        # The class name of a file compound is the file name, the namespace is read from its classes
+        "namespace": None,
+        "member_functions": [],
+        "member_variables": [],
+        # Used by relations to draw inheritance and association edges
+        "refids": {},
+        "base_refids": {},
+        "type_refids": {}
+    }
+
+    class_name_element = root.find(".//compoundname")
+    if class_name_element is not None:
+        extracted_info["class_name"] = class_name_element.text.strip()
+
+    for innerclass in root.findall(".//innerclass"):
+        relations.add_innerclass(innerclass, extracted_info)
+
+    compounddef = root.find("compounddef")
+    language = languages.get_language(compounddef.get("language") if compounddef is not None else None)
+    # The access set by the last C++ 'public:' label or class declaration
+    section_access = None
+    for codeline in root.findall(".//codeline"):
+        refkind = codeline.get("refkind")
+        if refkind == "member":
+            if parse_member_codeline(codeline, extracted_info, member_filter, language, section_access,
+                                     bWithType):
+                relations.add_member_type_refs(codeline, extracted_info)
+        elif refkind == "compound":
+            relations.add_compound_codeline(codeline, extracted_info)
+            if language.bSectionAccess:
+                section_access = language.access_of_compound(' '.join(codeline.itertext()))
+        elif language.bSectionAccess:
+            section_access = language.access_of_label(' '.join(codeline.itertext())) or section_access
+
+    return extracted_info
+
+
+def parse_doxygen_xml_streaming(xml_file, bWithType=True, member_filter=None):
+    """
+    Same result as parse_doxygen_xml, but the file is read with iterparse.
+    Each <codeline> is handled as soon as it is closed and then freed,
+    so memory stays roughly flat even for very large compound files.
+
+    Args:
+    - xml_file (str): Path of the Doxygen compound .xml file.
+    - bWithType (bool): Append the return and variable types.
+    - member_filter (MemberFilter): If set, only the selected classes and members are extracted,
+      and the code of a file without a selected class is not read.
+
+    Returns:
+    - dict: The extracted info, or None if the file can not be parsed or its classes are filtered out.
+    """
+    extracted_info = {
+        "class_name": None,
+        # The class name of a file compound is the file name, the namespace is read from its classes
+        "namespace": None,
+        "member_functions": [],
+        "member_variables": [],
+        # Used by relations to draw inheritance and association edges
+        "refids": {},
+        "base_refids": {},
+        "type_refids": {}
+    }
+
+    programlisting = None
+    inner_class_names = []
+    language = languages.CSHARP
+    section_access = None
+    try:
+        for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "compounddef":
+                    language = languages.get_language(elem.get("language"))
+                elif elem.tag == "programlisting":
+                    programlisting = elem
+                    # The classes of the file are known, stop before the code if none is selected
+                    if member_filter is not None and not member_filter.accepts_any_class(inner_class_names):
+                        return None
+                continue
+
+            if elem.tag == "codeline":
+                refkind = elem.get("refkind")
+                if refkind == "member":
+                    if parse_member_codeline(elem, extracted_info, member_filter, language, section_access,
+                                             bWithType):
+                        relations.add_member_type_refs(elem, extracted_info)
+                elif refkind == "compound":
+                    relations.add_compound_codeline(elem, extracted_info)
+                    if language.bSectionAccess:
+                        section_access = language.access_of_compound(' '.join(elem.itertext()))
+                elif language.bSectionAccess:
+                    section_access = language.access_of_label(' '.join(elem.itertext())) or section_access
+                # Free the processed codeline
+                elem.clear()
+                if programlisting is not None:
+                    programlisting.remove(elem)
+            elif elem.tag == "innerclass":
+                relations.add_innerclass(elem, extracted_info)
+                inner_class_names.append((elem.text or '').strip())
+            elif elem.tag == "compoundname":
+                if extracted_info["class_name"] is None:
+                    extracted_info["class_name"] = elem.text.strip()
+    except ET.ParseError as e:
+        print(f"Error parsing {xml_file}: {e}")
+        return None
+
+    if member_filter is not None and not member_filter.accepts_any_class(inner_class_names):
+        return None
+    return extracted_info
+
+
+def parse_member_codeline(codeline, extracted_info, member_filter=None, language=languages.CSHARP,
+                          section_access=None, bWithType=True):
+    """
+    Extract the member described by a refkind="member" codeline and append it to extracted_info.
+
+    Args:
+    - codeline (Element): The <codeline> element of the member.
+    - extracted_info (dict): The dictionary the member is appended to.
+    - member_filter (MemberFilter): If set, the member is only appended if it passes, see memberFilter.
+    - bWithType (bool): Keep the return or variable type of the member.
+
+    Returns:
+    - bool: False if the member was filtered out.
+    """
+    ref_element = find_member_ref(codeline)
+    if ref_element is not None:
+        name = ref_element.text.strip()
+
+        # Convert the codeline's text to a single string, <sp/> elements have no text
+        text = ' '.join(codeline.itertext())
+
+        # Access, return type, name and parameters in a single pass over the line
+        access_specifier, _, type_info, function_name, parameters = memberClassifier.classify_member_line(
+            text, language, section_access)
+        # Drop a filtered out member before it is stored
+        if member_filter is not None and not member_filter.accepts_member(
+                parameters is not None, access_specifier, member_function_name(language, function_name, name)):
+            return False
+
+        if not bWithType:
+            type_info = None
+        # Check if it is a function or a variable
+        if parameters is not None:
+            # For functions, the type is the return type
+            extracted_info["member_functions"].append(
+                classModel.Member(access_specifier, member_function_name(language, function_name, name),
+                                  f"({parameters})", type_info))
+        else:
+            extracted_info["member_variables"].append(classModel.Member(access_specifier, name, '', type_info))
+    return True
+
+
+def member_function_name(language, function_name, ref_name):
+    """
+    Return the name of a member. The C++ and Java names are read from the <ref> of the member,
+    the word before the parameters is not the whole name of e.g. "~Player" or "operator==".
+    """
+    if language.bFullType:
+        # The '~' of a destructor is written before its <ref>
+        if function_name is not None and function_name.startswith('~') and not ref_name.startswith('~'):
+            return '~' + ref_name
+        return ref_name
+    return function_name or ref_name
+
+def find_member_ref(codeline):
+    """
+    Return the <ref> of the member itself. The first <ref> of the line can be a
+    class used as the member type, e.g. "public Player owner;".
+    """
+    member_refid = codeline.get("refid")
+    for ref in codeline.iter("ref"):
+        if ref.get("refid") == member_refid:
+            return ref
+    return codeline.find(".//ref")
+
+
+def parse_doxygen_memberdef_xml(xml_file, bWithType=True, member_filter=None):
+    """
+    Parse a class compound from its <memberdef> elements, see memberdefExtractor.
+    """
+    return memberdefExtractor.parse_memberdef_xml(xml_file, bWithType=bWithType, member_filter=member_filter)
+
+def get_parser(bWithType=True, bStreaming=False, backend='codeline', cache_folder=None, member_filter=None,
+               bSkipEmpty=False):
+    """
+    Return the parse function of a backend.
+
+    Args:
+    - bWithType (bool): Append the return and variable types.
+    - bStreaming (bool): Use iterparse for the codeline backend.
+    - backend (str): 'codeline' reads the file compounds (*cs.xml, *_8h.xml, *_8java.xml, see languages),
+      'memberdef' reads the class compounds (class*.xml, struct*.xml, interface*.xml),
+      'index' reads the class compounds listed in index.xml.
+    - cache_folder (str): If set, the results are kept in this parse cache, see parseCache.
+    - member_filter (MemberFilter): If set, only the selected classes and members are extracted, see memberFilter.
+    - bSkipEmpty (bool): Read the files through mmap and skip the ones without members before parsing them,
+      see mappedInput.
+    """
+    if backend in ('memberdef', 'index'):
+        # Both read the class compounds, only their file lists differ
+        backend = 'memberdef'
+        parse = parse_doxygen_memberdef_xml
+    else:
+        parse = parse_doxygen_xml_streaming if bStreaming else parse_doxygen_xml
+
+    variant = f"{__name__}:{'type' if bWithType else 'name'}:{backend}"
+    parse = partial(parse, bWithType=bWithType)
+    if member_filter is not None:
+        parse = partial(parse, member_filter=member_filter)
+        variant = f"{variant}:{member_filter.key}"
+    if cache_folder:
+        # The tree and streaming parsers give the same result, so they share the entries
+        parse = partial(parseCache.cached_parse, parse=parse, variant=variant, cache_folder=cache_folder)
+    if bSkipEmpty:
+        # Outside the cache, so the skipped files are not even hashed
+        parse = partial(mappedInput.prescreened_parse, parse=parse, marker=mappedInput.MEMBER_MARKERS[backend])
+    if metrics.bEnabled:
+        parse = partial(metrics.measured_parse, parse=parse)
+    return parse
+
+def list_xml_files(folder_path, backend='codeline', namespaces=None, class_names=None):
+    # Sorted so that the order of the results does not depend on the file system
+    if backend == 'index':
+        # Only the index backend can select a subset without opening the compound files
+        return doxygenIndex.list_index_files(folder_path, namespaces, class_names)
+    if backend == 'memberdef':
+        return sorted(filename for filename in os.listdir(folder_path) if memberdefExtractor.is_compound_file(filename))
+    return sorted(filename for filename in os.listdir(folder_path) if languages.is_codeline_file(filename))
+
+def parse_all_xml_in_folder(folder_path, bWithType=True, bStreaming=False, workers=1, file_names=None,
+                            backend='codeline', cache_folder=None, member_filter=None, bSkipEmpty=False):
+    return list(iter_xml_in_folder(folder_path, bWithType, bStreaming=bStreaming, workers=workers,
+                                   file_names=file_names, backend=backend, cache_folder=cache_folder,
+                                   member_filter=member_filter, bSkipEmpty=bSkipEmpty))
+
+def iter_xml_in_folder(folder_path, bWithType=True, bStreaming=False, workers=1, file_names=None,
+                       backend='codeline', cache_folder=None, member_filter=None, bSkipEmpty=False,
+                       memory_limit=None):
+    """
+    Yield {"file_name", "extracted_info"} for each parsed file, in the order of file_names,
+    as soon as it is parsed. memory_limit caps the bytes of .xml files waiting in the
+    worker processes, see parallel.iter_files.
+    """
+    parse = get_parser(bWithType, bStreaming=bStreaming, backend=backend, cache_folder=cache_folder,
+                       member_filter=member_filter, bSkipEmpty=bSkipEmpty)
+
+    if file_names is None:
+        file_names = list_xml_files(folder_path, backend)
+    file_paths = [os.path.join(folder_path, filename) for filename in file_names]
+    all_extracted_info = parallel.iter_files(parse, file_paths, workers, max_pending_bytes=memory_limit)
+
+    for filename, extracted_info in zip(file_names, all_extracted_info):
+        if extracted_info is not None:
+            yield {
+                "file_name": filename,
+                "extracted_info": extracted_info
+            }
+
+def get_sorted_member_info(extracted_info):
+    # Sort functions and variables by access specifier and then by name, see classModel.Member.sort_key
+    sorted_functions = classModel.sort_members(extracted_info["member_functions"])
+    sorted_variables = classModel.sort_members(extracted_info["member_variables"])
+
+    return (sorted_functions, sorted_variables)
+
+def render_class_text(extracted_info):
+    """
+    Render the extracted info of one class in the .txt format read by txt2drawio.
+    """
+    return "".join(render_class_lines(extracted_info))
+
+def render_class_lines(extracted_info):
+    """
+    Yield the lines of render_class_text one by one.
+    """
+    member_functions, member_variables = get_sorted_member_info(extracted_info)
+
+    yield f"Class Name: {extracted_info['class_name']}\n"
+    yield "Member functions:\n"
+    for func in member_functions:
+        yield f"{func}\n"
+    yield "Member variables:\n"
+    for var in member_variables:
+        yield f"{var}\n"
+
+def create_text_file(file_name, text_content):
+    """
+    Create a text file with the given name and write the provided content to it.
+
+    Args:
+    - file_name (str): The name of the file to be created.
+    - text_content (str or iterable): The content to be written to the file, can be multiple lines,
+      or its lines, e.g. from render_class_lines, which are written one by one as they come.
+    """
+    if isinstance(text_content, str):
+        text_content = (text_content,)
+    try:
+        with metrics.span('write_text', file_name) as counts:
+            bytes_written = 0
+            with open(file_name, 'w') as file:
+                for line in text_content:
+                    file.write(line)
+                    bytes_written += len(line)
+            counts['bytes_written'] = bytes_written
+        metrics.verbose_print(f"File '{file_name}' created successfully.")
+    except IOError as e:
+        print(f"Error creating file '{file_name}': {e}")
+
+def format_file_name(file_name):
+    """
+    Convert file name from 'name_with_underscores_and_8.xml' to 'NameWithUnderscoresAndTxt.txt'.
+    Args:
+    - file_name (str): The original file name.
+    Returns:
+    - str: The formatted file name.
+    """
+    base_name = file_name.replace('.xml', '')  # Remove .xml extension
+    # Remove underscores and capitalize the next letter
+    formatted_name = re.sub(r'_(.)', lambda m: m.group(1).upper(), base_name)
+    # Remove all '8' characters
+    formatted_name = formatted_name.replace('8', '')
+    # Remove the substring "class"
+    formatted_name = formatted_name.replace('class', '')
+    # Strip leading/trailing whitespace and add .txt extension
+    formatted_name = formatted_name.strip() + '.txt'
+    return formatted_name
+
+def clear_results_folder(folder_path):
+    """
+    Clear all files in the given folder.
+    
+    Args:
+    - folder_path (str): The path of the folder to be cleared.
+    """
+    for filename in os.listdir(folder_path):
+        file_path = os.path.join(folder_path, filename)
+        try:
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+        except Exception as e:
+            print(f"Error removing file {file_path}: {e}")
+
+# Default folder paths
+xml_folder_path = os.path.join('xmls')
+results_folder_path = os.path.join('texts')
+
+def prepare_results_folder(folder_path):
+    """
+    Ensure the results folder exists and clear it.
+    """
+    if not os.path.exists(folder_path):
+        os.makedirs(folder_path)
+    else:
+        clear_results_folder(folder_path)
+
+def extract(bWithType=True, bStreaming=False, workers=1, bIncremental=False,
+            xml_folder=xml_folder_path, results_folder=results_folder_path, backend='codeline',
+            cache_folder=None, namespaces=None, class_names=None, member_filter=None, bSkipEmpty=False,
+            memory_limit=None):
+    """
+    Write the .txt file of each class of xml_folder into results_folder.
+    """
+    if bIncremental:
+        if not os.path.exists(results_folder):
+            os.makedirs(results_folder)
+    else:
+        prepare_results_folder(results_folder)
+
+    # Only the xml files which changed since the last run are parsed again
+    file_names, new_manifest = manifest.plan_incremental_build(
+        xml_folder, list_xml_files(xml_folder, backend, namespaces, class_names), results_folder,
+        format_file_name, mappedInput.prescan_settings(memberFilter.filter_settings(
+            {"bWithType": bWithType, "backend": backend}, member_filter), bSkipEmpty),
+        bIncremental)
+
+    # Each class is written as soon as it is parsed, so only the classes in flight are in memory
+    all_extracted_info = iter_xml_in_folder(xml_folder, bWithType, bStreaming=bStreaming, workers=workers,
+                                            file_names=file_names, backend=backend, cache_folder=cache_folder,
+                                            member_filter=member_filter, bSkipEmpty=bSkipEmpty,
+                                            memory_limit=memory_limit)
+
+    built_names = []
+    for file_info in all_extracted_info:
+        xml_file_name = file_info['file_name']
+        result_file_name = format_file_name(xml_file_name)  # Format the file name
+
+        # Create the path for the .txt file in the results folder
+        txt_file_path = os.path.join(results_folder, result_file_name)
+
+        if metrics.bVerbose:
+            metrics.verbose_print(render_class_text(file_info['extracted_info']))
+        # The lines go straight to the file, the text of the class is never built
+        create_text_file(txt_file_path, render_class_lines(file_info['extracted_info']))
+        built_names.append(xml_file_name)
+
+    manifest.save_build_manifest(results_folder, new_manifest, file_names, built_names)
@@ -0,0 +1,99 @@
+"""
+Tests of the merge mode of sources/drawioMerge.py.
+
+Run from the repository root:
+    python -m pytest -q tests
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sources import classModel
+from sources import drawioMerge
+from sources import txt2drawio
+
+
+def make_classes(class_count, member_count):
+    return [(f"Game::Class{index}",
+             [classModel.Member('+', f"Method{number}", "(int value)", 'bool') for number in range(member_count)],
+             [classModel.Member('-', f"field{number}", '', 'int') for number in range(member_count)])
+            for index in range(class_count)]
+
+
+class MergeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.folder.name, 'classes.drawio')
+        self.classes = make_classes(5, 3)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def merge(self, classes, bWholeFile=False):
+        """
+        Write the diagram of self.classes, merge classes into it and return the file and the counts.
+        """
+        txt2drawio.create_multi_class_diagram(self.classes, self.file_path, bMerge=True, bAutoSize=True)
+        if bWholeFile:
+            with mock.patch.object(drawioMerge, 'changed_boxes', return_value=None):
+                counts = drawioMerge.merge_diagram(self.file_path, classes, bAutoSize=True)
+        else:
+            counts = drawioMerge.merge_diagram(self.file_path, classes, bAutoSize=True)
+        with open(self.file_path, 'rb') as file:
+            return file.read(), counts
+
+    def changed_classes(self, member_funcs, member_vars):
+        class_name = self.classes[2][0]
+        return self.classes[:2] + [(class_name, member_funcs, member_vars)] + self.classes[3:]
+
+    def test_changed_boxes_merge_like_the_whole_file(self):
+        _, member_funcs, member_vars = self.classes[2]
+        changes = {
+            'type': (member_funcs, [classModel.Member('-', 'field0', '', 'string')] + member_vars[1:]),
+            'added': (member_funcs + [classModel.Member('+', 'Reset', '()', 'void')], member_vars),
+            'removed': (member_funcs[1:], member_vars[:1]),
+            'reordered': (member_funcs[::-1], member_vars),
+        }
+        for name, (changed_funcs, changed_vars) in changes.items():
+            with self.subTest(name):
+                classes = self.changed_classes(changed_funcs, changed_vars)
+                self.assertEqual(self.merge(classes), self.merge(classes, bWholeFile=True))
+
+    def test_unchanged_diagram_is_not_parsed(self):
+        txt2drawio.create_multi_class_diagram(self.classes, self.file_path, bMerge=True)
+        os.utime(self.file_path, (0, 0))
+        with mock.patch.object(drawioMerge, 'read_cells', wraps=drawioMerge.read_cells) as read_cells:
+            counts = drawioMerge.merge_diagram(self.file_path, self.classes)
+        read_cells.assert_not_called()
+        self.assertEqual(counts['updated'], 0)
+        self.assertEqual(os.path.getmtime(self.file_path), 0)
+
+    def test_edge_to_removed_row_is_removed(self):
+        txt2drawio.create_multi_class_diagram(self.classes, self.file_path, bMerge=True)
+        class_name, member_funcs, member_vars = self.classes[2]
+        row_id = txt2drawio.stable_cell_ids(class_name, member_funcs, member_vars)[1]
+        box_id = txt2drawio.class_box_id(self.classes[0][0])
+        with open(self.file_path, encoding='utf-8') as file:
+            content = file.read()
+        # An arrow drawn by hand from the first variable of a class
+        edge = (f'<mxCell id="hand-edge" edge="1" parent="1" source="{row_id}" target="{box_id}">'
+                f'<mxGeometry relative="1" as="geometry" /></mxCell>')
+        with open(self.file_path, 'w', encoding='utf-8') as file:
+            file.write(content.replace('</root>', edge + '</root>'))
+
+        drawioMerge.merge_diagram(self.file_path, self.changed_classes(member_funcs, member_vars[1:]))
+        with open(self.file_path, encoding='utf-8') as file:
+            content = file.read()
+        self.assertNotIn(row_id, content)
+        self.assertNotIn('hand-edge', content)
+
+    def test_new_class_reads_the_whole_file(self):
+        classes = self.classes + make_classes(6, 1)[5:]
+        self.assertEqual(self.merge(classes), self.merge(classes, bWholeFile=True))
+        self.assertEqual(self.merge(classes)[1]['classes_added'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests of the memory bound of the conversions: the bytes handed to the worker
+processes by sources/parallel.py, and the .txt files written line by line.
+
+Run from the repository root:
+    python -m pytest -q tests
+"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import doxygen2drawio
+from sources import classModel
+from sources import parallel
+from sources import xmlExtractorCore
+
+
+class PendingBytesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        # Every file has its own size, so the results tell which file they come from
+        self.file_paths = []
+        for index in range(40):
+            file_path = os.path.join(self.folder.name, f"file{index}.xml")
+            with open(file_path, 'wb') as file:
+                file.write(b'x' * (1000 + index))
+            self.file_paths.append(file_path)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_pending_bytes_stay_under_the_limit(self):
+        limit = 5000
+        sent = []
+        split_chunks = parallel.split_chunks
+
+        def record_chunks(*args):
+            for chunk, chunk_bytes in split_chunks(*args):
+                yield chunk, chunk_bytes
+                # iter_files asks for the next chunk once this one is submitted
+                sent.extend(chunk)
+
+        sizes = []
+        most_pending = 0
+        with mock.patch.object(parallel, 'split_chunks', record_chunks):
+            for size in parallel.iter_files(parallel.file_size, self.file_paths, 2, max_pending_bytes=limit):
+                # The files sent to the pool and not yielded yet, this one included
+                pending = sum(map(parallel.file_size, sent)) - sum(sizes)
+                most_pending = max(most_pending, pending)
+                sizes.append(size)
+
+        self.assertEqual(sizes, [parallel.file_size(file_path) for file_path in self.file_paths])
+        self.assertLessEqual(most_pending, limit)
+        self.assertGreater(most_pending, 1000)
+
+
+class TextFileTest(unittest.TestCase):
+
+    def test_lines_are_written_as_they_come(self):
+        extracted_info = {
+            'class_name': 'Game::Player',
+            'member_functions': [classModel.Member('+', 'Move', '(int x)', 'void')],
+            'member_variables': [classModel.Member('-', 'health', '', 'int')],
+        }
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, 'Player.txt')
+            lines = xmlExtractorCore.render_class_lines(extracted_info)
+            xmlExtractorCore.create_text_file(file_path, lines)
+            # A generator: it was read while writing, not joined first
+            self.assertEqual(list(lines), [])
+            with open(file_path) as file:
+                self.assertEqual(file.read(), xmlExtractorCore.render_class_text(extracted_info))
+
+
+class MemoryLimitArgumentTest(unittest.TestCase):
+
+    def parse(self, *argv):
+        with contextlib.redirect_stderr(io.StringIO()):
+            return doxygen2drawio.parse_arguments(list(argv))
+
+    def test_memory_limit_needs_workers(self):
+        self.assertEqual(self.parse('--workers', '2', '--memory-limit', '16').memory_limit_mb, 16)
+        for argv in (['--memory-limit', '16'],
+                     ['--workers', '2', '--memory-limit', '16', '--pipelined'],
+                     ['--workers', '2', '--memory-limit', '0']):
+            with self.subTest(argv=argv):
+                with self.assertRaises(SystemExit):
+                    self.parse(*argv)
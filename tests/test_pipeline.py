@@ -0,0 +1,56 @@
+"""
+Tests of the direct conversion of sources/pipeline.py.
+
+Run from the repository root:
+    python -m pytest -q tests
+"""
+import os
+import tempfile
+import unittest
+
+from benchmarks import corpus
+from sources import pipeline
+
+
+class IncrementalDirectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.xml_folder = os.path.join(self.folder.name, 'xmls')
+        self.text_folder = os.path.join(self.folder.name, 'texts')
+        self.drawio_folder = os.path.join(self.folder.name, 'drawio')
+        corpus.generate_corpus(self.xml_folder, 3, 4)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def convert(self):
+        pipeline.convert_xml_folder(self.xml_folder, self.drawio_folder, bIncremental=True,
+                                    text_folder=self.text_folder)
+
+    def test_deleted_source_removes_its_outputs(self):
+        self.convert()
+        text_path = os.path.join(self.text_folder, 'ClassBcs.txt')
+        drawio_path = os.path.join(self.drawio_folder, 'ClassBcs_Diagram.drawio')
+        self.assertTrue(os.path.exists(text_path))
+        self.assertTrue(os.path.exists(drawio_path))
+
+        os.remove(os.path.join(self.xml_folder, 'ClassB_8cs.xml'))
+        self.convert()
+        self.assertFalse(os.path.exists(text_path))
+        self.assertFalse(os.path.exists(drawio_path))
+        # The other classes are kept
+        self.assertTrue(os.path.exists(os.path.join(self.text_folder, 'ClassAcs.txt')))
+        self.assertTrue(os.path.exists(os.path.join(self.drawio_folder, 'ClassAcs_Diagram.drawio')))
+
+    def test_source_without_output_removes_its_outputs(self):
+        self.convert()
+        with open(os.path.join(self.xml_folder, 'ClassB_8cs.xml'), 'w', encoding='utf-8') as file:
+            file.write('<broken')
+        self.convert()
+        self.assertFalse(os.path.exists(os.path.join(self.text_folder, 'ClassBcs.txt')))
+        self.assertFalse(os.path.exists(os.path.join(self.drawio_folder, 'ClassBcs_Diagram.drawio')))
+
+
+if __name__ == '__main__':
+    unittest.main()